@@ -1,5 +1,5 @@
 import logging
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from database.session import SessionLocal
 from sqlalchemy.orm import Session
@@ -21,3 +21,24 @@ def db_session() -> Generator:
         raise ex
     finally:
         session.close()
+
+
+async def async_db_session() -> AsyncGenerator:
+    """Async Database Session Dependency.
+
+    This function provides an asyncio database session for each request of
+    an async endpoint. It ensures that the session is committed after
+    successful operations.
+    """
+    from database.async_session import AsyncSessionLocal
+
+    session = AsyncSessionLocal()
+    try:
+        yield session
+        await session.commit()
+    except Exception as ex:
+        await session.rollback()
+        logging.error(ex)
+        raise ex
+    finally:
+        await session.close()
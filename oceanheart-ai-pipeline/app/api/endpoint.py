@@ -1,14 +1,29 @@
+import asyncio
 import json
+import logging
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
 from http import HTTPStatus
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
 
-from config.celery_config import celery_app
+from config.celery_config import get_async_redis_client
+from config.settings import get_settings
+from database.async_session import AsyncSessionLocal
 from database.event import Event
-from database.repository import GenericRepository
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from starlette.responses import Response
+from database.repository import AsyncGenericRepository
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import TypeAdapter, ValidationError
+from services.partial_results import read_partial_results
+from services.task_publisher import apublish_task, apublish_tasks
+from services.write_buffer import WriteBehindBuffer
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response, StreamingResponse
 
-from api.dependencies import db_session
+from api.dependencies import async_db_session
 from api.event_schema import EventSchema
 
 """
@@ -28,16 +43,251 @@ The endpoint follows the "accept-and-delegate" pattern where:
 
 This pattern ensures high availability and responsiveness of the API
 while allowing for potentially long-running processing operations.
+
+The endpoint is fully asynchronous: the event is stored through an asyncpg
+session and the task is pushed to the broker with the asyncio Redis client,
+so bursts of events wait on the event loop rather than on the threadpool.
+Checking out a connection and inserting an event must finish within
+API_INGEST_TIMEOUT seconds, otherwise the request fails with 503 and can be
+retried. The COMMIT itself is never cut off, so a 503 never hides an event
+that was stored. The time taken to store and queue
+the event is reported in the Server-Timing header of the 202 response.
+
+Optionally, a write-behind buffer group-commits events that arrive within a
+few milliseconds of each other, so a burst costs one commit instead of one per
+event. A 202 still means the event is stored and queued.
+
+Backfills submit many events in one request, either as a JSON array on
+/events/batch or as newline-delimited JSON on /events/ndjson. Their events are
+stored with a single COPY per chunk and queued with a single broker command.
+
+Clients that want results before processing finishes can follow a ticket's
+partial LLM responses as Server-Sent Events on /events/{ticket_id}/stream.
 """
 
 
 router = APIRouter()
 
 
+async def queue_event(event_id: str) -> str:
+    """Queues a stored event for processing.
+
+    Args:
+        event_id: ID of the stored event
+
+    Returns:
+        The acceptance message for the response
+    """
+    # Queue for batched processing if enabled
+    worker_settings = get_settings().worker
+    if worker_settings.batching_enabled:
+        await get_async_redis_client().rpush(worker_settings.pending_events_key, event_id)
+        return f"event `{event_id}` queued for batch processing"
+
+    # Queue processing task
+    task_id = await apublish_task("process_incoming_event", args=[event_id])
+    return f"process_incoming_event started `{task_id}` "
+
+
+async def store_events(
+    events: List[EventSchema], session: AsyncSession, commit: bool = True
+) -> List[str]:
+    """Stores many events with a single COPY.
+
+    Args:
+        events: The validated events
+        session: Async database session
+        commit: Whether to commit the transaction
+
+    Returns:
+        The IDs of the stored events, in order
+    """
+    now = datetime.now()
+    mappings = [
+        {
+            "id": uuid.uuid1(),
+            "data": event.model_dump(mode="json"),
+            "created_at": now,
+            "updated_at": now,
+        }
+        for event in events
+    ]
+    repository = AsyncGenericRepository(
+        session=session,
+        model=Event,
+    )
+    await repository.copy_records(mappings=mappings, commit=commit)
+    return [str(mapping["id"]) for mapping in mappings]
+
+
+async def queue_events(event_ids: List[str]) -> List[Optional[str]]:
+    """Queues many stored events for processing with a single broker command.
+
+    Events are queued as process_incoming_events tasks of up to the worker
+    batch size, or on the pending events list if batching is enabled.
+
+    Args:
+        event_ids: IDs of the stored events
+
+    Returns:
+        The ID of the task processing each event, or None if the events
+        were queued for batch processing
+    """
+    worker_settings = get_settings().worker
+    if worker_settings.batching_enabled:
+        await get_async_redis_client().rpush(
+            worker_settings.pending_events_key, *event_ids
+        )
+        return [None] * len(event_ids)
+
+    batch_size = worker_settings.batch_size
+    chunks = [
+        event_ids[i : i + batch_size] for i in range(0, len(event_ids), batch_size)
+    ]
+    task_ids = await apublish_tasks(
+        "process_incoming_events", [[chunk] for chunk in chunks]
+    )
+    return [task_id for task_id, chunk in zip(task_ids, chunks) for _ in chunk]
+
+
+async def ingest_events(
+    events: List[EventSchema], session: AsyncSession
+) -> List[Dict[str, Optional[str]]]:
+    """Stores and queues many events.
+
+    Returns:
+        The event ID and task ID of each event, in order
+    """
+    if not events:
+        return []
+    event_ids = await store_events(events, session)
+    task_ids = await queue_events(event_ids)
+    return [
+        {"event_id": event_id, "task_id": task_id}
+        for event_id, task_id in zip(event_ids, task_ids)
+    ]
+
+
+async def iter_lines(
+    request: Request, max_line_bytes: int
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """Yields the numbered lines of a request body as they arrive.
+
+    A line longer than max_line_bytes is yielded as None. Its bytes are
+    discarded as they arrive, so a body without newlines cannot exhaust memory.
+    """
+    buffer = bytearray()
+    oversized = False
+    line_number = 0
+    async for chunk in request.stream():
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            line_number += 1
+            if oversized or len(buffer) + end - start > max_line_bytes:
+                yield line_number, None
+            else:
+                buffer += chunk[start:end]
+                yield line_number, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            start = end + 1
+        if not oversized:
+            buffer += chunk[start:]
+            if len(buffer) > max_line_bytes:
+                buffer.clear()
+                oversized = True
+    if oversized:
+        yield line_number + 1, None
+    elif buffer:
+        yield line_number + 1, bytes(buffer)
+
+
+async def read_body(request: Request, max_bytes: int) -> bytes:
+    """Reads a request body, rejecting it as soon as it exceeds max_bytes.
+
+    Raises:
+        HTTPException: 413 if the body is larger than max_bytes
+    """
+    too_large = HTTPException(
+        status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Request bodies are limited to {max_bytes} bytes",
+    )
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+        raise too_large
+    body = bytearray()
+    async for chunk in request.stream():
+        body += chunk
+        if len(body) > max_bytes:
+            raise too_large
+    return bytes(body)
+
+
+async def store_event(data: EventSchema, session: AsyncSession) -> str:
+    """Stores an event, inserting it within the ingestion timeout.
+
+    Returns:
+        The ID of the stored event
+
+    Raises:
+        TimeoutError: If the event was not inserted within the timeout. The
+            transaction is then rolled back, so nothing is stored.
+    """
+    repository = AsyncGenericRepository(
+        session=session,
+        model=Event,
+    )
+    event = Event(data=data.model_dump(mode="json"))
+    async with asyncio.timeout(get_settings().api.ingest_timeout):
+        await repository.create(obj=event, commit=False)
+    # Cancelling the COMMIT once Postgres has applied it would fail the
+    # request for an event that is stored but never queued
+    await asyncio.shield(session.commit())
+    return str(event.id)
+
+
+async def flush_events(events: List[EventSchema]) -> List[Dict[str, Optional[str]]]:
+    """Stores a batch of buffered events in one transaction, then queues them.
+
+    Returns:
+        The event ID and task ID of each event, in order
+
+    Raises:
+        TimeoutError: If the events were not inserted within the ingestion
+            timeout. The transaction is then rolled back, so nothing is stored.
+    """
+    async with AsyncSessionLocal() as session:
+        async with asyncio.timeout(get_settings().api.ingest_timeout):
+            event_ids = await store_events(events, session, commit=False)
+        # Never cancel the COMMIT, see store_event()
+        await asyncio.shield(session.commit())
+    task_ids = await queue_events(event_ids)
+    return [
+        {"event_id": event_id, "task_id": task_id}
+        for event_id, task_id in zip(event_ids, task_ids)
+    ]
+
+
+@lru_cache
+def get_ingest_buffer() -> WriteBehindBuffer[EventSchema, Dict[str, Optional[str]]]:
+    """
+    Get the API process's write-behind buffer for incoming events.
+
+    Returns:
+        WriteBehindBuffer: The shared buffer.
+    """
+    api_settings = get_settings().api
+    return WriteBehindBuffer(
+        flush_events,
+        max_size=api_settings.write_buffer_max_size,
+        max_delay=api_settings.write_buffer_max_delay,
+    )
+
+
 @router.post("/", dependencies=[])
-def handle_event(
+async def handle_event(
     data: EventSchema,
-    session: Session = Depends(db_session),
+    session: AsyncSession = Depends(async_db_session),
 ) -> Response:
     """Handles incoming event submissions.
 
@@ -45,33 +295,231 @@ def handle_event(
     and queues them for asynchronous processing. It implements
     a non-blocking pattern to ensure API responsiveness.
 
+    With API_WRITE_BUFFER_ENABLED, the event is stored together with the
+    other events received within API_WRITE_BUFFER_MAX_DELAY seconds, in one
+    transaction. The response is still only sent once the event is stored
+    and queued.
+
     Args:
         data: The event data, validated against EventSchema
-        session: Database session injected by FastAPI dependency
+        session: Async database session injected by FastAPI dependency
 
     Returns:
         Response: 202 Accepted response with task ID
 
+    Raises:
+        HTTPException: 503 if the event could not be stored within the
+            ingestion timeout
+
     Note:
         The endpoint returns immediately after queueing the task.
         Use the task ID in the response to check processing status.
     """
-    # Store event in database
-    repository = GenericRepository(
-        session=session,
-        model=Event,
+    start = time.perf_counter()
+
+    # Queueing is not bounded by the timeout, so a stored event is always queued
+    try:
+        if get_settings().api.write_buffer_enabled:
+            result = await get_ingest_buffer().submit(data)
+            message = (
+                f"event `{result['event_id']}` queued for batch processing"
+                if result["task_id"] is None
+                else f"process_incoming_events started `{result['task_id']}` "
+            )
+        else:
+            event_id = await store_event(data, session)
+            message = await queue_event(event_id)
+    except TimeoutError:
+        logging.warning("Storing event exceeded the ingestion timeout")
+        raise HTTPException(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail="Event ingestion timed out, retry later",
+            headers={"Retry-After": "1"},
+        )
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    # Return acceptance response
+    return Response(
+        content=json.dumps({"message": message}),
+        status_code=HTTPStatus.ACCEPTED,
+        headers={"Server-Timing": f"ingest;dur={duration_ms:.1f}"},
     )
-    event = Event(data=data.model_dump(mode="json"))
-    repository.create(obj=event)
 
-    # Queue processing task
-    task_id = celery_app.send_task(
-        "process_incoming_event",
-        args=[str(event.id)],
+
+event_list_adapter = TypeAdapter(List[EventSchema])
+
+
+@router.post(
+    "/batch",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {"schema": event_list_adapter.json_schema()}
+            },
+        }
+    },
+)
+async def handle_event_batch(
+    request: Request,
+    session: AsyncSession = Depends(async_db_session),
+) -> Response:
+    """Handles the submission of many events in one request.
+
+    The size limits are enforced before any event is validated: bodies over
+    API_BATCH_MAX_BYTES are rejected while they are read, and arrays over
+    API_BATCH_MAX_EVENTS are rejected after JSON parsing. All events are
+    then validated; a single invalid event rejects the request with 422.
+    The events are stored with one COPY and queued with one broker command.
+
+    Args:
+        request: The request with a JSON array of events as its body
+        session: Async database session injected by FastAPI dependency
+
+    Returns:
+        Response: 202 Accepted response with the event and task ID of
+        each event, in the order they were submitted
+
+    Raises:
+        HTTPException: 413 if the batch exceeds API_BATCH_MAX_BYTES or
+            API_BATCH_MAX_EVENTS
+        RequestValidationError: 422 if the body is not a valid event array
+    """
+    api_settings = get_settings().api
+    body = await read_body(request, api_settings.batch_max_bytes)
+    try:
+        raw_events = json.loads(body)
+    except ValueError as e:
+        raise RequestValidationError(
+            [{"type": "json_invalid", "loc": ("body",), "msg": str(e)}]
+        )
+    max_events = api_settings.batch_max_events
+    if isinstance(raw_events, list) and len(raw_events) > max_events:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batches are limited to {max_events} events, use /events/ndjson",
+        )
+    try:
+        data = event_list_adapter.validate_python(raw_events)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+        )
+
+    start = time.perf_counter()
+    results = await ingest_events(data, session)
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    return Response(
+        content=json.dumps({"accepted": len(results), "events": results}),
+        status_code=HTTPStatus.ACCEPTED,
+        headers={"Server-Timing": f"ingest;dur={duration_ms:.1f}"},
     )
 
-    # Return acceptance response
+
+@router.post("/ndjson")
+async def handle_event_stream(
+    request: Request,
+    session: AsyncSession = Depends(async_db_session),
+) -> Response:
+    """Handles a stream of events, one JSON object per line.
+
+    The body is read as it arrives. Valid events are stored and queued in
+    chunks of API_NDJSON_CHUNK_SIZE, so any number of events can be
+    submitted without holding them all in memory. Invalid lines and lines
+    over API_NDJSON_MAX_LINE_BYTES are skipped and reported with their
+    errors; blank lines are ignored.
+
+    Args:
+        request: The request with an application/x-ndjson body
+        session: Async database session injected by FastAPI dependency
+
+    Returns:
+        Response: 202 Accepted response with the event and task ID of each
+        accepted line and the errors of each rejected line, by line number
+    """
+    api_settings = get_settings().api
+    chunk_size = api_settings.ndjson_chunk_size
+    max_line_bytes = api_settings.ndjson_max_line_bytes
+    start = time.perf_counter()
+    results: List[Dict[str, Any]] = []
+    pending: List[Tuple[int, EventSchema]] = []
+
+    async def flush() -> None:
+        ingested = await ingest_events([event for _, event in pending], session)
+        for (line_number, _), result in zip(pending, ingested):
+            results.append({"line": line_number, **result})
+        pending.clear()
+
+    async for line_number, line in iter_lines(request, max_line_bytes):
+        if line is None:
+            results.append(
+                {
+                    "line": line_number,
+                    "errors": [
+                        {
+                            "type": "line_too_long",
+                            "msg": f"Lines are limited to {max_line_bytes} bytes",
+                        }
+                    ],
+                }
+            )
+            continue
+        if not line.strip():
+            continue
+        try:
+            pending.append((line_number, EventSchema.model_validate_json(line)))
+        except ValidationError as e:
+            results.append(
+                {"line": line_number, "errors": json.loads(e.json(include_url=False))}
+            )
+            continue
+        if len(pending) >= chunk_size:
+            await flush()
+    await flush()
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    results.sort(key=lambda result: result["line"])
+    accepted = sum(1 for result in results if "event_id" in result)
     return Response(
-        content=json.dumps({"message": f"process_incoming_event started `{task_id}` "}),
+        content=json.dumps(
+            {
+                "accepted": accepted,
+                "rejected": len(results) - accepted,
+                "events": results,
+            }
+        ),
         status_code=HTTPStatus.ACCEPTED,
+        headers={"Server-Timing": f"ingest;dur={duration_ms:.1f}"},
+    )
+
+
+@router.get("/{ticket_id}/stream")
+async def stream_event(ticket_id: UUID) -> StreamingResponse:
+    """Streams the partial results of a ticket as Server-Sent Events.
+
+    Every partial and final response of a streaming LLM node is sent as a
+    "partial" or "final" event with the node name and the response fields
+    generated so far. The stream replays earlier messages on connect and
+    ends with a "done" event when the pipeline finishes.
+
+    Args:
+        ticket_id: The ticket_id of the submitted event
+
+    Returns:
+        StreamingResponse: text/event-stream response
+    """
+
+    async def events() -> AsyncIterator[str]:
+        async for message in read_partial_results(ticket_id, get_async_redis_client()):
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = json.dumps({"node": message["node"], "data": message["data"]})
+            yield f"event: {message['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -0,0 +1,31 @@
+import os
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings
+
+load_dotenv()
+
+"""
+Configuration for the API server.
+"""
+
+
+class ApiConfig(BaseSettings):
+    """Settings for event ingestion in the API server."""
+
+    ingest_timeout: float = float(os.getenv("API_INGEST_TIMEOUT", "2.0"))
+    db_pool_size: int = int(os.getenv("API_DB_POOL_SIZE", "10"))
+    db_max_overflow: int = int(os.getenv("API_DB_MAX_OVERFLOW", "20"))
+    batch_max_events: int = int(os.getenv("API_BATCH_MAX_EVENTS", "1000"))
+    batch_max_bytes: int = int(os.getenv("API_BATCH_MAX_BYTES", "10485760"))
+    ndjson_chunk_size: int = int(os.getenv("API_NDJSON_CHUNK_SIZE", "1000"))
+    ndjson_max_line_bytes: int = int(
+        os.getenv("API_NDJSON_MAX_LINE_BYTES", "1048576")
+    )
+    write_buffer_enabled: bool = (
+        os.getenv("API_WRITE_BUFFER_ENABLED", "false").lower() == "true"
+    )
+    write_buffer_max_size: int = int(os.getenv("API_WRITE_BUFFER_MAX_SIZE", "100"))
+    write_buffer_max_delay: float = float(
+        os.getenv("API_WRITE_BUFFER_MAX_DELAY", "0.005")
+    )
@@ -1,5 +1,8 @@
 import os
 from functools import lru_cache
+
+import redis
+import redis.asyncio
 from celery import Celery
 from config.settings import get_settings
 
@@ -21,6 +24,30 @@ def get_redis_url():
     return f"redis://{redis_host}:6379/0"
 
 
+@lru_cache
+def get_redis_client() -> redis.Redis:
+    """
+    Get a shared Redis client for the broker's Redis instance.
+
+    Returns:
+        redis.Redis: The Redis client.
+    """
+    return redis.Redis.from_url(get_redis_url())
+
+
+@lru_cache
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """
+    Get a shared asyncio Redis client for the broker's Redis instance.
+
+    Only use it from a single event loop, such as the API server's.
+
+    Returns:
+        redis.asyncio.Redis: The asyncio Redis client.
+    """
+    return redis.asyncio.Redis.from_url(get_redis_url())
+
+
 @lru_cache
 def get_celery_config():
     """
@@ -30,6 +57,22 @@ def get_celery_config():
         dict: The Celery configuration.
     """
     redis_url = get_redis_url()
+    beat_schedule = {}
+    if settings.worker.batching_enabled:
+        beat_schedule["drain-pending-events"] = {
+            "task": "drain_pending_events",
+            "schedule": settings.worker.drain_interval,
+        }
+    if settings.database.vector_store.response_cache_enabled:
+        beat_schedule["purge-response-cache"] = {
+            "task": "purge_response_cache",
+            "schedule": settings.database.vector_store.response_cache_purge_interval,
+        }
+    if settings.database.events.retention:
+        beat_schedule["enforce-event-retention"] = {
+            "task": "enforce_event_retention",
+            "schedule": settings.database.events.retention_interval,
+        }
     return {
         "broker_url": redis_url,
         "result_backend": redis_url,
@@ -38,6 +81,7 @@ def get_celery_config():
         "result_serializer": "json",
         "enable_utc": True,
         "broker_connection_retry_on_startup": True,
+        "beat_schedule": beat_schedule,
     }
 
 
@@ -17,6 +17,61 @@ class VectorStoreConfig(BaseSettings):
     table_name: str = "embeddings"
     embedding_dimensions: int = 1536
     time_partition_interval: timedelta = timedelta(days=7)
+    tsvector_column: str = "contents_tsv"
+    tsvector_check_interval: float = float(
+        os.getenv("TSVECTOR_CHECK_INTERVAL", "300")
+    )
+    weighted_keyword_search: bool = (
+        os.getenv("KEYWORD_SEARCH_WEIGHTED", "false").lower() == "true"
+    )
+    pool_min_size: int = int(os.getenv("VECTOR_DB_POOL_MIN_SIZE", "2"))
+    pool_max_size: int = int(os.getenv("VECTOR_DB_POOL_MAX_SIZE", "10"))
+    pool_timeout: float = float(os.getenv("VECTOR_DB_POOL_TIMEOUT", "10"))
+    pool_health_check_interval: float = float(
+        os.getenv("VECTOR_DB_POOL_HEALTH_CHECK_INTERVAL", "30")
+    )
+    embedding_batch_size: int = int(os.getenv("EMBEDDING_BATCH_SIZE", "512"))
+    embedding_batch_tokens: int = int(os.getenv("EMBEDDING_BATCH_TOKENS", "100000"))
+    embedding_concurrency: int = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))
+    reranker_model: str = os.getenv(
+        "RERANKER_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2"
+    )
+    reranker_device: str = os.getenv("RERANKER_DEVICE", "cpu")
+    response_cache_enabled: bool = (
+        os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    )
+    response_cache_mode: str = os.getenv("RESPONSE_CACHE_MODE", "rag_context")
+    response_cache_table: str = "response_cache"
+    response_cache_threshold: float = float(
+        os.getenv("RESPONSE_CACHE_THRESHOLD", "0.05")
+    )
+    response_cache_ttl: int = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+    response_cache_purge_interval: float = float(
+        os.getenv("RESPONSE_CACHE_PURGE_INTERVAL", "3600")
+    )
+    embedding_cache_backend: str = os.getenv("EMBEDDING_CACHE_BACKEND", "memory")
+    embedding_cache_size: int = int(os.getenv("EMBEDDING_CACHE_SIZE", "10000"))
+    embedding_cache_ttl: int = int(os.getenv("EMBEDDING_CACHE_TTL", "86400"))
+
+
+class EventStoreConfig(BaseSettings):
+    """Settings for the events hypertable."""
+
+    chunk_interval: timedelta = timedelta(
+        days=int(os.getenv("EVENTS_CHUNK_INTERVAL_DAYS", "7"))
+    )
+    compress_after: timedelta = timedelta(
+        days=int(os.getenv("EVENTS_COMPRESS_AFTER_DAYS", "30"))
+    )
+    retention: timedelta = timedelta(days=int(os.getenv("EVENTS_RETENTION_DAYS", "0")))
+    retention_interval: float = float(os.getenv("EVENTS_RETENTION_INTERVAL", "3600"))
+    archive_dir: str = os.getenv("EVENTS_ARCHIVE_DIR", "")
+    archive_batch_size: int = 10000
+    backfill_batch_size: int = int(os.getenv("EVENTS_BACKFILL_BATCH_SIZE", "10000"))
+    backfill_clock_margin: timedelta = timedelta(minutes=5)
+    lookup_margin: timedelta = timedelta(
+        hours=int(os.getenv("EVENTS_LOOKUP_MARGIN_HOURS", "24"))
+    )
 
 
 class DatabaseConfig(BaseSettings):
@@ -37,3 +92,4 @@ class DatabaseConfig(BaseSettings):
         return f"postgres://{self.pg_user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
     vector_store: VectorStoreConfig = VectorStoreConfig()
+    events: EventStoreConfig = EventStoreConfig()
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 import os
@@ -16,6 +16,13 @@ class LLMProviderSettings(BaseSettings):
     temperature: float = 0.0
     max_tokens: Optional[int] = None
     max_retries: int = 3
+    max_connections: int = int(os.getenv("LLM_MAX_CONNECTIONS", 100))
+    max_keepalive_connections: int = int(os.getenv("LLM_MAX_KEEPALIVE_CONNECTIONS", 20))
+    keepalive_expiry: float = float(os.getenv("LLM_KEEPALIVE_EXPIRY", 30.0))
+    http2: bool = os.getenv("LLM_HTTP2", "true").lower() == "true"
+    rpm_limit: int = 0
+    tpm_limit: int = 0
+    max_concurrency: int = 0
 
 
 class OpenAISettings(LLMProviderSettings):
@@ -24,6 +31,11 @@ class OpenAISettings(LLMProviderSettings):
     api_key: str = os.getenv("OPENAI_API_KEY")
     default_model: str = "gpt-4o"
     embedding_model: str = "text-embedding-3-small"
+    rpm_limit: int = int(os.getenv("OPENAI_RPM_LIMIT", "0"))
+    tpm_limit: int = int(os.getenv("OPENAI_TPM_LIMIT", "0"))
+    max_concurrency: int = int(os.getenv("OPENAI_MAX_CONCURRENCY", "0"))
+    embedding_rpm_limit: int = int(os.getenv("OPENAI_EMBEDDING_RPM_LIMIT", "0"))
+    embedding_tpm_limit: int = int(os.getenv("OPENAI_EMBEDDING_TPM_LIMIT", "0"))
 
 
 class AnthropicSettings(LLMProviderSettings):
@@ -32,6 +44,9 @@ class AnthropicSettings(LLMProviderSettings):
     api_key: str = os.getenv("ANTHROPIC_API_KEY")
     default_model: str = "claude-3-5-sonnet-20240620"
     max_tokens: int = 1024
+    rpm_limit: int = int(os.getenv("ANTHROPIC_RPM_LIMIT", "0"))
+    tpm_limit: int = int(os.getenv("ANTHROPIC_TPM_LIMIT", "0"))
+    max_concurrency: int = int(os.getenv("ANTHROPIC_MAX_CONCURRENCY", "0"))
 
 
 class LlamaSettings(LLMProviderSettings):
@@ -48,3 +63,26 @@ class LLMConfig(BaseSettings):
     openai: OpenAISettings = OpenAISettings()
     anthropic: AnthropicSettings = AnthropicSettings()
     llama: LlamaSettings = LlamaSettings()
+    providers: str = os.getenv("LLM_PROVIDERS", "openai")
+    hedging: bool = os.getenv("LLM_HEDGING", "false").lower() == "true"
+    hedge_percentile: float = 0.95
+    hedge_delay: float = float(os.getenv("LLM_HEDGE_DELAY", "10.0"))
+    hedge_min_delay: float = float(os.getenv("LLM_HEDGE_MIN_DELAY", "1.0"))
+    hedge_min_samples: int = 20
+    latency_window: int = 100
+    circuit_failure_threshold: int = int(
+        os.getenv("LLM_CIRCUIT_FAILURE_THRESHOLD", "5")
+    )
+    circuit_reset_timeout: float = float(os.getenv("LLM_CIRCUIT_RESET_TIMEOUT", "30"))
+    completion_cache_backend: str = os.getenv("LLM_COMPLETION_CACHE_BACKEND", "none")
+    completion_cache_size: int = int(os.getenv("LLM_COMPLETION_CACHE_SIZE", "10000"))
+    completion_cache_ttl: int = int(os.getenv("LLM_COMPLETION_CACHE_TTL", "604800"))
+    completion_cache_path: str = os.getenv(
+        "LLM_COMPLETION_CACHE_PATH", "data/completion_cache.db"
+    )
+    rate_limit_timeout: float = float(os.getenv("LLM_RATE_LIMIT_TIMEOUT", "60"))
+
+    @property
+    def provider_order(self) -> List[str]:
+        """Provider names from LLM_PROVIDERS, in order of preference."""
+        return [name.strip() for name in self.providers.split(",") if name.strip()]
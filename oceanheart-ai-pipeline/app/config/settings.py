@@ -1,8 +1,10 @@
 from functools import lru_cache
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
+from config.api_config import ApiConfig
 from config.llm_config import LLMConfig
 from config.database_config import DatabaseConfig
+from config.worker_config import WorkerConfig
 
 load_dotenv()
 
@@ -17,6 +19,8 @@ class Settings(BaseSettings):
     app_name: str = "GenAI Project Template"
     llm: LLMConfig = LLMConfig()
     database: DatabaseConfig = DatabaseConfig()
+    worker: WorkerConfig = WorkerConfig()
+    api: ApiConfig = ApiConfig()
 
 
 @lru_cache
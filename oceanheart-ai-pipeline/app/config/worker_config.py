@@ -0,0 +1,29 @@
+import os
+
+from dotenv import load_dotenv
+from pydantic_settings import BaseSettings
+
+load_dotenv()
+
+"""
+Configuration for the Celery workers.
+"""
+
+
+class WorkerConfig(BaseSettings):
+    """Settings for event processing in the Celery workers."""
+
+    batching_enabled: bool = os.getenv("EVENT_BATCHING_ENABLED", "false").lower() == "true"
+    batch_size: int = int(os.getenv("EVENT_BATCH_SIZE", "50"))
+    drain_interval: float = float(os.getenv("EVENT_DRAIN_INTERVAL", "1.0"))
+    pending_events_key: str = "pending_events"
+    claim_timeout: int = int(os.getenv("EVENT_CLAIM_TIMEOUT", "600"))
+    max_attempts: int = int(os.getenv("EVENT_MAX_ATTEMPTS", "3"))
+    partial_results_enabled: bool = (
+        os.getenv("PARTIAL_RESULTS_ENABLED", "true").lower() == "true"
+    )
+    partial_results_key: str = "partial_results"
+    partial_results_interval: float = float(os.getenv("PARTIAL_RESULTS_INTERVAL", "0.1"))
+    partial_results_ttl: int = int(os.getenv("PARTIAL_RESULTS_TTL", "3600"))
+    partial_results_max_length: int = 1000
+    partial_results_timeout: float = float(os.getenv("PARTIAL_RESULTS_TIMEOUT", "300"))
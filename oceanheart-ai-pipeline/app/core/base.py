@@ -1,3 +1,4 @@
+import asyncio
 from abc import ABC, abstractmethod
 
 from core.task import TaskContext
@@ -8,6 +9,9 @@ Base Node Module
 This module defines the foundational Node class that all pipeline nodes inherit from.
 It implements the Chain of Responsibility pattern, allowing nodes to process tasks
 sequentially and pass results to the next node in the chain.
+
+AsyncNode extends the same contract with an awaitable process method for nodes
+that spend most of their time waiting on network I/O.
 """
 
 
@@ -37,6 +41,20 @@ class Node(ABC):
         """
         return self.__class__.__name__
 
+    def prefetch(self, task_context: TaskContext) -> None:
+        """Starts speculative work for this node when the pipeline starts.
+
+        Called for nodes configured with prefetch=True before the first node
+        runs. Implementations should start background work with
+        task_context.start_prefetch() and pick up the result in process()
+        with task_context.pop_prefetch(). Work that is never picked up is
+        discarded when the pipeline finishes. Does nothing by default.
+
+        Args:
+            task_context: The shared context object passed through the pipeline
+        """
+        pass
+
     @abstractmethod
     def process(self, task_context: TaskContext) -> TaskContext:
         """Processes the task context in the responsibility chain.
@@ -57,3 +75,42 @@ class Node(ABC):
             2. Store results in task_context.nodes[self.node_name]
         """
         pass
+
+
+class AsyncNode(Node):
+    """Abstract base class for pipeline nodes with an awaitable processing step.
+
+    AsyncNode lets I/O-bound nodes (LLM calls, embeddings, HTTP requests) yield
+    the event loop while they wait, so Pipeline.arun() can keep many tasks in
+    flight on a single worker. The synchronous process() method is still
+    available and runs aprocess() to completion in a fresh event loop, which
+    keeps async nodes usable from Pipeline.run().
+    """
+
+    def process(self, task_context: TaskContext) -> TaskContext:
+        """Processes the task context by running aprocess() to completion.
+
+        Args:
+            task_context: The shared context object passed through the pipeline
+
+        Returns:
+            Updated TaskContext with this node's processing results
+        """
+        return asyncio.run(self.aprocess(task_context))
+
+    @abstractmethod
+    async def aprocess(self, task_context: TaskContext) -> TaskContext:
+        """Asynchronously processes the task context in the responsibility chain.
+
+        Args:
+            task_context: The shared context object passed through the pipeline
+
+        Returns:
+            Updated TaskContext with this node's processing results
+
+        Note:
+            Implementations should:
+            1. Await any I/O instead of blocking the event loop
+            2. Store results in task_context.nodes[self.node_name]
+        """
+        pass
@@ -0,0 +1,55 @@
+from typing import Any, Dict, List
+
+from core.base import Node
+from core.task import TaskContext
+
+"""
+Join Module
+
+This module implements the fan-in side of parallel pipeline sections.
+A node configured with parallel=True runs all of its connections concurrently,
+and every branch must end in the same JoinNode, which merges the branch results
+back into a single TaskContext before the pipeline continues.
+"""
+
+
+class JoinNode(Node):
+    """Base node for merging the results of parallel branches.
+
+    Each branch runs on its own copy of the TaskContext. When all branches have
+    finished, the pipeline calls merge() with the node results each branch
+    produced, in the order the branches are declared in the parallel node's
+    connections. The default merge applies them in that order, so the result
+    does not depend on which branch happened to finish first.
+
+    After merging, the join is processed like any other node and the pipeline
+    continues with its connection.
+    """
+
+    def merge(
+        self, task_context: TaskContext, branch_results: List[Dict[str, Any]]
+    ) -> TaskContext:
+        """Merges the node results of parallel branches into the task context.
+
+        Args:
+            task_context: The task context as it was before the branches ran
+            branch_results: Node results added or replaced by each branch, in
+                branch declaration order
+
+        Returns:
+            TaskContext containing the results of all branches
+        """
+        for branch_result in branch_results:
+            task_context.nodes.update(branch_result)
+        return task_context
+
+    def process(self, task_context: TaskContext) -> TaskContext:
+        """Processes the merged task context.
+
+        Args:
+            task_context: The merged task context
+
+        Returns:
+            The task context, unchanged by default
+        """
+        return task_context
@@ -1,18 +1,60 @@
+import asyncio
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Coroutine,
+    Iterator,
+    Optional,
+    Tuple,
+    Type,
+)
 
 from core.task import TaskContext
-from core.base import Node
-from pydantic import BaseModel
+from core.base import AsyncNode, Node
+from pydantic import BaseModel, ValidationError, create_model
+from services.llm_factory import LLMFactory, get_stream_usage
+from services.partial_results import PartialResultPublisher
 
 """
 LLM Node Module
 
 This module defines the base interface for Language Model nodes in the pipeline.
 It provides a standardized way to integrate different LLM providers and implementations
-while maintaining consistent interaction patterns.
+while maintaining consistent interaction patterns. AsyncLLMNode is the awaitable
+variant for use with Pipeline.arun(), and StreamingLLMNode streams partial
+responses so later nodes can start before the whole response is generated.
 """
 
 
+@lru_cache
+def ready_fields_model(
+    response_model: Type[BaseModel], fields: Tuple[str, ...]
+) -> Type[BaseModel]:
+    """Returns a model with only the given fields of a response model.
+
+    The fields keep their types and constraints, so a partial response's ready
+    fields can be validated before the rest of the response has been generated.
+
+    Args:
+        response_model: The ResponseModel of a StreamingLLMNode
+        fields: Names of the fields to keep
+
+    Returns:
+        A pydantic model class with the given fields
+    """
+    return create_model(
+        f"{response_model.__name__}ReadyFields",
+        **{
+            name: (response_model.model_fields[name].annotation, field)
+            for name, field in response_model.model_fields.items()
+            if name in fields
+        },
+    )
+
+
 class LLMNode(Node, ABC):
     """Abstract base class for Language Model nodes.
 
@@ -89,3 +131,314 @@ class LLMNode(Node, ABC):
             Updated TaskContext with LLM results
         """
         pass
+
+
+class AsyncLLMNode(AsyncNode, LLMNode, ABC):
+    """Abstract base class for Language Model nodes with awaitable completions.
+
+    AsyncLLMNode follows the same context/completion/process flow as LLMNode,
+    but the completion and processing steps are coroutines so the event loop
+    stays free while the provider responds. The synchronous create_completion()
+    and process() methods run their async counterparts to completion in a new
+    event loop, and close the LLM clients bound to that loop before it ends.
+    Nodes on the synchronous path should override them with blocking
+    implementations that use the pooled clients.
+    """
+
+    @staticmethod
+    def run_async(coroutine: Coroutine[Any, Any, Any]) -> Any:
+        """Runs a coroutine in a new event loop and closes its LLM clients.
+
+        Args:
+            coroutine: The coroutine to run
+
+        Returns:
+            The result of the coroutine
+        """
+
+        async def run() -> Any:
+            try:
+                return await coroutine
+            finally:
+                await LLMFactory.aclose_async_clients()
+
+        return asyncio.run(run())
+
+    def create_completion(self, context: LLMNode.ContextModel) -> LLMNode.ResponseModel:
+        """Creates a completion by running acreate_completion() to completion.
+
+        Args:
+            context: Prepared context data conforming to ContextModel
+
+        Returns:
+            ResponseModel containing the LLM's response and any metadata
+        """
+        return self.run_async(self.acreate_completion(context))
+
+    def process(self, task_context: TaskContext) -> TaskContext:
+        """Processes the task by running aprocess() to completion.
+
+        Args:
+            task_context: Current pipeline task context
+
+        Returns:
+            Updated TaskContext with LLM results
+        """
+        return self.run_async(self.aprocess(task_context))
+
+    @abstractmethod
+    async def acreate_completion(
+        self, context: LLMNode.ContextModel
+    ) -> LLMNode.ResponseModel:
+        """Asynchronously creates a completion using the language model.
+
+        Args:
+            context: Prepared context data conforming to ContextModel
+
+        Returns:
+            ResponseModel containing the LLM's response and any metadata
+
+        Raises:
+            Exception: If the LLM request fails or returns invalid data
+        """
+        pass
+
+    @abstractmethod
+    async def aprocess(self, task_context: TaskContext) -> TaskContext:
+        """Asynchronously processes the task through the language model.
+
+        Args:
+            task_context: Current pipeline task context
+
+        Returns:
+            Updated TaskContext with LLM results
+        """
+        pass
+
+
+class StreamingLLMNode(AsyncLLMNode, ABC):
+    """Abstract base class for Language Model nodes that stream their response.
+
+    The response is streamed as partial ResponseModel instances. Fields are
+    generated in the order the ResponseModel declares them, so a field is
+    final once a later field has started or the stream has ended. Declare the
+    fields that routing and later nodes depend on first, and list them in
+    ready_fields.
+
+    As soon as every ready field is final and valid against the ResponseModel,
+    the partial response is stored in the task context and the node marks
+    itself ready. Pipeline.arun() then dispatches the next nodes while the rest
+    of the response streams. If the ready fields are invalid, the next nodes
+    wait for the complete response, whose validation then fails the node. The
+    complete response replaces the partial one when the stream ends. Partial
+    responses are also published for the SSE endpoint.
+
+    Pipeline.run() streams with the pooled blocking clients through
+    stream_completion() and process(); the next nodes then start once the
+    stream has ended. Token usage is taken from the stream's final completion
+    when the provider reports it.
+
+    Attributes:
+        ready_fields: Names of the fields the next nodes depend on
+    """
+
+    ready_fields: ClassVar[Tuple[str, ...]] = ()
+
+    @abstractmethod
+    def astream_completion(
+        self, context: LLMNode.ContextModel
+    ) -> AsyncIterator[BaseModel]:
+        """Streams partial responses from the language model.
+
+        Args:
+            context: Prepared context data conforming to ContextModel
+
+        Yields:
+            Partial ResponseModel instances, the last one with every field
+        """
+        pass
+
+    @abstractmethod
+    def stream_completion(self, context: LLMNode.ContextModel) -> Iterator[BaseModel]:
+        """Streams partial responses from the language model with a blocking client.
+
+        Args:
+            context: Prepared context data conforming to ContextModel
+
+        Yields:
+            Partial ResponseModel instances, the last one with every field
+        """
+        pass
+
+    def create_completion(self, context: LLMNode.ContextModel) -> LLMNode.ResponseModel:
+        """Streams the response to the end without publishing it.
+
+        Args:
+            context: Prepared context data conforming to ContextModel
+
+        Returns:
+            The complete ResponseModel
+        """
+        partial = None
+        for partial in self.stream_completion(context):
+            pass
+        return self.complete_response(partial)
+
+    async def acreate_completion(
+        self, context: LLMNode.ContextModel
+    ) -> LLMNode.ResponseModel:
+        """Streams the response to the end without publishing it.
+
+        Args:
+            context: Prepared context data conforming to ContextModel
+
+        Returns:
+            The complete ResponseModel
+        """
+        partial = None
+        async for partial in self.astream_completion(context):
+            pass
+        return self.complete_response(partial)
+
+    def process(self, task_context: TaskContext) -> TaskContext:
+        """Streams the response to the end, publishing the partial responses.
+
+        Args:
+            task_context: Current pipeline task context
+
+        Returns:
+            Updated TaskContext with the complete response
+        """
+        context = self.get_context(task_context)
+        publisher = PartialResultPublisher(task_context.event.ticket_id, self.node_name)
+        partial = None
+        for partial in self.stream_completion(context):
+            publisher.publish(partial)
+
+        response_model = self.complete_response(partial)
+        self._store_result(
+            task_context, response_model, True, get_stream_usage(partial)
+        )
+        task_context.mark_ready(self.node_name)
+        publisher.publish(response_model, final=True)
+        return task_context
+
+    async def aprocess(self, task_context: TaskContext) -> TaskContext:
+        """Streams the response, marking the node ready once the ready fields are.
+
+        The partial response is stored with complete=False once every ready
+        field is final and valid, so Pipeline.arun() can dispatch the next
+        nodes. The complete response replaces it when the stream ends.
+
+        Args:
+            task_context: Current pipeline task context
+
+        Returns:
+            Updated TaskContext with the complete response
+
+        Raises:
+            ValidationError: If the complete response is invalid
+        """
+        context = self.get_context(task_context)
+        publisher = PartialResultPublisher(task_context.event.ticket_id, self.node_name)
+        checked = False
+        partial = None
+        async for partial in self.astream_completion(context):
+            if not checked and self.has_final_fields(partial, self.ready_fields):
+                # Final fields do not change, so they are validated only once
+                checked = True
+                if self.has_valid_fields(partial, self.ready_fields):
+                    self._store_result(task_context, partial, False)
+                    task_context.mark_ready(self.node_name)
+            await publisher.apublish(partial)
+
+        response_model = self.complete_response(partial)
+        self._store_result(
+            task_context, response_model, True, get_stream_usage(partial)
+        )
+        task_context.mark_ready(self.node_name)
+        await publisher.apublish(response_model, final=True)
+        return task_context
+
+    def complete_response(self, partial: Optional[BaseModel]) -> LLMNode.ResponseModel:
+        """Validates the last partial response against the ResponseModel.
+
+        Args:
+            partial: The last partial response of the stream
+
+        Returns:
+            The complete ResponseModel
+
+        Raises:
+            ValueError: If the stream was empty
+            ValidationError: If the response is incomplete or invalid
+        """
+        if partial is None:
+            raise ValueError(f"{self.node_name} received an empty response stream")
+        # Partial models subclass the ResponseModel, so compare exact types
+        if type(partial) is self.ResponseModel:
+            return partial
+        return self.ResponseModel.model_validate(partial.model_dump())
+
+    def has_final_fields(self, partial: BaseModel, fields: Tuple[str, ...]) -> bool:
+        """Checks whether the given fields of a partial response are final.
+
+        A field is final once any field declared after it has a value.
+
+        Args:
+            partial: A partial response
+            fields: Names of the fields to check
+
+        Returns:
+            True if every field is final
+        """
+        if not fields:
+            return False
+        names = list(self.ResponseModel.model_fields)
+        last = max(names.index(field) for field in fields)
+        return any(getattr(partial, name, None) is not None for name in names[last + 1 :])
+
+    def has_valid_fields(self, partial: BaseModel, fields: Tuple[str, ...]) -> bool:
+        """Checks whether the given fields of a partial response are valid.
+
+        The fields are validated against their types and constraints in the
+        ResponseModel. Model validators of the ResponseModel are not run.
+
+        Args:
+            partial: A partial response
+            fields: Names of the fields to check
+
+        Returns:
+            True if every field is valid
+        """
+        model = ready_fields_model(self.ResponseModel, tuple(fields))
+        try:
+            model.model_validate({name: getattr(partial, name) for name in fields})
+        except ValidationError:
+            return False
+        return True
+
+    def _store_result(
+        self,
+        task_context: TaskContext,
+        response_model: BaseModel,
+        complete: bool,
+        usage: Any = None,
+    ) -> TaskContext:
+        """Stores a partial or complete response in the task context.
+
+        Args:
+            task_context: Current pipeline task context
+            response_model: The partial or complete response
+            complete: Whether the stream has ended and the response is validated
+            usage: Token usage of the stream's final completion, if reported
+
+        Returns:
+            Updated TaskContext with the response
+        """
+        task_context.nodes[self.node_name] = {
+            "response_model": response_model,
+            "usage": usage,
+            "complete": complete,
+        }
+        return task_context
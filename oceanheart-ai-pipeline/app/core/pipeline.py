@@ -1,21 +1,29 @@
+import asyncio
 import logging
 from abc import ABC
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
-from typing import Dict, Optional, ClassVar, Type
+from typing import Dict, List, Optional, ClassVar, Type
 
 from api.event_schema import EventSchema
-from core.base import Node
+from core.base import AsyncNode, Node
+from core.join import JoinNode
+from core.llm import StreamingLLMNode
+from core.plan import ExecutionPlan
 from core.router import BaseRouter
 from core.schema import PipelineSchema
 from core.task import TaskContext
 from core.validate import PipelineValidator
+from services.rate_limiter import llm_priority
 
 """
 Pipeline Orchestration Module
 
 This module implements the core pipeline functionality.
 It provides a flexible framework for defining and executing pipelines with multiple
-nodes and routing logic.
+nodes and routing logic. Pipelines can be executed synchronously with run() or on
+an event loop with arun(). With arun(), streaming LLM nodes hand over to the next
+node as soon as the fields it depends on are final.
 """
 
 
@@ -28,6 +36,10 @@ class Pipeline(ABC):
 
     Attributes:
         pipeline_schema: Class variable defining the pipeline's structure and flow
+        llm_priority: Rate limit lane of the pipeline's LLM requests, or None
+            for normal. Set by the pipeline class, never by the event, so
+            API callers cannot claim the high lane.
+        plan: Compiled ExecutionPlan shared by all instances of the pipeline class
         validator: Validates the pipeline schema
         nodes: Dictionary mapping node classes to their instances
 
@@ -43,19 +55,42 @@ class Pipeline(ABC):
     """
 
     pipeline_schema: ClassVar[PipelineSchema]
+    llm_priority: ClassVar[Optional[str]] = None
+    _execution_plan: ClassVar[Optional[ExecutionPlan]] = None
 
     def __init__(self):
         """Initializes the pipeline by validating schema and creating nodes."""
-        self.validator = PipelineValidator(self.pipeline_schema)
+        self.plan = self.get_execution_plan()
+        self.validator = PipelineValidator(self.pipeline_schema, self.plan)
         self.validator.validate()
         self.nodes: Dict[Type[Node], Node] = self._initialize_nodes()
 
+    @classmethod
+    def get_execution_plan(cls) -> ExecutionPlan:
+        """Gets the compiled execution plan for this pipeline class.
+
+        The plan is compiled on first access and cached on the class, so every
+        instance of the same pipeline shares a single adjacency table.
+
+        Returns:
+            ExecutionPlan compiled from the class's pipeline_schema
+        """
+        plan = cls.__dict__.get("_execution_plan")
+        if plan is None:
+            plan = ExecutionPlan.compile(cls.pipeline_schema)
+            cls._execution_plan = plan
+        return plan
+
     @contextmanager
-    def node_context(self, node_name: str):
+    def node_context(self, node_name: str, task_context: TaskContext):
         """Context manager for logging node execution and handling errors.
 
+        LLM requests made by the node run in the priority lane stored in
+        task_context.metadata["llm_priority"], if any.
+
         Args:
             node_name: Name of the node being executed
+            task_context: The task context the node runs with
 
         Yields:
             None
@@ -65,7 +100,8 @@ class Pipeline(ABC):
         """
         logging.info(f"Starting node: {node_name}")
         try:
-            yield
+            with llm_priority(task_context.metadata.get("llm_priority")):
+                yield
         except Exception as e:
             logging.error(f"Error in node {node_name}: {str(e)}")
             raise
@@ -78,13 +114,10 @@ class Pipeline(ABC):
         Returns:
             Dictionary mapping node classes to their instances
         """
-        nodes = {}
-        for node_config in self.pipeline_schema.nodes:
-            nodes[node_config.node] = self._instantiate_node(node_config.node)
-            for connected_node in node_config.connections:
-                if connected_node not in nodes:
-                    nodes[connected_node] = self._instantiate_node(connected_node)
-        return nodes
+        return {
+            node_class: self._instantiate_node(node_class)
+            for node_class in self.plan.topological_order
+        }
 
     @staticmethod
     def _instantiate_node(node_class: Type[Node]) -> Node:
@@ -101,6 +134,8 @@ class Pipeline(ABC):
     def run(self, event: EventSchema) -> TaskContext:
         """Executes the pipeline for a given event.
 
+        The LLM requests of all nodes run in the pipeline's priority lane.
+
         Args:
             event: The event to process through the pipeline
 
@@ -110,19 +145,315 @@ class Pipeline(ABC):
         Raises:
             Exception: Any exception that occurs during pipeline execution
         """
-        task_context = TaskContext(event=event, pipeline=self)
+        task_context = self._create_context(event)
         current_node_class = self.pipeline_schema.start
+        self._start_prefetches(task_context)
+
+        try:
+            while current_node_class:
+                current_node = self.nodes[current_node_class]
+                with self.node_context(current_node_class.__name__, task_context):
+                    task_context = current_node.process(task_context)
+                if self.plan.is_parallel(current_node_class):
+                    task_context = self._run_branches(current_node_class, task_context)
+                    current_node_class = self.plan.joins[current_node_class]
+                    continue
+                current_node_class = self._get_next_node_class(
+                    current_node_class, task_context
+                )
+        finally:
+            task_context.discard_prefetches()
+
+        return task_context
+
+    async def arun(self, event: EventSchema) -> TaskContext:
+        """Executes the pipeline for a given event on the running event loop.
+
+        AsyncNode instances are awaited directly. Synchronous nodes are run in
+        the default thread pool so they do not block other pipelines sharing
+        the same event loop. A StreamingLLMNode with ready_fields keeps
+        streaming in the background once those fields are final, while the
+        pipeline moves on; the run waits for all streams before it returns.
+        The LLM requests of all nodes run in the pipeline's priority lane.
+
+        Args:
+            event: The event to process through the pipeline
+
+        Returns:
+            TaskContext containing the results of pipeline execution
+
+        Raises:
+            Exception: Any exception that occurs during pipeline execution
+        """
+        task_context = self._create_context(event)
+        current_node_class = self.pipeline_schema.start
+        self._start_prefetches(task_context)
+        streams: Dict[str, asyncio.Task] = {}
+
+        try:
+            while current_node_class:
+                current_node = self.nodes[current_node_class]
+                with self.node_context(current_node_class.__name__, task_context):
+                    if (
+                        isinstance(current_node, StreamingLLMNode)
+                        and current_node.ready_fields
+                    ):
+                        task_context = await self._astream_node(
+                            current_node, task_context, streams
+                        )
+                    else:
+                        task_context = await self._aprocess_node(
+                            current_node, task_context
+                        )
+                if self.plan.is_parallel(current_node_class):
+                    task_context = await self._arun_branches(
+                        current_node_class, task_context
+                    )
+                    current_node_class = self.plan.joins[current_node_class]
+                    continue
+                current_node_class = self._get_next_node_class(
+                    current_node_class, task_context
+                )
+            await self._await_streams(streams)
+        finally:
+            for stream in streams.values():
+                stream.cancel()
+            task_context.discard_prefetches()
+
+        return task_context
+
+    def _create_context(self, event: EventSchema) -> TaskContext:
+        """Creates the task context for a new pipeline run.
+
+        The pipeline's priority lane is stored before any node runs, so
+        prefetches and the first LLM node already run in it.
+
+        Args:
+            event: The event to process through the pipeline
+
+        Returns:
+            A new TaskContext for the event
+        """
+        task_context = TaskContext(event=event, pipeline=self)
+        if self.llm_priority:
+            task_context.metadata["llm_priority"] = self.llm_priority
+        return task_context
+
+    @staticmethod
+    async def _aprocess_node(node: Node, task_context: TaskContext) -> TaskContext:
+        """Processes a single node without blocking the event loop.
+
+        Args:
+            node: The node instance to execute
+            task_context: The current task context
+
+        Returns:
+            Updated TaskContext with the node's processing results
+        """
+        if isinstance(node, AsyncNode):
+            return await node.aprocess(task_context)
+        return await asyncio.to_thread(node.process, task_context)
+
+    @staticmethod
+    async def _astream_node(
+        node: StreamingLLMNode,
+        task_context: TaskContext,
+        streams: Dict[str, asyncio.Task],
+    ) -> TaskContext:
+        """Runs a streaming node until its ready fields are final.
+
+        If the node becomes ready before it finishes, the rest of its stream
+        keeps running as a task in streams.
+
+        Args:
+            node: The streaming node instance to execute
+            task_context: The current task context
+            streams: Unfinished streaming node tasks by node name
+
+        Returns:
+            TaskContext with at least the node's ready fields
+        """
+        ready = task_context.expect_ready(node.node_name)
+        stream = asyncio.create_task(node.aprocess(task_context))
+        ready_wait = asyncio.create_task(ready.wait())
+        try:
+            await asyncio.wait(
+                {stream, ready_wait}, return_when=asyncio.FIRST_COMPLETED
+            )
+        except BaseException:
+            stream.cancel()
+            raise
+        finally:
+            ready_wait.cancel()
+        if stream.done():
+            return stream.result()
+        logging.info(f"Dispatching after node {node.node_name} became ready")
+        streams[node.node_name] = stream
+        return task_context
+
+    @staticmethod
+    async def _await_streams(streams: Dict[str, asyncio.Task]) -> None:
+        """Waits for streaming nodes that were still running after dispatch.
+
+        Args:
+            streams: Unfinished streaming node tasks by node name
+
+        Raises:
+            Exception: The first error raised by a streaming node
+        """
+        for node_name, stream in list(streams.items()):
+            try:
+                await stream
+            except Exception as e:
+                logging.error(f"Error in node {node_name}: {str(e)}")
+                raise
+            finally:
+                del streams[node_name]
+
+    def _start_prefetches(self, task_context: TaskContext) -> None:
+        """Starts speculative work for all nodes configured with prefetch=True.
+
+        A failing prefetch is logged and skipped; the node then does the work
+        itself when it runs.
 
-        while current_node_class:
-            current_node = self.nodes[current_node_class]
-            with self.node_context(current_node_class.__name__):
-                task_context = current_node.process(task_context)
-            current_node_class = self._get_next_node_class(
-                current_node_class, task_context
+        Args:
+            task_context: The task context for the new pipeline run
+        """
+        with llm_priority(task_context.metadata.get("llm_priority")):
+            for node_class in self.plan.prefetch:
+                try:
+                    self.nodes[node_class].prefetch(task_context)
+                except Exception as e:
+                    logging.warning(
+                        f"Prefetch for node {node_class.__name__} failed: {str(e)}"
+                    )
+
+    def _run_branches(
+        self, parallel_node_class: Type[Node], task_context: TaskContext
+    ) -> TaskContext:
+        """Runs the branches of a parallel node concurrently in threads.
+
+        Args:
+            parallel_node_class: The class of the parallel node
+            task_context: The task context after the parallel node ran
+
+        Returns:
+            TaskContext with all branch results merged by the join node
+        """
+        branches = self.plan.branches[parallel_node_class]
+        with ThreadPoolExecutor(max_workers=len(branches)) as executor:
+            futures = [
+                executor.submit(
+                    self._run_branch, branch, self._fork_context(task_context)
+                )
+                for branch in branches
+            ]
+            branch_contexts = [future.result() for future in futures]
+        return self._join_branches(parallel_node_class, task_context, branch_contexts)
+
+    async def _arun_branches(
+        self, parallel_node_class: Type[Node], task_context: TaskContext
+    ) -> TaskContext:
+        """Runs the branches of a parallel node concurrently on the event loop.
+
+        Args:
+            parallel_node_class: The class of the parallel node
+            task_context: The task context after the parallel node ran
+
+        Returns:
+            TaskContext with all branch results merged by the join node
+        """
+        branch_contexts = await asyncio.gather(
+            *(
+                self._arun_branch(branch, self._fork_context(task_context))
+                for branch in self.plan.branches[parallel_node_class]
             )
+        )
+        return self._join_branches(parallel_node_class, task_context, branch_contexts)
+
+    def _run_branch(
+        self, branch: List[Type[Node]], task_context: TaskContext
+    ) -> TaskContext:
+        """Runs the nodes of a single branch in order.
 
+        Args:
+            branch: The node classes of the branch
+            task_context: The branch's own copy of the task context
+
+        Returns:
+            The branch's task context after all of its nodes ran
+        """
+        for node_class in branch:
+            with self.node_context(node_class.__name__, task_context):
+                task_context = self.nodes[node_class].process(task_context)
+        return task_context
+
+    async def _arun_branch(
+        self, branch: List[Type[Node]], task_context: TaskContext
+    ) -> TaskContext:
+        """Runs the nodes of a single branch in order on the event loop.
+
+        Args:
+            branch: The node classes of the branch
+            task_context: The branch's own copy of the task context
+
+        Returns:
+            The branch's task context after all of its nodes ran
+        """
+        for node_class in branch:
+            with self.node_context(node_class.__name__, task_context):
+                task_context = await self._aprocess_node(
+                    self.nodes[node_class], task_context
+                )
         return task_context
 
+    @staticmethod
+    def _fork_context(task_context: TaskContext) -> TaskContext:
+        """Creates a copy of the task context for a parallel branch.
+
+        The nodes and metadata dictionaries are copied so branches cannot see
+        each other's results while they run.
+
+        Args:
+            task_context: The task context to copy
+
+        Returns:
+            A copy of the task context with its own nodes and metadata
+        """
+        return task_context.model_copy(
+            update={
+                "nodes": dict(task_context.nodes),
+                "metadata": dict(task_context.metadata),
+            }
+        )
+
+    def _join_branches(
+        self,
+        parallel_node_class: Type[Node],
+        task_context: TaskContext,
+        branch_contexts: List[TaskContext],
+    ) -> TaskContext:
+        """Merges branch results through the parallel node's join node.
+
+        Args:
+            parallel_node_class: The class of the parallel node
+            task_context: The task context before the branches ran
+            branch_contexts: The branch task contexts in declaration order
+
+        Returns:
+            TaskContext with all branch results merged
+        """
+        branch_results = [
+            {
+                name: result
+                for name, result in branch_context.nodes.items()
+                if task_context.nodes.get(name) is not result
+            }
+            for branch_context in branch_contexts
+        ]
+        join_node: JoinNode = self.nodes[self.plan.joins[parallel_node_class]]
+        return join_node.merge(task_context, branch_results)
+
     def _get_next_node_class(
         self, current_node_class: Type[Node], task_context: TaskContext
     ) -> Optional[Type[Node]]:
@@ -135,18 +466,14 @@ class Pipeline(ABC):
         Returns:
             The class of the next node to execute, or None if at the end
         """
-        node_config = next(
-            (nc for nc in self.pipeline_schema.nodes if nc.node == current_node_class),
-            None,
-        )
-
-        if not node_config or not node_config.connections:
+        connections = self.plan.get_connections(current_node_class)
+        if not connections:
             return None
 
-        if node_config.is_router:
+        if self.plan.is_router(current_node_class):
             return self._handle_router(self.nodes[current_node_class], task_context)
 
-        return node_config.connections[0]
+        return connections[0]
 
     def _handle_router(
         self, router: BaseRouter, task_context: TaskContext
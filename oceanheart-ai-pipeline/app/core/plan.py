@@ -0,0 +1,241 @@
+from collections import deque
+from typing import Dict, List, Optional, Set, Type
+
+from core.base import Node
+from core.join import JoinNode
+from core.schema import PipelineSchema
+
+"""
+Execution Plan Module
+
+This module compiles a PipelineSchema into an execution plan that can be shared
+by the pipeline orchestrator, the validator and the visualization utilities.
+Compiling the schema once turns every per-node lookup into a dictionary access
+instead of a scan over the schema's node configurations.
+"""
+
+
+class ExecutionPlan:
+    """Compiled, read-only view of a pipeline schema's graph.
+
+    The ExecutionPlan is built once per pipeline class and holds everything the
+    orchestrator needs to dispatch nodes without re-reading the schema.
+
+    Attributes:
+        start: The entry point Node class for the pipeline
+        adjacency: Mapping of every node class to the node classes it connects to
+        routers: Set of node classes configured as routers
+        parallel: Set of node classes whose connections run concurrently
+        prefetch: Node classes whose prefetch() runs when the pipeline starts
+        configured: Set of node classes that have their own NodeConfig
+        branches: Mapping of each parallel node class to its branches, where a
+            branch is the chain of node classes leading up to the join
+        joins: Mapping of each parallel node class to the JoinNode class its
+            branches converge on, or None if the branches do not converge
+        topological_order: Node classes in dependency order. Contains fewer
+            entries than adjacency if the graph has a cycle.
+
+    Example:
+        plan = ExecutionPlan.compile(pipeline_schema)
+        next_nodes = plan.adjacency[AnalyzeNode]
+    """
+
+    def __init__(
+        self,
+        start: Type[Node],
+        adjacency: Dict[Type[Node], List[Type[Node]]],
+        routers: Set[Type[Node]],
+        configured: Set[Type[Node]],
+        parallel: Optional[Set[Type[Node]]] = None,
+        prefetch: Optional[List[Type[Node]]] = None,
+    ):
+        """Initializes the plan from a prebuilt adjacency table.
+
+        Args:
+            start: The entry point Node class
+            adjacency: Mapping of node classes to their connections
+            routers: Node classes configured as routers
+            configured: Node classes that have their own NodeConfig
+            parallel: Node classes whose connections run concurrently
+            prefetch: Node classes whose prefetch() runs when the pipeline starts
+        """
+        self.start = start
+        self.adjacency = adjacency
+        self.routers = routers
+        self.parallel = parallel or set()
+        self.prefetch = prefetch or []
+        self.configured = configured
+        self.topological_order = self._topological_sort()
+        self.branches: Dict[Type[Node], List[List[Type[Node]]]] = {}
+        self.joins: Dict[Type[Node], Optional[Type[Node]]] = {}
+        for node_class in self.parallel:
+            self._resolve_branches(node_class)
+
+    @classmethod
+    def compile(cls, pipeline_schema: PipelineSchema) -> "ExecutionPlan":
+        """Builds an execution plan from a pipeline schema.
+
+        Nodes that only appear as connections (leaf nodes without their own
+        NodeConfig) are included in the adjacency table with no connections.
+        If a node is configured more than once, the first NodeConfig wins.
+
+        Args:
+            pipeline_schema: The PipelineSchema to compile
+
+        Returns:
+            ExecutionPlan for the given schema
+        """
+        adjacency: Dict[Type[Node], List[Type[Node]]] = {pipeline_schema.start: []}
+        routers: Set[Type[Node]] = set()
+        parallel: Set[Type[Node]] = set()
+        prefetch: List[Type[Node]] = []
+        configured: Set[Type[Node]] = set()
+
+        for node_config in pipeline_schema.nodes:
+            if node_config.node in configured:
+                continue
+            adjacency[node_config.node] = list(node_config.connections)
+            configured.add(node_config.node)
+            if node_config.is_router:
+                routers.add(node_config.node)
+            if node_config.parallel:
+                parallel.add(node_config.node)
+            if node_config.prefetch:
+                prefetch.append(node_config.node)
+
+        for connections in list(adjacency.values()):
+            for connected_node in connections:
+                adjacency.setdefault(connected_node, [])
+
+        return cls(
+            start=pipeline_schema.start,
+            adjacency=adjacency,
+            routers=routers,
+            configured=configured,
+            parallel=parallel,
+            prefetch=prefetch,
+        )
+
+    @property
+    def has_cycle(self) -> bool:
+        """Whether the compiled graph contains a cycle.
+
+        Returns:
+            bool: True if not every node could be topologically ordered
+        """
+        return len(self.topological_order) < len(self.adjacency)
+
+    def is_router(self, node_class: Type[Node]) -> bool:
+        """Checks whether a node class is configured as a router.
+
+        Args:
+            node_class: The node class to check
+
+        Returns:
+            bool: True if the node is a router
+        """
+        return node_class in self.routers
+
+    def is_parallel(self, node_class: Type[Node]) -> bool:
+        """Checks whether a node class fans out into parallel branches.
+
+        Args:
+            node_class: The node class to check
+
+        Returns:
+            bool: True if the node's connections run concurrently
+        """
+        return node_class in self.parallel
+
+    def get_connections(self, node_class: Type[Node]) -> List[Type[Node]]:
+        """Gets the node classes a node connects to.
+
+        Args:
+            node_class: The node class to look up
+
+        Returns:
+            List of connected node classes, empty for leaf or unknown nodes
+        """
+        return self.adjacency.get(node_class, [])
+
+    def get_reachable_nodes(self) -> Set[Type[Node]]:
+        """Identifies all nodes reachable from the start node using BFS.
+
+        Returns:
+            Set[Type[Node]]: Set of all reachable node classes
+        """
+        reachable = {self.start}
+        queue = deque([self.start])
+
+        while queue:
+            node = queue.popleft()
+            for neighbor in self.adjacency.get(node, []):
+                if neighbor not in reachable:
+                    reachable.add(neighbor)
+                    queue.append(neighbor)
+
+        return reachable
+
+    def _resolve_branches(self, node_class: Type[Node]) -> None:
+        """Follows each connection of a parallel node up to its JoinNode.
+
+        A branch is a chain of single-connection nodes that ends in a JoinNode.
+        Branches that hit a router, a nested parallel node, a dead end or a
+        cycle before reaching a join are recorded without a join, which the
+        validator reports as an error.
+
+        Args:
+            node_class: The parallel node class to resolve
+        """
+        branches: List[List[Type[Node]]] = []
+        join_nodes: Set[Optional[Type[Node]]] = set()
+
+        for branch_start in self.adjacency.get(node_class, []):
+            branch: List[Type[Node]] = []
+            current = branch_start
+            join_node = None
+            while current is not None and current not in branch:
+                if issubclass(current, JoinNode):
+                    join_node = current
+                    break
+                branch.append(current)
+                connections = self.adjacency.get(current, [])
+                if (
+                    len(connections) != 1
+                    or current in self.routers
+                    or current in self.parallel
+                ):
+                    break
+                current = connections[0]
+            branches.append(branch)
+            join_nodes.add(join_node)
+
+        self.branches[node_class] = branches
+        self.joins[node_class] = join_nodes.pop() if len(join_nodes) == 1 else None
+
+    def _topological_sort(self) -> List[Type[Node]]:
+        """Orders the nodes using Kahn's algorithm.
+
+        Nodes that are part of a cycle never reach an in-degree of zero and are
+        therefore left out of the result.
+
+        Returns:
+            List of node classes in topological order
+        """
+        in_degree: Dict[Type[Node], int] = {node: 0 for node in self.adjacency}
+        for connections in self.adjacency.values():
+            for neighbor in connections:
+                in_degree[neighbor] += 1
+
+        queue = deque(node for node, degree in in_degree.items() if degree == 0)
+        order: List[Type[Node]] = []
+
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for neighbor in self.adjacency[node]:
+                in_degree[neighbor] -= 1
+                if in_degree[neighbor] == 0:
+                    queue.append(neighbor)
+
+        return order
@@ -21,6 +21,10 @@ class NodeConfig(BaseModel):
         node: The Node class to be instantiated
         connections: List of Node classes this node can connect to
         is_router: Flag indicating if this node performs routing logic
+        parallel: Flag indicating that all connections run concurrently as
+            branches that converge on a common JoinNode
+        prefetch: Flag indicating that the node's prefetch() is started when
+            the pipeline starts, before it is known whether the node will run
         description: Optional description of the node's purpose
 
     Example:
@@ -35,6 +39,8 @@ class NodeConfig(BaseModel):
     node: Type[Node]
     connections: List[Type[Node]] = Field(default_factory=list)
     is_router: bool = False
+    parallel: bool = False
+    prefetch: bool = False
     description: Optional[str] = None
 
 
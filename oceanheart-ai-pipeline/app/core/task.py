@@ -1,7 +1,10 @@
-from typing import Any, Dict
+import asyncio
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
 
 from api.event_schema import EventSchema
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 """
 Task Context Module
@@ -10,6 +13,8 @@ This module defines the context object that gets passed between pipeline nodes.
 It maintains the state and metadata throughout pipeline execution.
 """
 
+_prefetch_executor = ThreadPoolExecutor(thread_name_prefix="prefetch")
+
 
 class TaskContext(BaseModel):
     """Context container for pipeline task execution.
@@ -22,6 +27,11 @@ class TaskContext(BaseModel):
         event: The original event that triggered the pipeline
         nodes: Dictionary storing results and state from each node's execution
         metadata: Dictionary storing pipeline-level metadata and configuration
+        _prefetched: Speculative work started by nodes ahead of their turn,
+            keyed by node name. Not serialized with the context.
+        _ready: Events set by streaming nodes once the results the next nodes
+            depend on are final, keyed by node name. Not serialized with the
+            context.
 
     Example:
         context = TaskContext(
@@ -40,3 +50,67 @@ class TaskContext(BaseModel):
         default_factory=dict,
         description="Stores pipeline-level metadata and configuration",
     )
+    _prefetched: Dict[str, Future] = PrivateAttr(default_factory=dict)
+    _ready: Dict[str, asyncio.Event] = PrivateAttr(default_factory=dict)
+
+    def start_prefetch(
+        self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> None:
+        """Starts speculative work in the background.
+
+        The work runs in a copy of the caller's context, so it keeps the
+        caller's LLM priority lane.
+
+        Args:
+            name: Key to retrieve the result with, usually the node name
+            fn: Callable to run in the prefetch thread pool
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+        """
+        self._prefetched[name] = _prefetch_executor.submit(
+            contextvars.copy_context().run, fn, *args, **kwargs
+        )
+
+    def pop_prefetch(self, name: str) -> Optional[Future]:
+        """Takes ownership of speculative work started under a name.
+
+        Args:
+            name: Key the work was started with
+
+        Returns:
+            Future for the work, or None if nothing was prefetched
+        """
+        return self._prefetched.pop(name, None)
+
+    def discard_prefetches(self) -> None:
+        """Cancels or drops all speculative work that was never consumed."""
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
+
+    def expect_ready(self, name: str) -> asyncio.Event:
+        """Creates the event a streaming node sets once its result is usable.
+
+        Must be called on the event loop the node runs on.
+
+        Args:
+            name: Name of the streaming node
+
+        Returns:
+            Event that is set when the node calls mark_ready()
+        """
+        event = asyncio.Event()
+        self._ready[name] = event
+        return event
+
+    def mark_ready(self, name: str) -> None:
+        """Signals that the results the next nodes depend on are final.
+
+        Does nothing unless expect_ready() was called for the name.
+
+        Args:
+            name: Name of the streaming node
+        """
+        event = self._ready.pop(name, None)
+        if event is not None:
+            event.set()
@@ -1,7 +1,7 @@
-from collections import deque
-from typing import Set, Type
+from typing import Optional, Set, Type
 
 from core.base import Node
+from core.plan import ExecutionPlan
 from core.schema import PipelineSchema
 
 """
@@ -23,19 +23,25 @@ class PipelineValidator:
 
     Attributes:
         pipeline_schema: The PipelineSchema to validate
+        plan: The compiled ExecutionPlan used for graph traversal
 
     Example:
         validator = PipelineValidator(pipeline_schema)
         validator.validate()  # Raises ValueError if validation fails
     """
 
-    def __init__(self, pipeline_schema: PipelineSchema):
+    def __init__(
+        self, pipeline_schema: PipelineSchema, plan: Optional[ExecutionPlan] = None
+    ):
         """Initializes the validator with a pipeline schema.
 
         Args:
             pipeline_schema: The PipelineSchema to validate
+            plan: Optional precompiled ExecutionPlan for the schema. Compiled
+                from the schema if not provided.
         """
         self.pipeline_schema = pipeline_schema
+        self.plan = plan or ExecutionPlan.compile(pipeline_schema)
 
     def validate(self):
         """Validates all aspects of the pipeline schema.
@@ -62,7 +68,7 @@ class PipelineValidator:
             raise ValueError("Pipeline schema contains a cycle")
 
         reachable_nodes = self._get_reachable_nodes()
-        all_nodes = set(nc.node for nc in self.pipeline_schema.nodes)
+        all_nodes = self.plan.configured
         unreachable_nodes = all_nodes - reachable_nodes
         if unreachable_nodes:
             raise ValueError(
@@ -70,38 +76,12 @@ class PipelineValidator:
             )
 
     def _has_cycle(self) -> bool:
-        """Detects cycles in the pipeline graph using DFS.
+        """Detects cycles in the pipeline graph using the plan's topological order.
 
         Returns:
             bool: True if a cycle is detected, False otherwise
         """
-        visited = set()
-        rec_stack = set()
-
-        def dfs(node: Type[Node]) -> bool:
-            visited.add(node)
-            rec_stack.add(node)
-
-            node_config = next(
-                (nc for nc in self.pipeline_schema.nodes if nc.node == node), None
-            )
-            if node_config:
-                for neighbor in node_config.connections:
-                    if neighbor not in visited:
-                        if dfs(neighbor):
-                            return True
-                    elif neighbor in rec_stack:
-                        return True
-
-            rec_stack.remove(node)
-            return False
-
-        for node_config in self.pipeline_schema.nodes:
-            if node_config.node not in visited:
-                if dfs(node_config.node):
-                    return True
-
-        return False
+        return self.plan.has_cycle
 
     def _get_reachable_nodes(self) -> Set[Type[Node]]:
         """Identifies all nodes reachable from the start node using BFS.
@@ -109,31 +89,51 @@ class PipelineValidator:
         Returns:
             Set[Type[Node]]: Set of all reachable node classes
         """
-        reachable = set()
-        queue = deque([self.pipeline_schema.start])
-
-        while queue:
-            node = queue.popleft()
-            if node not in reachable:
-                reachable.add(node)
-                node_config = next(
-                    (nc for nc in self.pipeline_schema.nodes if nc.node == node), None
-                )
-                if node_config:
-                    queue.extend(node_config.connections)
-
-        return reachable
+        return self.plan.get_reachable_nodes()
 
     def _validate_connections(self):
         """Validates node connection configurations.
 
-        Ensures that only nodes marked as routers have multiple connections.
+        Ensures that only nodes marked as routers or parallel have multiple
+        connections, and that parallel branches converge on a single JoinNode.
 
         Raises:
-            ValueError: If a non-router node has multiple connections
+            ValueError: If a non-router, non-parallel node has multiple
+                connections, or if a parallel node is misconfigured
         """
         for node_config in self.pipeline_schema.nodes:
-            if len(node_config.connections) > 1 and not node_config.is_router:
+            if node_config.is_router and node_config.parallel:
+                raise ValueError(
+                    f"Node {node_config.node.__name__} cannot be both a router and parallel."
+                )
+            if (
+                len(node_config.connections) > 1
+                and not node_config.is_router
+                and not node_config.parallel
+            ):
+                raise ValueError(
+                    f"Node {node_config.node.__name__} has multiple connections but is not marked as a router or parallel."
+                )
+
+        self._validate_parallel_branches()
+
+    def _validate_parallel_branches(self):
+        """Validates that every parallel node's branches converge on one JoinNode.
+
+        Raises:
+            ValueError: If branches do not end in the same JoinNode, or if a
+                branch contains a router or nested parallel node
+        """
+        for node_class in self.plan.parallel:
+            for branch in self.plan.branches[node_class]:
+                for branch_node in branch:
+                    if self.plan.is_router(branch_node) or self.plan.is_parallel(
+                        branch_node
+                    ):
+                        raise ValueError(
+                            f"Node {branch_node.__name__} in a parallel branch of {node_class.__name__} cannot be a router or parallel."
+                        )
+            if self.plan.joins.get(node_class) is None:
                 raise ValueError(
-                    f"Node {node_config.node.__name__} has multiple connections but is not marked as a router."
+                    f"Parallel node {node_class.__name__} must have branches that all end in the same JoinNode."
                 )
@@ -0,0 +1,26 @@
+from config.settings import get_settings
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from database.database_utils import DatabaseUtils
+
+"""
+Async Session Module
+
+This module provides asyncio sessions for database operations in the API
+server. They use the asyncpg driver, so requests wait for the database on the
+event loop instead of occupying a thread. Sessions keep their objects loaded
+after a commit, since reloading them would need another round trip.
+"""
+
+api_settings = get_settings().api
+
+async_engine = create_async_engine(
+    DatabaseUtils.get_async_connection_string(),
+    pool_size=api_settings.db_pool_size,
+    max_overflow=api_settings.db_max_overflow,
+    pool_timeout=api_settings.ingest_timeout,
+    pool_pre_ping=True,
+)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
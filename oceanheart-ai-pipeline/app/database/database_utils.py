@@ -22,3 +22,10 @@ class DatabaseUtils:
         db_password = os.getenv("DATABASE_PASSWORD", "postgres")
 
         return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+    @staticmethod
+    def get_async_connection_string():
+        """Returns the connection string for SQLAlchemy's asyncpg dialect."""
+        return DatabaseUtils.get_connection_string().replace(
+            "postgresql://", "postgresql+asyncpg://", 1
+        )
@@ -1,8 +1,8 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import JSON, Column, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Index, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from database.session import Base
 
@@ -14,9 +14,28 @@ It provides two main storage components:
 1. Raw event data (data column): Stores the original incoming event
 2. Processing results (task_context column): Stores the pipeline processing results
 
+Both columns are JSONB, so Postgres stores them parsed and can index them.
+Operational queries filter on the indexed expressions below, see
+database/event_repository.py.
+
+The table is a TimescaleDB hypertable partitioned on created_at, so the
+primary key includes created_at. The ORM still identifies events by id alone.
+Old chunks are compressed and, once past the retention period, archived to
+Parquet and dropped, see database/event_partitioning.py.
+
 This model is used with Alembic to generate the initial database migration.
+Expression indexes are not picked up by Alembic's autogenerate; existing
+databases are migrated with utils/migrate_events.py, and converted to a
+hypertable with utils/partition_events.py.
 """
 
+# Indexed expressions. Queries must use them verbatim for Postgres to use the indexes.
+TO_EMAIL_EXPRESSION = "(data ->> 'to_email')"
+INTENT_EXPRESSION = (
+    "(task_context -> 'nodes' -> 'AnalyzeTicket' -> 'response_model' ->> 'intent')"
+)
+ESCALATED_CONDITION = "(task_context -> 'nodes' ? 'EscalateTicket')"
+
 
 class Event(Base):
     """SQLAlchemy model for storing events and their processing results.
@@ -26,14 +45,31 @@ class Event(Base):
     storage of both raw data and processing context.
 
     Attributes:
-        id: UUID primary key, auto-generated
+        id: UUID identifying the event, auto-generated
         data: Raw event data as received by the API
         task_context: Results and metadata from pipeline processing
-        created_at: Timestamp of event creation
+        created_at: Timestamp of event creation and partitioning column
         updated_at: Timestamp of last update
     """
 
     __tablename__ = "events"
+    __table_args__ = (
+        # Containment queries on the raw event, e.g. data @> '{"sender": "..."}'
+        Index(
+            "ix_events_data",
+            "data",
+            postgresql_using="gin",
+            postgresql_ops={"data": "jsonb_path_ops"},
+        ),
+        Index("ix_events_to_email", text(TO_EMAIL_EXPRESSION)),
+        Index("ix_events_intent_created_at", text(INTENT_EXPRESSION), "created_at"),
+        Index(
+            "ix_events_escalated_created_at",
+            "created_at",
+            postgresql_where=text(ESCALATED_CONDITION),
+        ),
+        Index("ix_events_created_at", "created_at"),
+    )
 
     id = Column(
         UUID(as_uuid=True),
@@ -42,11 +78,17 @@ class Event(Base):
         doc="Unique identifier for the event",
     )
 
-    data = Column(JSON, doc="Raw event data as received from the API endpoint")
-    task_context = Column(JSON, doc="Processing results and metadata from the pipeline")
+    data = Column(JSONB, doc="Raw event data as received from the API endpoint")
+    task_context = Column(
+        JSONB, doc="Processing results and metadata from the pipeline"
+    )
 
+    # Unique constraints on a hypertable must include the partitioning column
     created_at = Column(
-        DateTime, default=datetime.now, doc="Timestamp when the event was created"
+        DateTime,
+        primary_key=True,
+        default=datetime.now,
+        doc="Timestamp when the event was created",
     )
     updated_at = Column(
         DateTime,
@@ -54,3 +96,10 @@ class Event(Base):
         onupdate=datetime.now,
         doc="Timestamp when the event was last updated",
     )
+
+    # The ORM identifies events by id alone, but Postgres can only prune chunks
+    # on created_at. Look events up through EventRepository, which bounds
+    # created_at using the uuid1 timestamp of the id, and pass created_at to
+    # bulk updates. A lookup by id alone probes every chunk and decompresses
+    # every compressed one.
+    __mapper_args__ = {"primary_key": [id]}
@@ -0,0 +1,368 @@
+import json
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional
+
+from sqlalchemy import MetaData, Table, text
+from sqlalchemy.engine import Connection, Engine, Row
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+from config.database_config import EventStoreConfig
+from config.settings import get_settings
+from database.event import Event
+
+"""
+Event Partitioning Module
+
+This module keeps the events table bounded in size. The table is a TimescaleDB
+hypertable partitioned on created_at into chunks of EVENTS_CHUNK_INTERVAL_DAYS.
+Chunks older than EVENTS_COMPRESS_AFTER_DAYS are compressed by a TimescaleDB
+policy. Chunks older than EVENTS_RETENTION_DAYS are exported to Parquet files
+in EVENTS_ARCHIVE_DIR and dropped by the enforce_event_retention task.
+
+Existing events tables are converted online: the events are copied in batches
+to a new hypertable while the API keeps writing to the old table, then the
+tables are swapped in a short transaction that blocks writes only while the
+last changed rows are copied. The old table is kept as events_legacy.
+"""
+
+TABLE = Event.__tablename__
+STAGING_TABLE = f"{TABLE}_hypertable"
+LEGACY_TABLE = f"{TABLE}_legacy"
+LEGACY_UPDATED_AT_INDEX = f"ix_{LEGACY_TABLE}_updated_at"
+
+# Copies rows from the old table. Casting also converts JSON columns to JSONB.
+# The primary key must only depend on immutable data, so that repeated copies
+# of a row always land on the same key. FILL_CREATED_AT gives legacy rows a
+# created_at first; rows still without one are placed at the epoch.
+_COPY_ROWS = f"""
+    INSERT INTO {STAGING_TABLE} (id, data, task_context, created_at, updated_at)
+    SELECT id, data::jsonb, task_context::jsonb,
+        COALESCE(created_at, TIMESTAMP 'epoch'), updated_at
+    FROM {{source}}
+    ON CONFLICT (id, created_at) DO UPDATE SET
+        data = EXCLUDED.data,
+        task_context = EXCLUDED.task_context,
+        updated_at = EXCLUDED.updated_at
+"""
+
+BACKFILL_BATCH = f"""
+    WITH batch AS (
+        SELECT * FROM {TABLE} WHERE id > CAST(:after AS uuid) ORDER BY id LIMIT :limit
+    ), copied AS (
+        {_COPY_ROWS.format(source="batch")}
+    )
+    SELECT count(*), (array_agg(id ORDER BY id DESC))[1] FROM batch
+"""
+
+COPY_CHANGED_ROWS = _COPY_ROWS.format(source=f"{TABLE} WHERE updated_at >= :since")
+
+# Legacy rows without created_at get their last update time, or the time of the
+# conversion, so they are partitioned and expire like any other row
+FILL_CREATED_AT = f"""
+    UPDATE {TABLE} SET created_at = COALESCE(updated_at, LOCALTIMESTAMP)
+    WHERE created_at IS NULL
+"""
+
+
+def is_hypertable(conn: Connection, table: str = TABLE) -> bool:
+    """Returns whether the table is a TimescaleDB hypertable."""
+    if not _table_exists(conn, "timescaledb_information.hypertables"):
+        return False
+    return conn.execute(
+        text(
+            "SELECT EXISTS (SELECT 1 FROM timescaledb_information.hypertables "
+            "WHERE hypertable_name = :table)"
+        ),
+        {"table": table},
+    ).scalar()
+
+
+def _table_exists(conn: Connection, table: str) -> bool:
+    return (
+        conn.execute(text("SELECT to_regclass(:table)"), {"table": table}).scalar()
+        is not None
+    )
+
+
+def convert_events_to_hypertable(
+    engine: Engine, config: Optional[EventStoreConfig] = None
+) -> None:
+    """Converts the events table to a hypertable and applies its policies.
+
+    Safe to run repeatedly: an interrupted conversion resumes, and on a table
+    that already is a hypertable only the policies are updated. Call it from
+    an Alembic migration of its own, before autogenerating further migrations.
+    Rows deleted from the old table during the conversion are not deleted
+    from the new one.
+
+    Args:
+        engine: Engine connected to the application database
+        config: Event storage settings. Defaults to the application settings.
+    """
+    config = config or get_settings().database.events
+    with engine.begin() as conn:
+        conn.exec_driver_sql("CREATE EXTENSION IF NOT EXISTS timescaledb")
+        if not _table_exists(conn, TABLE):
+            raise ValueError(f"Table {TABLE} does not exist, run the migrations first")
+        converted = is_hypertable(conn)
+    if not converted:
+        _convert(engine, config)
+    apply_event_policies(engine, config)
+
+
+def _convert(engine: Engine, config: EventStoreConfig) -> None:
+    started = datetime.now() - config.backfill_clock_margin
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Finds the rows written during the backfill without scanning the table
+        conn.exec_driver_sql(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {LEGACY_UPDATED_AT_INDEX} "
+            f"ON {TABLE} (updated_at)"
+        )
+
+    with engine.begin() as conn:
+        filled = conn.execute(text(FILL_CREATED_AT)).rowcount
+    if filled:
+        logging.info(f"Set created_at of {filled} events that had none")
+
+    staging = _create_staging_table(engine, config)
+    copied = _backfill(engine, config.backfill_batch_size)
+    logging.info(f"Copied {copied} events to {STAGING_TABLE}")
+
+    # Indexes are built after the backfill, which is faster than maintaining them
+    with engine.begin() as conn:
+        _rename_legacy_indexes(conn)
+    with engine.begin() as conn:
+        for index in staging.indexes:
+            conn.execute(CreateIndex(index, if_not_exists=True))
+
+    # Catches up on the rows written so far, so the swap has little left to copy
+    since = datetime.now() - config.backfill_clock_margin
+    with engine.begin() as conn:
+        changed = conn.execute(text(COPY_CHANGED_ROWS), {"since": started}).rowcount
+    logging.info(f"Copied {changed} events changed during the backfill")
+
+    with engine.begin() as conn:
+        conn.exec_driver_sql("SET LOCAL lock_timeout = '10s'")
+        # Blocks writes, but not reads, until the tables are swapped
+        conn.exec_driver_sql(f"LOCK TABLE {TABLE} IN EXCLUSIVE MODE")
+        changed = conn.execute(text(COPY_CHANGED_ROWS), {"since": since}).rowcount
+        conn.exec_driver_sql(f"ALTER TABLE {TABLE} RENAME TO {LEGACY_TABLE}")
+        conn.exec_driver_sql(
+            f"ALTER INDEX IF EXISTS {TABLE}_pkey RENAME TO {LEGACY_TABLE}_pkey"
+        )
+        conn.exec_driver_sql(f"ALTER TABLE {STAGING_TABLE} RENAME TO {TABLE}")
+        conn.exec_driver_sql(
+            f"ALTER INDEX {STAGING_TABLE}_pkey RENAME TO {TABLE}_pkey"
+        )
+    logging.info(
+        f"Copied {changed} events during the swap. {TABLE} is a hypertable now; "
+        f"drop {LEGACY_TABLE} once the data is verified."
+    )
+
+
+def _create_staging_table(engine: Engine, config: EventStoreConfig) -> Table:
+    staging = Event.__table__.to_metadata(MetaData(), name=STAGING_TABLE)
+    with engine.begin() as conn:
+        if not _table_exists(conn, STAGING_TABLE):
+            conn.execute(CreateTable(staging))
+        conn.execute(
+            text(
+                "SELECT create_hypertable(:table, 'created_at', "
+                "chunk_time_interval => :interval, "
+                "create_default_indexes => false, if_not_exists => true)"
+            ),
+            {"table": STAGING_TABLE, "interval": config.chunk_interval},
+        )
+    return staging
+
+
+def _backfill(engine: Engine, batch_size: int) -> int:
+    after = "00000000-0000-0000-0000-000000000000"
+    total = 0
+    while True:
+        # One transaction per batch keeps locks and WAL bursts short
+        with engine.begin() as conn:
+            count, last = conn.execute(
+                text(BACKFILL_BATCH), {"after": after, "limit": batch_size}
+            ).one()
+        if not count:
+            return total
+        total += count
+        after = str(last)
+        logging.info(f"Copied {total} events to {STAGING_TABLE}")
+
+
+def _rename_legacy_indexes(conn: Connection) -> None:
+    """Frees the model's index names on the old table for the new one."""
+    rows = conn.execute(
+        text(
+            "SELECT indexname FROM pg_indexes "
+            "WHERE tablename = :table AND indexname = ANY(:names)"
+        ),
+        {"table": TABLE, "names": [index.name for index in Event.__table__.indexes]},
+    )
+    for (name,) in rows.all():
+        conn.exec_driver_sql(f"ALTER INDEX {name} RENAME TO {name}_legacy")
+
+
+def apply_event_policies(
+    engine: Engine, config: Optional[EventStoreConfig] = None
+) -> None:
+    """Applies the configured chunk interval and compression policy.
+
+    The chunk interval only applies to chunks created from now on.
+
+    Args:
+        engine: Engine connected to the application database
+        config: Event storage settings. Defaults to the application settings.
+    """
+    config = config or get_settings().database.events
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT set_chunk_time_interval(:table, :interval)"),
+            {"table": TABLE, "interval": config.chunk_interval},
+        )
+        conn.execute(
+            text("SELECT remove_compression_policy(:table, if_exists => true)"),
+            {"table": TABLE},
+        )
+        if not config.compress_after:
+            return
+        compression_enabled = conn.execute(
+            text(
+                "SELECT compression_enabled FROM timescaledb_information.hypertables "
+                "WHERE hypertable_name = :table"
+            ),
+            {"table": TABLE},
+        ).scalar()
+        # The settings cannot change once chunks are compressed
+        if not compression_enabled:
+            conn.exec_driver_sql(
+                f"ALTER TABLE {TABLE} SET (timescaledb.compress, "
+                "timescaledb.compress_orderby = 'created_at DESC')"
+            )
+        conn.execute(
+            text("SELECT add_compression_policy(:table, compress_after => :after)"),
+            {"table": TABLE, "after": config.compress_after},
+        )
+
+
+def get_expired_chunks(conn: Connection, config: EventStoreConfig) -> List[Row]:
+    """Returns the chunks that lie entirely before the retention period.
+
+    The chunk holding the epoch is never expired: it only holds rows whose
+    creation time was unknown when the table was converted.
+    """
+    return conn.execute(
+        text(
+            "SELECT chunk_schema, chunk_name, range_start, range_end "
+            "FROM timescaledb_information.chunks "
+            "WHERE hypertable_name = :table AND range_end <= now() - :retention "
+            "AND range_start >= TIMESTAMP 'epoch' + INTERVAL '1 day' "
+            "ORDER BY range_start"
+        ),
+        {"table": TABLE, "retention": config.retention},
+    ).all()
+
+
+def archive_chunk(engine: Engine, chunk: Row, config: EventStoreConfig) -> Path:
+    """Exports the events of a chunk to a Parquet file in the archive directory.
+
+    The JSONB columns are stored as JSON strings. The file is written under a
+    temporary name and renamed once complete.
+
+    Args:
+        engine: Engine connected to the application database
+        chunk: Chunk as returned by get_expired_chunks()
+        config: Event storage settings
+
+    Returns:
+        Path of the Parquet file
+    """
+    # Imported here so that processes which never archive do not load pyarrow
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("id", pa.string()),
+            ("data", pa.string()),
+            ("task_context", pa.string()),
+            ("created_at", pa.timestamp("us")),
+            ("updated_at", pa.timestamp("us")),
+        ]
+    )
+    path = Path(config.archive_dir) / (
+        f"{TABLE}_{chunk.range_start:%Y%m%dT%H%M}_{chunk.range_end:%Y%m%dT%H%M}.parquet"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = path.with_name(f"{path.name}.partial")
+
+    with engine.connect() as conn, pq.ParquetWriter(
+        partial_path, schema, compression="zstd"
+    ) as writer:
+        result = conn.execution_options(stream_results=True).exec_driver_sql(
+            "SELECT id, data, task_context, created_at, updated_at "
+            f'FROM "{chunk.chunk_schema}"."{chunk.chunk_name}" ORDER BY created_at'
+        )
+        for rows in result.partitions(config.archive_batch_size):
+            writer.write_batch(
+                pa.record_batch(
+                    [
+                        [str(row.id) for row in rows],
+                        [_to_json(row.data) for row in rows],
+                        [_to_json(row.task_context) for row in rows],
+                        [row.created_at for row in rows],
+                        [row.updated_at for row in rows],
+                    ],
+                    schema=schema,
+                )
+            )
+    os.replace(partial_path, path)
+    return path
+
+
+def _to_json(value) -> Optional[str]:
+    return None if value is None else json.dumps(value)
+
+
+def enforce_retention(
+    engine: Engine, config: Optional[EventStoreConfig] = None
+) -> List[str]:
+    """Archives and drops the chunks older than the retention period.
+
+    Chunks are only archived when an archive directory is configured. A chunk
+    is dropped only after its archive file was written.
+
+    Args:
+        engine: Engine connected to the application database
+        config: Event storage settings. Defaults to the application settings.
+
+    Returns:
+        Names of the dropped chunks
+    """
+    config = config or get_settings().database.events
+    if not config.retention:
+        return []
+    with engine.connect() as conn:
+        chunks = get_expired_chunks(conn, config)
+
+    dropped = []
+    for chunk in chunks:
+        if config.archive_dir:
+            path = archive_chunk(engine, chunk, config)
+            logging.info(f"Archived chunk {chunk.chunk_name} to {path}")
+        with engine.begin() as conn:
+            # TimescaleDB removes dropped chunk tables from its catalog
+            conn.exec_driver_sql(
+                f'DROP TABLE "{chunk.chunk_schema}"."{chunk.chunk_name}"'
+            )
+        logging.info(
+            f"Dropped chunk {chunk.chunk_name} "
+            f"({chunk.range_start} to {chunk.range_end})"
+        )
+        dropped.append(chunk.chunk_name)
+    return dropped
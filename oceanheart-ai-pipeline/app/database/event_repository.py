@@ -0,0 +1,171 @@
+import uuid
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from sqlalchemy import Boolean, desc, func, literal_column, not_
+from sqlalchemy.orm import Query, Session
+
+from config.settings import get_settings
+from database.event import (
+    ESCALATED_CONDITION,
+    INTENT_EXPRESSION,
+    TO_EMAIL_EXPRESSION,
+    Event,
+)
+from database.repository import GenericRepository
+
+"""
+Event Repository Module
+
+This module provides queries on the events table that filter and aggregate
+inside Postgres. Each query is backed by one of the indexes declared on the
+Event model, so operational questions such as "all refund escalations this
+week" no longer scan the table or filter in Python.
+
+Lookups by id are bounded on created_at, which is derived from the timestamp
+in the uuid1 id. Without the bound, Postgres would probe every chunk of the
+hypertable and decompress every compressed one.
+"""
+
+# Offset of the Unix epoch from the uuid1 epoch, 1582-10-15, in 100 ns units
+UUID1_EPOCH_OFFSET = 0x01B21DD213814000
+
+
+def created_at_of(event_id: Union[str, uuid.UUID]) -> Optional[datetime]:
+    """Returns the local time encoded in a uuid1 id, or None for other ids."""
+    if not isinstance(event_id, uuid.UUID):
+        event_id = uuid.UUID(str(event_id))
+    if event_id.version != 1:
+        return None
+    return datetime.fromtimestamp((event_id.time - UUID1_EPOCH_OFFSET) / 1e7)
+
+
+class EventRepository(GenericRepository[Event]):
+    def __init__(self, session: Session):
+        super().__init__(session=session, model=Event)
+
+    @staticmethod
+    def _created_at_window(
+        ids: Iterable[Union[str, uuid.UUID]],
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """Returns the created_at range of events with these ids.
+
+        The range is widened by EVENTS_LOOKUP_MARGIN_HOURS to allow for clock
+        skew and time zone differences between the host that generated the id
+        and the one that set created_at. Returns None if any id is not a uuid1.
+        """
+        times = [created_at_of(event_id) for event_id in ids]
+        if not times or None in times:
+            return None
+        margin = get_settings().database.events.lookup_margin
+        return min(times) - margin, max(times) + margin
+
+    def get(self, id: str) -> Optional[Event]:
+        query = self.session.query(Event).filter(Event.id == id)
+        window = self._created_at_window([id])
+        if window is not None:
+            query = self._in_period(query, *window)
+        return query.first()
+
+    def get_many(self, ids: Iterable[str]) -> List[Event]:
+        ids = list(ids)
+        query = self.session.query(Event).filter(Event.id.in_(ids))
+        window = self._created_at_window(ids)
+        if window is not None:
+            query = self._in_period(query, *window)
+        return query.all()
+
+    @staticmethod
+    def _in_period(
+        query: Query, since: Optional[datetime], until: Optional[datetime]
+    ) -> Query:
+        if since is not None:
+            query = query.filter(Event.created_at >= since)
+        if until is not None:
+            query = query.filter(Event.created_at < until)
+        return query
+
+    @staticmethod
+    def _escalated(query: Query, escalated: Optional[bool]) -> Query:
+        if escalated is None:
+            return query
+        condition = literal_column(ESCALATED_CONDITION, Boolean)
+        return query.filter(condition if escalated else not_(condition))
+
+    def find_by_data(self, limit: Optional[int] = 100, **fields: Any) -> List[Event]:
+        """Returns the latest events whose data contains the given fields.
+
+        Uses the GIN index on data, e.g. find_by_data(sender="Jane").
+        """
+        query = (
+            self.session.query(Event)
+            .filter(Event.data.contains(fields))
+            .order_by(desc(Event.created_at))
+        )
+        return query.limit(limit).all()
+
+    def find_by_recipient(
+        self,
+        to_email: str,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = 100,
+    ) -> List[Event]:
+        """Returns the latest events sent to an address."""
+        query = self.session.query(Event).filter(
+            literal_column(TO_EMAIL_EXPRESSION) == to_email
+        )
+        query = self._in_period(query, since, until)
+        return query.order_by(desc(Event.created_at)).limit(limit).all()
+
+    def find_by_intent(
+        self,
+        intent: Union[str, Enum],
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        escalated: Optional[bool] = None,
+        limit: Optional[int] = None,
+    ) -> List[Event]:
+        """
+        Returns the processed events with the given AnalyzeTicket intent.
+
+        Args:
+            intent: The intent, e.g. "refund/request" or CustomerIntent.REFUND_REQUEST
+            since: Only events created at or after this time
+            until: Only events created before this time
+            escalated: Only escalated (True) or not escalated (False) events.
+                Defaults to both.
+            limit: Maximum number of events to return, or None for all
+
+        Returns:
+            The matching events, newest first
+        """
+        query = self.session.query(Event).filter(
+            literal_column(INTENT_EXPRESSION) == getattr(intent, "value", intent)
+        )
+        query = self._escalated(self._in_period(query, since, until), escalated)
+        return query.order_by(desc(Event.created_at)).limit(limit).all()
+
+    def count_by_intent(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        escalated: Optional[bool] = None,
+    ) -> Dict[Optional[str], int]:
+        """
+        Counts events per AnalyzeTicket intent.
+
+        Args:
+            since: Only events created at or after this time
+            until: Only events created before this time
+            escalated: Only count escalated (True) or not escalated (False) events
+
+        Returns:
+            Mapping of intent to the number of events. Events that were not
+            processed yet are counted under None.
+        """
+        intent = literal_column(INTENT_EXPRESSION).label("intent")
+        query = self.session.query(intent, func.count()).select_from(Event)
+        query = self._escalated(self._in_period(query, since, until), escalated)
+        return dict(query.group_by(intent).all())
@@ -1,13 +1,28 @@
-from typing import Generic, TypeVar, Type, List, Optional
+import json
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Generic,
+    Iterable,
+    TypeVar,
+    Type,
+    List,
+    Optional,
+)
 
-from sqlalchemy import desc
+from sqlalchemy import JSON, desc, select
 from sqlalchemy.orm import Session
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
 """
 Generic Repository Module
 
 This module provides a generic repository for database operations.
 It supports basic CRUD operations and additional methods for querying and updating data.
+AsyncGenericRepository offers the operations the API server needs on an asyncio session.
 """
 
 T = TypeVar("T")
@@ -29,6 +44,12 @@ class GenericRepository(Generic[T]):
     ) -> Optional[T]:
         return self.session.query(self.model).filter(self.model.id == id).first()
 
+    def get_many(
+        self,
+        ids: Iterable[str],
+    ) -> List[T]:
+        return self.session.query(self.model).filter(self.model.id.in_(list(ids))).all()
+
     def get_all(
         self,
     ) -> List[T]:
@@ -42,6 +63,15 @@ class GenericRepository(Generic[T]):
         self.session.commit()
         return obj
 
+    def bulk_update(
+        self,
+        mappings: List[Dict[str, Any]],
+    ) -> None:
+        if not mappings:
+            return
+        self.session.bulk_update_mappings(self.model, mappings)
+        self.session.commit()
+
     def delete(
         self,
         id: str,
@@ -71,3 +101,75 @@ class GenericRepository(Generic[T]):
         return self.session.query(
             self.model.query.filter_by(**kwargs).exists()
         ).scalar()
+
+
+class AsyncGenericRepository(Generic[T]):
+    def __init__(self, session: "AsyncSession", model: Type[T]):
+        self.session = session
+        self.model = model
+
+    async def create(self, obj: T, commit: bool = True) -> T:
+        """Adds a row, flushing it without committing if commit is False."""
+        self.session.add(obj)
+        if commit:
+            await self.session.commit()
+        else:
+            await self.session.flush()
+        return obj
+
+    async def get(
+        self,
+        id: str,
+    ) -> Optional[T]:
+        return await self.session.get(self.model, id)
+
+    async def get_many(
+        self,
+        ids: Iterable[str],
+    ) -> List[T]:
+        result = await self.session.execute(
+            select(self.model).where(self.model.id.in_(list(ids)))
+        )
+        return list(result.scalars())
+
+    async def update(
+        self,
+        obj: T,
+    ) -> T:
+        await self.session.merge(obj)
+        await self.session.commit()
+        return obj
+
+    async def copy_records(
+        self,
+        mappings: List[Dict[str, Any]],
+        commit: bool = True,
+    ) -> None:
+        """Inserts many rows with a single Postgres COPY.
+
+        COPY skips the model's Python-side defaults, so every mapping must
+        have the same keys and set all required columns, including the id.
+        The rows are left uncommitted if commit is False.
+        """
+        if not mappings:
+            return
+        columns = list(mappings[0])
+        json_columns = {
+            name
+            for name in columns
+            if isinstance(self.model.__table__.c[name].type, JSON)
+        }
+        records = [
+            tuple(
+                json.dumps(mapping[name]) if name in json_columns else mapping[name]
+                for name in columns
+            )
+            for mapping in mappings
+        ]
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            self.model.__tablename__, columns=columns, records=records
+        )
+        if commit:
+            await self.session.commit()
@@ -1,5 +1,20 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from api.endpoint import get_ingest_buffer
 from api.router import router as process_router
+from config.settings import get_settings
+from database.async_session import async_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Write the events still waiting in the buffer before shutting down
+    if get_settings().api.write_buffer_enabled:
+        await get_ingest_buffer().close()
+    await async_engine.dispose()
+
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 app.include_router(process_router)
@@ -5,7 +5,7 @@ import logging
 
 class EscalateTicket(Node):
     def process(self, task_context: TaskContext) -> TaskContext:
-        analysis = task_context.nodes["AnalyzeTicket"]
+        analysis = task_context.nodes["AnalyzeTicket"]["response_model"]
         escalation_reason = (
             f"Ticket escalated due to {analysis.intent.value} intent."
             if analysis.intent.escalate
@@ -1,22 +1,30 @@
-from core.llm import LLMNode
+import asyncio
+import logging
+from typing import Optional
+
+from core.llm import AsyncLLMNode
 from services.prompt_loader import PromptManager
 from pydantic import BaseModel, Field
 from core.task import TaskContext
-from services.llm_factory import LLMFactory
-from services.vector_store import VectorStore
+from services.llm_router import LLMRouter
+from services.response_cache import get_response_cache
+from services.vector_store import get_vector_store
 
 
-class GenerateResponse(LLMNode):
+class GenerateResponse(AsyncLLMNode):
     """
     A node to generate a response for a customer ticket.
 
-    This class inherits from LLMNode and implements the necessary methods
+    This class inherits from AsyncLLMNode and implements the necessary methods
     to process a customer ticket and generate a response using RAG.
 
     Attributes:
-        vector_store (VectorStore): An instance of VectorStore for semantic search.
+        vector_store (VectorStore): The shared VectorStore instance for semantic search.
+        response_cache (SemanticResponseCache): The shared response cache, or None if disabled.
     """
 
+    CACHE_NAMESPACE = {"pipeline": "support", "category": "customer"}
+
     class ContextModel(BaseModel):
         sender: str
         subject: str
@@ -31,7 +39,8 @@ class GenerateResponse(LLMNode):
 
     def __init__(self):
         super().__init__()
-        self.vector_store = VectorStore()
+        self.vector_store = get_vector_store()
+        self.response_cache = get_response_cache()
 
     def get_context(self, task_context: TaskContext) -> ContextModel:
         return self.ContextModel(
@@ -45,41 +54,141 @@ class GenerateResponse(LLMNode):
             query=query,
             limit=5,
             metadata_filter={"category": "customer"},
-            return_dataframe=True,
         )
-        return results["contents"].tolist()
+        return [result.contents for result in results]
+
+    def prefetch(self, task_context: TaskContext) -> None:
+        task_context.start_prefetch(
+            self.node_name, self.search_kb, task_context.event.body
+        )
+
+    def get_rag_context(self, task_context: TaskContext, query: str) -> list[str]:
+        future = task_context.pop_prefetch(self.node_name)
+        if future is not None:
+            try:
+                return future.result()
+            except Exception as e:
+                logging.warning(f"Prefetched knowledge base search failed: {str(e)}")
+        return self.search_kb(query)
+
+    async def aget_rag_context(self, task_context: TaskContext, query: str) -> list[str]:
+        future = task_context.pop_prefetch(self.node_name)
+        if future is not None:
+            try:
+                return await asyncio.wrap_future(future)
+            except Exception as e:
+                logging.warning(f"Prefetched knowledge base search failed: {str(e)}")
+        return await asyncio.to_thread(self.search_kb, query)
+
+    def get_cached_response(self, context: ContextModel) -> Optional[dict]:
+        if self.response_cache is None:
+            return None
+        namespace = self.response_cache.response_namespace(
+            self.CACHE_NAMESPACE, context.sender
+        )
+        return self.response_cache.lookup(namespace, context.body)
+
+    def cache_response(
+        self, context: ContextModel, response_model: ResponseModel, rag_context: list[str]
+    ) -> None:
+        if self.response_cache is not None:
+            namespace = self.response_cache.response_namespace(
+                self.CACHE_NAMESPACE, context.sender
+            )
+            self.response_cache.store_response(
+                namespace, context.body, response_model, rag_context
+            )
+
+    def get_messages(self, context: ContextModel, rag_context: list[str]) -> list[dict]:
+        SYSTEM_PROMPT = PromptManager.get_prompt(template="customer_ticket_response")
+        return [
+            {
+                "role": "system",
+                "content": SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": f"# New ticket:\n{context.model_dump()}",
+            },
+            {
+                "role": "assistant",
+                "content": f"# Retrieved information:\n{rag_context}",
+            },
+        ]
 
     def create_completion(
-        self, context: ContextModel
+        self, context: ContextModel, rag_context: Optional[list[str]] = None
     ) -> tuple[ResponseModel, list[str]]:
-        rag_context = self.search_kb(context.body)
-        llm = LLMFactory("openai")
-        SYSTEM_PROMPT = PromptManager.get_prompt(template="customer_ticket_response")
+        if rag_context is None:
+            rag_context = self.search_kb(context.body)
+        llm = LLMRouter()
         response_model, completion = llm.create_completion(
             response_model=self.ResponseModel,
-            messages=[
-                {
-                    "role": "system",
-                    "content": SYSTEM_PROMPT,
-                },
-                {
-                    "role": "user",
-                    "content": f"# New ticket:\n{context.model_dump()}",
-                },
-                {
-                    "role": "assistant",
-                    "content": f"# Retrieved information:\n{rag_context}",
-                },
-            ],
+            messages=self.get_messages(context, rag_context),
+        )
+        return response_model, completion, rag_context
+
+    async def acreate_completion(
+        self, context: ContextModel, rag_context: Optional[list[str]] = None
+    ) -> tuple[ResponseModel, list[str]]:
+        if rag_context is None:
+            rag_context = await asyncio.to_thread(self.search_kb, context.body)
+        llm = LLMRouter()
+        response_model, completion = await llm.acreate_completion(
+            response_model=self.ResponseModel,
+            messages=self.get_messages(context, rag_context),
         )
         return response_model, completion, rag_context
 
     def process(self, task_context: TaskContext) -> TaskContext:
         context = self.get_context(task_context)
-        response_model, completion, rag_context = self.create_completion(context)
+        cached = self.get_cached_response(context)
+        if cached and "response_model" in cached:
+            response_model = self.ResponseModel.model_validate(cached["response_model"])
+            return self._store_result(
+                task_context, response_model, None, cached["rag_context"]
+            )
+        if cached:
+            rag_context = cached["rag_context"]
+        else:
+            rag_context = self.get_rag_context(task_context, context.body)
+        response_model, completion, rag_context = self.create_completion(
+            context, rag_context
+        )
+        self.cache_response(context, response_model, rag_context)
+        return self._store_result(task_context, response_model, completion, rag_context)
+
+    async def aprocess(self, task_context: TaskContext) -> TaskContext:
+        context = self.get_context(task_context)
+        cached = await asyncio.to_thread(self.get_cached_response, context)
+        if cached and "response_model" in cached:
+            response_model = self.ResponseModel.model_validate(cached["response_model"])
+            return self._store_result(
+                task_context, response_model, None, cached["rag_context"]
+            )
+        if cached:
+            rag_context = cached["rag_context"]
+        else:
+            rag_context = await self.aget_rag_context(task_context, context.body)
+        response_model, completion, rag_context = await self.acreate_completion(
+            context, rag_context
+        )
+        await asyncio.to_thread(
+            self.cache_response, context, response_model, rag_context
+        )
+        return self._store_result(task_context, response_model, completion, rag_context)
+
+    def _store_result(
+        self,
+        task_context: TaskContext,
+        response_model: ResponseModel,
+        completion,
+        rag_context: list[str],
+    ) -> TaskContext:
         task_context.nodes[self.node_name] = {
             "response_model": response_model,
             "rag_context": rag_context,
-            "usage": completion.usage,
+            "usage": completion.usage if completion is not None else None,
+            "cache_hit": completion is None,
         }
         return task_context
@@ -32,6 +32,7 @@ class CustomerSupportPipeline(Pipeline):
             NodeConfig(
                 node=GenerateResponse,
                 connections=[SendReply],
+                prefetch=True,
                 description="Send the reply after generating a response",
             ),
         ],
@@ -1,9 +1,11 @@
 from enum import Enum
+from typing import AsyncIterator, Iterator
+
 from core.task import TaskContext
-from core.llm import LLMNode
+from core.llm import StreamingLLMNode
 from services.prompt_loader import PromptManager
 from pydantic import BaseModel, Field
-from services.llm_factory import LLMFactory
+from services.llm_router import LLMRouter
 
 
 class InternalIntent(str, Enum):
@@ -20,17 +22,20 @@ class InternalIntent(str, Enum):
         }
 
 
-class AnalyzeTicket(LLMNode):
+class AnalyzeTicket(StreamingLLMNode):
+    # Routing only needs these fields, so they are generated before the reasoning
+    ready_fields = ("intent",)
+
     class ContextModel(BaseModel):
         sender: str
         subject: str
         body: str
 
     class ResponseModel(BaseModel):
+        intent: InternalIntent
         reasoning: str = Field(
             description="Explain your reasoning for the intent classification"
         )
-        intent: InternalIntent
         confidence: float = Field(
             ge=0, le=1, description="Confidence score for the intent"
         )
@@ -42,31 +47,32 @@ class AnalyzeTicket(LLMNode):
             body=task_context.event.body,
         )
 
-    def create_completion(self, context: ContextModel) -> ResponseModel:
-        llm = LLMFactory("openai")
+    def get_messages(self, context: ContextModel) -> list[dict]:
         prompt = PromptManager.get_prompt(
             "ticket_analysis",
             pipeline="helpdesk",
         )
-        return llm.create_completion(
+        return [
+            {
+                "role": "system",
+                "content": prompt,
+            },
+            {
+                "role": "user",
+                "content": f"# New ticket:\n{context.model_dump()}",
+            },
+        ]
+
+    def stream_completion(self, context: ContextModel) -> Iterator[BaseModel]:
+        llm = LLMRouter()
+        return llm.stream_completion(
             response_model=self.ResponseModel,
-            messages=[
-                {
-                    "role": "system",
-                    "content": prompt,
-                },
-                {
-                    "role": "user",
-                    "content": f"# New ticket:\n{context.model_dump()}",
-                },
-            ],
+            messages=self.get_messages(context),
         )
 
-    def process(self, task_context: TaskContext) -> TaskContext:
-        context = self.get_context(task_context)
-        response_model, completion = self.create_completion(context)
-        task_context.nodes[self.node_name] = {
-            "response_model": response_model,
-            "usage": completion.usage,
-        }
-        return task_context
+    def astream_completion(self, context: ContextModel) -> AsyncIterator[BaseModel]:
+        llm = LLMRouter()
+        return llm.astream_completion(
+            response_model=self.ResponseModel,
+            messages=self.get_messages(context),
+        )
@@ -13,6 +13,8 @@ This is an example pipeline that is used in the tutorial.
 
 
 class InternalHelpdeskPipeline(Pipeline):
+    # Staff are waiting on these answers, so they go first when quota is scarce
+    llm_priority = "high"
     pipeline_schema = PipelineSchema(
         description="Pipeline for handling internal support tickets using the helpdesk@ email",
         start=AnalyzeTicket,
@@ -31,6 +33,7 @@ class InternalHelpdeskPipeline(Pipeline):
             NodeConfig(
                 node=GenerateResponse,
                 connections=[SendReply],
+                prefetch=True,
                 description="Send the reply after generating a response",
             ),
         ],
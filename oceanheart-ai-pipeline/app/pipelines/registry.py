@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, Type
+import threading
+from typing import Dict, Optional, Type
 from api.event_schema import EventSchema
 from core.pipeline import Pipeline
 from pipelines.customer_pipeline import CustomerSupportPipeline
@@ -12,6 +13,9 @@ Pipeline Registry Module
 This module provides a registry system for managing different pipeline types
 and their mappings. It determines which pipeline to use based on event attributes,
 currently using email addresses as the routing mechanism.
+
+Pipeline instances are validated and warmed once per process and then reused for
+every event, so the per-event cost is only the work done by the nodes themselves.
 """
 
 
@@ -20,10 +24,13 @@ class PipelineRegistry:
 
     This class maintains a mapping of pipeline types to their implementations and
     provides logic for determining which pipeline to use based on event attributes.
-    It implements a simple factory pattern for pipeline instantiation.
+    It implements a simple factory pattern for pipeline instantiation, backed by a
+    process-wide cache of pipeline instances.
 
     Attributes:
         pipelines: Dictionary mapping pipeline type strings to pipeline classes
+        _instances: Process-wide cache of validated pipeline instances by type
+        _lock: Lock guarding the instance cache
     """
 
     pipelines: Dict[str, Type[Pipeline]] = {
@@ -31,6 +38,9 @@ class PipelineRegistry:
         "helpdesk": InternalHelpdeskPipeline,
     }
 
+    _instances: Dict[str, Pipeline] = {}
+    _lock = threading.Lock()
+
     @staticmethod
     def get_pipeline_type(event: EventSchema) -> str:
         """
@@ -43,17 +53,89 @@ class PipelineRegistry:
 
     @staticmethod
     def get_pipeline(event: EventSchema) -> Pipeline:
-        """Creates and returns the appropriate pipeline instance for the event.
+        """Returns the cached pipeline instance for the event.
+
+        The pipeline is instantiated, validated and cached on first use. Later
+        calls for the same pipeline type reuse that instance.
 
         Args:
             event: Event schema containing routing information
 
         Returns:
             Instantiated pipeline object for processing the event
+
+        Raises:
+            ValueError: If no pipeline is registered for the event's type
         """
         pipeline_type = PipelineRegistry.get_pipeline_type(event)
+        return PipelineRegistry.get_pipeline_by_type(pipeline_type)
+
+    @staticmethod
+    def get_pipeline_by_type(pipeline_type: str) -> Pipeline:
+        """Returns the cached pipeline instance for a pipeline type.
+
+        Args:
+            pipeline_type: Registered pipeline type, e.g. "support"
+
+        Returns:
+            Instantiated pipeline object for the pipeline type
+
+        Raises:
+            ValueError: If no pipeline is registered for the type
+        """
+        instance = PipelineRegistry._instances.get(pipeline_type)
+        if instance is not None:
+            return instance
+
         pipeline = PipelineRegistry.pipelines.get(pipeline_type)
-        if pipeline:
-            logging.info(f"Using pipeline: {pipeline.__name__}")
-            return pipeline()
-        raise ValueError(f"Unknown pipeline type: {pipeline_type}")
+        if not pipeline:
+            raise ValueError(f"Unknown pipeline type: {pipeline_type}")
+
+        with PipelineRegistry._lock:
+            instance = PipelineRegistry._instances.get(pipeline_type)
+            if instance is None:
+                logging.info(f"Initializing pipeline: {pipeline.__name__}")
+                instance = pipeline()
+                PipelineRegistry._instances[pipeline_type] = instance
+
+        logging.info(f"Using pipeline: {pipeline.__name__}")
+        return instance
+
+    @staticmethod
+    def warm_up() -> None:
+        """Instantiates and caches every registered pipeline.
+
+        Intended to be called once when a worker process starts, so the first
+        event does not pay for node and client construction.
+        """
+        for pipeline_type in PipelineRegistry.pipelines:
+            PipelineRegistry.get_pipeline_by_type(pipeline_type)
+
+    @staticmethod
+    def invalidate(pipeline_type: Optional[str] = None) -> None:
+        """Drops cached pipeline instances.
+
+        The next event for an invalidated type builds a fresh instance.
+
+        Args:
+            pipeline_type: Pipeline type to drop. Drops all types if None.
+        """
+        with PipelineRegistry._lock:
+            if pipeline_type is None:
+                PipelineRegistry._instances.clear()
+            else:
+                PipelineRegistry._instances.pop(pipeline_type, None)
+        logging.info(f"Invalidated pipeline cache: {pipeline_type or 'all'}")
+
+    @staticmethod
+    def reload(pipeline_type: Optional[str] = None) -> None:
+        """Rebuilds cached pipeline instances.
+
+        Args:
+            pipeline_type: Pipeline type to rebuild. Rebuilds all types if None.
+        """
+        PipelineRegistry.invalidate(pipeline_type)
+        if pipeline_type is None:
+            PipelineRegistry.warm_up()
+        else:
+            PipelineRegistry.get_pipeline_by_type(pipeline_type)
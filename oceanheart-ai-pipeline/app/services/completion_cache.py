@@ -0,0 +1,377 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Type
+
+from config.settings import get_settings
+from pydantic import BaseModel
+
+"""
+Completion Cache Module
+
+This module provides an exact-match cache for structured LLM completions. With
+temperature 0 a completion is a function of the model, the messages, the
+response model schema and the sampling parameters, so replayed events, retried
+tasks and evaluation runs can reuse an earlier result instead of paying for the
+same completion again.
+
+Entries are keyed by a SHA-256 hash of those inputs and store the validated
+response model as JSON together with the usage of the original completion.
+Backends keep entries in process memory, in a SQLite file shared by the workers
+on one host, or in Redis shared by all workers.
+"""
+
+# Bump to invalidate all entries when the key or value format changes
+CACHE_VERSION = 1
+
+# Completion parameters that do not change the completion
+IGNORED_PARAMS = ("max_retries",)
+
+
+class CachedCompletion(BaseModel):
+    """Stands in for the raw completion when a result comes from the cache.
+
+    Attributes:
+        model: The model that produced the original completion
+        usage: Token usage of the original completion
+        cached: Always True, so callers can tell cached results apart
+    """
+
+    model: Optional[str] = None
+    usage: Optional[Dict[str, Any]] = None
+    cached: bool = True
+
+
+@lru_cache(maxsize=256)
+def _response_model_schema(response_model: Type[BaseModel]) -> Dict[str, Any]:
+    return {
+        "name": response_model.__qualname__,
+        "schema": response_model.model_json_schema(),
+    }
+
+
+def completion_key(provider: str, params: Dict[str, Any]) -> str:
+    """Builds the cache key for a completion request.
+
+    Args:
+        provider: Name of the LLM provider
+        params: The provider's completion parameters, including the
+            response model and the messages
+
+    Returns:
+        The cache key
+    """
+    key_params = {
+        name: value for name, value in params.items() if name not in IGNORED_PARAMS
+    }
+    key_params["response_model"] = _response_model_schema(params["response_model"])
+    payload = json.dumps(
+        {"version": CACHE_VERSION, "provider": provider, "params": key_params},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def dump_completion(response_model: BaseModel, completion: Any) -> str:
+    """Serializes a validated response and the usage of its completion."""
+    usage = getattr(completion, "usage", None)
+    if hasattr(usage, "model_dump"):
+        usage = usage.model_dump()
+    return json.dumps(
+        {
+            "response": response_model.model_dump(mode="json"),
+            "model": getattr(completion, "model", None),
+            "usage": usage,
+        }
+    )
+
+
+def load_completion(
+    response_model: Type[BaseModel], value: str
+) -> Tuple[BaseModel, CachedCompletion]:
+    """Restores a response and a CachedCompletion from a cached value."""
+    data = json.loads(value)
+    return (
+        response_model.model_validate(data["response"]),
+        CachedCompletion(model=data["model"], usage=data["usage"]),
+    )
+
+
+class CompletionCache(ABC):
+    """Abstract base class for completion caches.
+
+    Values are the JSON strings built by dump_completion(). Implementations
+    count hits and misses, which stats() reports.
+    """
+
+    name = "cache"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[str]:
+        """Returns the cached value for the key, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, value: str) -> None:
+        """Stores a value under the key."""
+        pass
+
+    def get(self, key: str) -> Optional[str]:
+        """Returns the cached value for the key, or None on a miss."""
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the hit and miss counters of this cache."""
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class MemoryCompletionCache(CompletionCache):
+    """In-process LRU cache with a maximum size and an optional TTL.
+
+    Args:
+        max_size: Maximum number of completions to keep
+        ttl: Seconds a completion stays valid. Never expires if None.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = None):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["size"] = len(self._entries)
+        return stats
+
+
+class SQLiteCompletionCache(CompletionCache):
+    """Disk cache in a SQLite file, shared by the processes on one host.
+
+    The file survives worker restarts, which suits replays and evaluation
+    runs. Reads refresh an entry's access time, and writes evict the least
+    recently used entries beyond max_size as well as expired entries. SQLite
+    errors are logged and treated as misses.
+
+    Args:
+        path: Path of the SQLite database file
+        max_size: Maximum number of completions to keep
+        ttl: Seconds a completion stays valid. Never expires if None.
+    """
+
+    name = "sqlite"
+
+    def __init__(
+        self, path: str, max_size: int = 10000, ttl: Optional[float] = None
+    ):
+        super().__init__()
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS completions (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS idx_completions_accessed_at "
+                "ON completions (accessed_at)"
+            )
+
+    def _get(self, key: str) -> Optional[str]:
+        now = time.time()
+        try:
+            with self._lock, self._connection:
+                row = self._connection.execute(
+                    "SELECT value, expires_at FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                value, expires_at = row
+                if expires_at and expires_at < now:
+                    self._connection.execute(
+                        "DELETE FROM completions WHERE key = ?", (key,)
+                    )
+                    return None
+                self._connection.execute(
+                    "UPDATE completions SET accessed_at = ? WHERE key = ?", (now, key)
+                )
+                return value
+        except sqlite3.Error as e:
+            logging.warning(f"Error reading completion cache: {str(e)}")
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else 0.0
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO completions VALUES (?, ?, ?, ?)",
+                    (key, value, expires_at, now),
+                )
+                self._connection.execute(
+                    "DELETE FROM completions WHERE expires_at > 0 AND expires_at < ?",
+                    (now,),
+                )
+                self._connection.execute(
+                    """
+                    DELETE FROM completions WHERE key IN (
+                        SELECT key FROM completions
+                        ORDER BY accessed_at DESC
+                        LIMIT -1 OFFSET ?
+                    )
+                    """,
+                    (self.max_size,),
+                )
+        except sqlite3.Error as e:
+            logging.warning(f"Error writing completion cache: {str(e)}")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        with self._lock:
+            stats["size"] = self._connection.execute(
+                "SELECT COUNT(*) FROM completions"
+            ).fetchone()[0]
+        return stats
+
+
+class RedisCompletionCache(CompletionCache):
+    """Cache shared by all workers, stored in Redis.
+
+    Entries expire after the TTL. Bound the size with the Redis server's
+    maxmemory setting and an LRU eviction policy. Redis errors are logged and
+    treated as misses.
+
+    Args:
+        redis_client: The Redis client to use
+        ttl: Seconds a completion stays valid. Never expires if None.
+        prefix: Prefix for the Redis keys
+    """
+
+    name = "redis"
+
+    def __init__(
+        self, redis_client: Any, ttl: Optional[float] = None, prefix: str = "completion"
+    ):
+        super().__init__()
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _get(self, key: str) -> Optional[str]:
+        try:
+            value = self.redis_client.get(f"{self.prefix}:{key}")
+        except Exception as e:
+            logging.warning(f"Error reading completion cache: {str(e)}")
+            return None
+        if value is None:
+            return None
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str) -> None:
+        try:
+            self.redis_client.set(
+                f"{self.prefix}:{key}", value, ex=int(self.ttl) if self.ttl else None
+            )
+        except Exception as e:
+            logging.warning(f"Error writing completion cache: {str(e)}")
+
+
+def create_completion_cache(settings) -> Optional[CompletionCache]:
+    """Creates the completion cache configured in the LLM settings.
+
+    Args:
+        settings: The LLMConfig
+
+    Returns:
+        The configured cache, or None if caching is disabled
+    """
+    backend = settings.completion_cache_backend
+    if backend == "none":
+        return None
+
+    ttl = settings.completion_cache_ttl or None
+    if backend == "memory":
+        return MemoryCompletionCache(max_size=settings.completion_cache_size, ttl=ttl)
+    if backend == "sqlite":
+        return SQLiteCompletionCache(
+            settings.completion_cache_path,
+            max_size=settings.completion_cache_size,
+            ttl=ttl,
+        )
+    if backend == "redis":
+        from config.celery_config import get_redis_client
+
+        return RedisCompletionCache(get_redis_client(), ttl=ttl)
+    raise ValueError(f"Unsupported completion cache backend: {backend}")
+
+
+@lru_cache
+def get_completion_cache() -> Optional[CompletionCache]:
+    """
+    Get the process-wide completion cache.
+
+    Returns:
+        CompletionCache: The shared cache, or None if completion caching is disabled.
+    """
+    return create_completion_cache(get_settings().llm)
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import psycopg2
+import psycopg2.extensions
+import psycopg2.extras
+import psycopg2.pool
+import pgvector.psycopg2
+from timescale_vector import client
+
+"""
+Connection Pool Module
+
+This module provides the thread-safe PostgreSQL connection pool used by the
+VectorStore. One pool serves both the VectorStore's own SQL (keyword search,
+index DDL) and the Timescale Vector client, so searches reuse open connections
+instead of connecting to the database for every query.
+"""
+
+
+class PooledConnection(psycopg2.extensions.connection):
+    """psycopg2 connection that remembers its per-connection setup.
+
+    Attributes:
+        vector_registered: Whether the pgvector type has been registered
+        prepared: Names of the statements prepared on this connection
+        last_used: Monotonic time the connection was last returned to the pool
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.vector_registered = False
+        self.prepared = set()
+        self.last_used = time.monotonic()
+
+
+class ConnectionPool(psycopg2.pool.ThreadedConnectionPool):
+    """Thread-safe connection pool with health checks and prepared statements.
+
+    Connections are opened on demand, up to max_size, and up to min_size idle
+    connections are kept open for reuse. When all connections are in use,
+    connection() waits up to timeout seconds for one to be returned.
+
+    Connections are checked when they are taken from the pool. Closed
+    connections are replaced, and connections that have been idle for longer
+    than health_check_interval seconds are pinged first. Connections left
+    inside a transaction are rolled back.
+
+    Args:
+        dsn: The database connection string
+        min_size: Number of idle connections to keep open
+        max_size: Maximum number of open connections
+        timeout: Seconds to wait for a free connection
+        health_check_interval: Seconds a connection can be idle before it is
+            pinged on checkout
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        min_size: int = 1,
+        max_size: int = 10,
+        timeout: float = 10.0,
+        health_check_interval: float = 30.0,
+    ):
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        self._slots = threading.BoundedSemaphore(max_size)
+        # Open no connections up front; minconn only limits idle connections
+        super().__init__(
+            0,
+            max_size,
+            dsn=dsn,
+            connection_factory=PooledConnection,
+            cursor_factory=psycopg2.extras.DictCursor,
+        )
+        self.minconn = min_size
+
+    def getconn(self, key=None) -> PooledConnection:
+        connection = super().getconn(key)
+        if self._is_healthy(connection):
+            return connection
+        logging.warning("Replacing broken database connection")
+        super().putconn(connection, key, close=True)
+        return super().getconn(key)
+
+    def putconn(self, conn=None, key=None, close=False) -> None:
+        if conn is not None and not conn.closed:
+            conn.last_used = time.monotonic()
+        super().putconn(conn, key, close)
+
+    def _is_healthy(self, connection: PooledConnection) -> bool:
+        if connection.closed:
+            return False
+        status = connection.info.transaction_status
+        if status == psycopg2.extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        try:
+            if status != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+            if time.monotonic() - connection.last_used > self.health_check_interval:
+                with connection.cursor() as cur:
+                    cur.execute("SELECT 1")
+                connection.rollback()
+        except psycopg2.Error:
+            return False
+        return True
+
+    @contextmanager
+    def connection(self) -> Iterator[PooledConnection]:
+        """Takes a connection from the pool and commits when the block exits.
+
+        The connection is rolled back if the block raises, and discarded if
+        the error was a connection failure.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise psycopg2.pool.PoolError(
+                f"No database connection available after {self.timeout} seconds"
+            )
+        try:
+            connection = self.getconn()
+        except Exception:
+            self._slots.release()
+            raise
+        close = False
+        try:
+            yield connection
+            connection.commit()
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            close = True
+            raise
+        except Exception:
+            connection.rollback()
+            raise
+        finally:
+            self.putconn(connection, close=close or bool(connection.closed))
+            self._slots.release()
+
+    @staticmethod
+    def prepare(
+        connection: PooledConnection, statements: Dict[str, str], name: str
+    ) -> None:
+        """Prepares a named statement on the connection if it isn't prepared yet.
+
+        Args:
+            connection: A connection from this pool
+            statements: SQL PREPARE commands by statement name
+            name: Name of the statement to prepare
+        """
+        if name not in connection.prepared:
+            with connection.cursor() as cur:
+                cur.execute(statements[name])
+            connection.prepared.add(name)
+
+    @staticmethod
+    def register_vector(connection: PooledConnection) -> None:
+        """Registers the pgvector type on the connection once."""
+        if not connection.vector_registered:
+            pgvector.psycopg2.register_vector(connection)
+            connection.vector_registered = True
+
+
+class PooledSync(client.Sync):
+    """Timescale Vector client that uses a shared ConnectionPool.
+
+    The stock client creates its own pool, which is not thread-safe, and
+    registers the pgvector type on every checkout. This client borrows the
+    VectorStore's pool and registers the type once per connection.
+    """
+
+    def __init__(self, pool: ConnectionPool, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool = pool
+
+    @contextmanager
+    def connect(self):
+        with self.pool.connection() as connection:
+            ConnectionPool.register_vector(connection)
+            yield connection
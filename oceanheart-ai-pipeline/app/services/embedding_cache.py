@@ -0,0 +1,250 @@
+import hashlib
+import logging
+import re
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+"""
+Embedding Cache Module
+
+This module provides caches for query embeddings, so repeated and near-duplicate
+texts (auto-replies, forwarded threads, retried events) are embedded only once.
+Entries are keyed by embedding model and a hash of the normalized text.
+
+Caches can be stacked: a TieredEmbeddingCache checks an in-process LRU cache
+first and a shared Redis cache second, so a text embedded by one worker is a
+cache hit for every other worker.
+"""
+
+
+def normalize_text(text: str) -> str:
+    """Normalizes text before it is embedded and used as a cache key.
+
+    Applies Unicode NFKC normalization, collapses all whitespace, including
+    newlines, to single spaces and strips leading and trailing whitespace.
+
+    Args:
+        text: The text to normalize
+
+    Returns:
+        The normalized text
+    """
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def embedding_key(model: str, text: str) -> str:
+    """Builds the cache key for a model and an already normalized text.
+
+    Args:
+        model: Name of the embedding model
+        text: The normalized text
+
+    Returns:
+        The cache key
+    """
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    return f"{model}:{digest}"
+
+
+class EmbeddingCache(ABC):
+    """Abstract base class for embedding caches.
+
+    Implementations count hits and misses, which stats() reports.
+    """
+
+    name = "cache"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abstractmethod
+    def _get(self, key: str) -> Optional[List[float]]:
+        """Returns the cached embedding for the key, or None."""
+        pass
+
+    @abstractmethod
+    def set(self, key: str, embedding: List[float]) -> None:
+        """Stores an embedding under the key."""
+        pass
+
+    def get(self, key: str) -> Optional[List[float]]:
+        """Returns the cached embedding for the key, or None on a miss."""
+        embedding = self._get(key)
+        if embedding is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return embedding
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the hit and miss counters of this cache."""
+        lookups = self.hits + self.misses
+        return {
+            self.name: {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+        }
+
+
+class MemoryEmbeddingCache(EmbeddingCache):
+    """In-process LRU cache with a maximum size and an optional TTL.
+
+    Embeddings are stored as float32 arrays, about 6 KB per 1536-dimensional
+    embedding instead of about 50 KB as a list of Python floats.
+
+    Args:
+        max_size: Maximum number of embeddings to keep
+        ttl: Seconds an embedding stays valid. Never expires if None.
+    """
+
+    name = "memory"
+
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        super().__init__()
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, array]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, embedding = entry
+            if expires_at and expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return embedding.tolist()
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0.0
+        embedding = array("f", embedding)
+        with self._lock:
+            self._entries[key] = (expires_at, embedding)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = super().stats()
+        stats[self.name]["size"] = len(self._entries)
+        return stats
+
+
+class RedisEmbeddingCache(EmbeddingCache):
+    """Cache shared by all processes, stored in Redis as float32 arrays.
+
+    Entries expire after the TTL. The size is bounded by the Redis server's
+    maxmemory setting; use a volatile-lru or allkeys-lru eviction policy.
+    Redis errors are logged and treated as misses, so an unavailable Redis
+    only costs the embedding request.
+
+    Args:
+        redis_client: The Redis client to use
+        ttl: Seconds an embedding stays valid. Never expires if None.
+        prefix: Prefix for the Redis keys
+    """
+
+    name = "redis"
+
+    def __init__(
+        self, redis_client: Any, ttl: Optional[float] = None, prefix: str = "embedding"
+    ):
+        super().__init__()
+        self.redis_client = redis_client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _get(self, key: str) -> Optional[List[float]]:
+        try:
+            value = self.redis_client.get(f"{self.prefix}:{key}")
+        except Exception as e:
+            logging.warning(f"Error reading embedding cache: {str(e)}")
+            return None
+        if value is None:
+            return None
+        return array("f", value).tolist()
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        try:
+            self.redis_client.set(
+                f"{self.prefix}:{key}",
+                array("f", embedding).tobytes(),
+                ex=int(self.ttl) if self.ttl else None,
+            )
+        except Exception as e:
+            logging.warning(f"Error writing embedding cache: {str(e)}")
+
+
+class TieredEmbeddingCache(EmbeddingCache):
+    """Checks several caches in order, fastest first.
+
+    A hit in a lower tier is copied into the tiers above it. New embeddings
+    are stored in every tier.
+
+    Args:
+        tiers: The caches to check, in order
+    """
+
+    name = "tiered"
+
+    def __init__(self, tiers: List[EmbeddingCache]):
+        super().__init__()
+        self.tiers = tiers
+
+    def _get(self, key: str) -> Optional[List[float]]:
+        for index, tier in enumerate(self.tiers):
+            embedding = tier.get(key)
+            if embedding is not None:
+                for upper_tier in self.tiers[:index]:
+                    upper_tier.set(key, embedding)
+                return embedding
+        return None
+
+    def set(self, key: str, embedding: List[float]) -> None:
+        for tier in self.tiers:
+            tier.set(key, embedding)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        stats = super().stats()
+        for tier in self.tiers:
+            stats.update(tier.stats())
+        return stats
+
+
+def create_embedding_cache(settings) -> Optional[EmbeddingCache]:
+    """Creates the embedding cache configured in the vector store settings.
+
+    Args:
+        settings: The VectorStoreConfig
+
+    Returns:
+        The configured cache, or None if caching is disabled
+    """
+    backend = settings.embedding_cache_backend
+    if backend == "none":
+        return None
+
+    ttl = settings.embedding_cache_ttl or None
+    memory_cache = MemoryEmbeddingCache(
+        max_size=settings.embedding_cache_size, ttl=ttl
+    )
+    if backend == "memory":
+        return memory_cache
+    if backend == "redis":
+        from config.celery_config import get_redis_client
+
+        return TieredEmbeddingCache(
+            [memory_cache, RedisEmbeddingCache(get_redis_client(), ttl=ttl)]
+        )
+    raise ValueError(f"Unsupported embedding cache backend: {backend}")
@@ -1,29 +1,133 @@
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Type, Tuple
-
+from contextlib import nullcontext
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Type,
+    Tuple,
+)
+
+import httpx
 import instructor
-from anthropic import Anthropic
+from anthropic import Anthropic, AsyncAnthropic
 from config.settings import get_settings
-from openai import OpenAI
-from pydantic import BaseModel
+from openai import AsyncOpenAI, OpenAI
+from pydantic import BaseModel, ValidationError
+from services.completion_cache import (
+    completion_key,
+    dump_completion,
+    get_completion_cache,
+    load_completion,
+)
+from services.rate_limiter import Reservation, estimate_tokens, get_rate_limiter
 
 """
 LLM Provider Factory Module
 
 This module implements a factory pattern for creating and managing different LLM providers
 (OpenAI, Anthropic, etc.). It provides a unified interface for LLM interactions while
-supporting structured output using Pydantic models.
+supporting structured output using Pydantic models. Every provider exposes both a
+blocking create_completion() and an awaitable acreate_completion(), and can stream
+partial responses with stream_completion() and astream_completion().
+
+Providers are pooled per worker process, so every node and task that asks for the
+same provider shares one set of keep-alive HTTP connections instead of opening new
+ones for each completion.
+
+Temperature 0 completions can be served from an opt-in completion cache, see
+services/completion_cache.py. Requests to providers with configured RPM, TPM or
+concurrency limits wait for quota first, see services/rate_limiter.py.
 """
 
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Output tokens assumed for rate limiting when max_tokens is not set
+DEFAULT_OUTPUT_TOKENS = 512
+
+
+def get_stream_usage(partial: Optional[BaseModel]) -> Any:
+    """Returns the token usage of a stream's final completion.
+
+    Instructor attaches the raw completion to a partial response as
+    _raw_response. Only the last partial of a stream carries the usage, and
+    only if the provider reported it.
+
+    Args:
+        partial: The last partial response of a stream
+
+    Returns:
+        The completion's usage, or None if unknown
+    """
+    completion = getattr(partial, "_raw_response", None)
+    return getattr(completion, "usage", None)
+
 
 class LLMProvider(ABC):
-    """Abstract base class for LLM providers."""
+    """Abstract base class for LLM providers.
+
+    A provider owns one blocking HTTP client, created up front, and one async
+    HTTP client per event loop, created on first use in that loop. Async
+    connections cannot be shared between event loops, and workers start a new
+    loop for every asyncio.run() call.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.http_client = httpx.Client(**self._get_http_client_params())
+        self.client = self._initialize_client()
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _get_http_client_params(self) -> Dict[str, Any]:
+        return {
+            "http2": self.settings.http2 and HTTP2_AVAILABLE,
+            "limits": httpx.Limits(
+                max_connections=self.settings.max_connections,
+                max_keepalive_connections=self.settings.max_keepalive_connections,
+                keepalive_expiry=self.settings.keepalive_expiry,
+            ),
+        }
 
     @abstractmethod
     def _initialize_client(self) -> Any:
         """Initialize the client for the LLM provider."""
         pass
 
+    @abstractmethod
+    def _initialize_async_client(self, http_client: httpx.AsyncClient) -> Any:
+        """Initialize the async client for the LLM provider."""
+        pass
+
+    @abstractmethod
+    def _get_completion_params(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Dict[str, Any]:
+        """Build the provider's completion parameters, with defaults applied."""
+        pass
+
+    @property
+    def async_client(self) -> Any:
+        """The async client bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._async_clients.get(loop)
+            if entry is None:
+                http_client = httpx.AsyncClient(**self._get_http_client_params())
+                entry = (http_client, self._initialize_async_client(http_client))
+                self._async_clients[loop] = entry
+        return entry[1]
+
     @abstractmethod
     def create_completion(
         self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
@@ -31,21 +135,70 @@ class LLMProvider(ABC):
         """Create a completion using the LLM provider."""
         pass
 
+    async def acreate_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Any:
+        """Create a completion without blocking the event loop.
+
+        Providers without an async client fall back to running the blocking
+        create_completion() in the default thread pool.
+        """
+        return await asyncio.to_thread(
+            self.create_completion, response_model, messages, **kwargs
+        )
+
+    def stream_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Iterator[BaseModel]:
+        """Stream partial responses using the LLM provider."""
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
+        return self.client.create_partial(**completion_params)
+
+    def astream_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> AsyncIterator[BaseModel]:
+        """Stream partial responses using the async client."""
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
+        return self.async_client.create_partial(**completion_params)
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client bound to the running event loop."""
+        with self._lock:
+            entry = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry[0].aclose()
+
+    def close(self) -> None:
+        """Close the blocking HTTP client and forget all async clients.
+
+        Async clients of loops that are still running are left to those loops.
+        """
+        self.http_client.close()
+        with self._lock:
+            self._async_clients.clear()
+
 
 class OpenAIProvider(LLMProvider):
     """OpenAI provider implementation."""
 
-    def __init__(self, settings):
-        self.settings = settings
-        self.client = self._initialize_client()
-
     def _initialize_client(self) -> Any:
-        return instructor.from_openai(OpenAI(api_key=self.settings.api_key))
+        return instructor.from_openai(
+            OpenAI(api_key=self.settings.api_key, http_client=self.http_client)
+        )
 
-    def create_completion(
+    def _initialize_async_client(self, http_client: httpx.AsyncClient) -> Any:
+        return instructor.from_openai(
+            AsyncOpenAI(api_key=self.settings.api_key, http_client=http_client)
+        )
+
+    def _get_completion_params(
         self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
-    ) -> Tuple[BaseModel, Any]:
-        completion_params = {
+    ) -> Dict[str, Any]:
+        return {
             "model": kwargs.get("model", self.settings.default_model),
             "temperature": kwargs.get("temperature", self.settings.temperature),
             "max_retries": kwargs.get("max_retries", self.settings.max_retries),
@@ -53,22 +206,42 @@ class OpenAIProvider(LLMProvider):
             "response_model": response_model,
             "messages": messages,
         }
+
+    def create_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Tuple[BaseModel, Any]:
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
         return self.client.chat.completions.create_with_completion(**completion_params)
 
+    async def acreate_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Tuple[BaseModel, Any]:
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
+        return await self.async_client.chat.completions.create_with_completion(
+            **completion_params
+        )
+
 
 class AnthropicProvider(LLMProvider):
     """Anthropic provider implementation."""
 
-    def __init__(self, settings):
-        self.settings = settings
-        self.client = self._initialize_client()
-
     def _initialize_client(self) -> Any:
-        return instructor.from_anthropic(Anthropic(api_key=self.settings.api_key))
+        return instructor.from_anthropic(
+            Anthropic(api_key=self.settings.api_key, http_client=self.http_client)
+        )
 
-    def create_completion(
+    def _initialize_async_client(self, http_client: httpx.AsyncClient) -> Any:
+        return instructor.from_anthropic(
+            AsyncAnthropic(api_key=self.settings.api_key, http_client=http_client)
+        )
+
+    def _get_completion_params(
         self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
-    ) -> Any:
+    ) -> Dict[str, Any]:
         system_message = next(
             (m["content"] for m in messages if m["role"] == "system"), None
         )
@@ -84,27 +257,54 @@ class AnthropicProvider(LLMProvider):
         }
         if system_message:
             completion_params["system"] = system_message
+        return completion_params
 
+    def create_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Any:
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
         return self.client.messages.create_with_completion(**completion_params)
 
+    async def acreate_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Any:
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
+        return await self.async_client.messages.create_with_completion(
+            **completion_params
+        )
+
 
 class LlamaProvider(LLMProvider):
     """Llama provider implementation."""
 
-    def __init__(self, settings):
-        self.settings = settings
-        self.client = self._initialize_client()
-
     def _initialize_client(self) -> Any:
         return instructor.from_openai(
-            OpenAI(base_url=self.settings.base_url, api_key=self.settings.api_key),
+            OpenAI(
+                base_url=self.settings.base_url,
+                api_key=self.settings.api_key,
+                http_client=self.http_client,
+            ),
             mode=instructor.Mode.JSON,
         )
 
-    def create_completion(
+    def _initialize_async_client(self, http_client: httpx.AsyncClient) -> Any:
+        return instructor.from_openai(
+            AsyncOpenAI(
+                base_url=self.settings.base_url,
+                api_key=self.settings.api_key,
+                http_client=http_client,
+            ),
+            mode=instructor.Mode.JSON,
+        )
+
+    def _get_completion_params(
         self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
-    ) -> Any:
-        completion_params = {
+    ) -> Dict[str, Any]:
+        return {
             "model": kwargs.get("model", self.settings.default_model),
             "temperature": kwargs.get("temperature", self.settings.temperature),
             "max_retries": kwargs.get("max_retries", self.settings.max_retries),
@@ -112,8 +312,25 @@ class LlamaProvider(LLMProvider):
             "response_model": response_model,
             "messages": messages,
         }
+
+    def create_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Any:
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
         return self.client.chat.completions.create_with_completion(**completion_params)
 
+    async def acreate_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Any:
+        completion_params = self._get_completion_params(
+            response_model, messages, **kwargs
+        )
+        return await self.async_client.chat.completions.create_with_completion(
+            **completion_params
+        )
+
 
 class LLMFactory:
     """
@@ -123,17 +340,45 @@ class LLMFactory:
     instances based on the specified provider type. It supports multiple providers
     and handles their initialization and configuration.
 
+    Provider instances are pooled per process and keyed by provider name and
+    settings, so constructing an LLMFactory is cheap and all factories for the
+    same provider share its HTTP connections.
+
+    Deterministic (temperature 0) completions are cached when a completion
+    cache backend is configured. Pass use_cache=False to bypass the cache for
+    a single call.
+
+    Requests that miss the cache are rate limited with the provider's
+    rpm_limit, tpm_limit and max_concurrency settings, in the priority lane
+    set with services.rate_limiter.llm_priority().
+
     Attributes:
         provider: The name of the LLM provider to use
         settings: Configuration settings for the LLM provider
-        llm_provider: The initialized LLM provider instance
+        llm_provider: The pooled LLM provider instance
+        completion_cache: The shared completion cache, or None if disabled
     """
 
+    _providers: ClassVar[Dict[Tuple[str, str], LLMProvider]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
     def __init__(self, provider: str):
         self.provider = provider
         settings = get_settings()
         self.settings = getattr(settings.llm, provider)
-        self.llm_provider = self._create_provider()
+        self.llm_provider = self._get_provider()
+        self.completion_cache = get_completion_cache()
+
+    def _get_provider(self) -> LLMProvider:
+        key = (self.provider, self.settings.model_dump_json())
+        llm_provider = LLMFactory._providers.get(key)
+        if llm_provider is None:
+            with LLMFactory._lock:
+                llm_provider = LLMFactory._providers.get(key)
+                if llm_provider is None:
+                    llm_provider = self._create_provider()
+                    LLMFactory._providers[key] = llm_provider
+        return llm_provider
 
     def _create_provider(self) -> LLMProvider:
         providers = {
@@ -146,8 +391,77 @@ class LLMFactory:
             return provider_class(self.settings)
         raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
+    def _get_cache_key(
+        self,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        use_cache: bool,
+        **kwargs,
+    ) -> Optional[str]:
+        if not use_cache or self.completion_cache is None:
+            return None
+        params = self.llm_provider._get_completion_params(
+            response_model, messages, **kwargs
+        )
+        # Only deterministic completions can be replayed
+        if params.get("temperature") != 0:
+            return None
+        return completion_key(self.provider, params)
+
+    def _get_cached_completion(
+        self, response_model: Type[BaseModel], cache_key: Optional[str]
+    ) -> Optional[Tuple[BaseModel, Any]]:
+        if cache_key is None:
+            return None
+        value = self.completion_cache.get(cache_key)
+        if value is None:
+            return None
+        try:
+            return load_completion(response_model, value)
+        except Exception as e:
+            logging.warning(f"Discarding unreadable cached completion: {str(e)}")
+            return None
+
+    def _get_rate_limit_params(
+        self, messages: List[Dict[str, str]], **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        if not (
+            self.settings.rpm_limit
+            or self.settings.tpm_limit
+            or self.settings.max_concurrency
+        ):
+            return None
+        max_tokens = kwargs.get("max_tokens", self.settings.max_tokens)
+        return {
+            "provider": self.provider,
+            "model": kwargs.get("model", self.settings.default_model),
+            "tokens": estimate_tokens(messages, max_tokens or DEFAULT_OUTPUT_TOKENS),
+            "rpm": self.settings.rpm_limit,
+            "tpm": self.settings.tpm_limit,
+            "max_concurrency": self.settings.max_concurrency,
+        }
+
+    def _rate_limit(self, messages: List[Dict[str, str]], **kwargs) -> Any:
+        """Returns a context manager that holds the request's quota and
+        yields its Reservation."""
+        params = self._get_rate_limit_params(messages, **kwargs)
+        if params is None:
+            return nullcontext(Reservation(self.provider, 0, 0))
+        return get_rate_limiter().limit(**params)
+
+    def _arate_limit(self, messages: List[Dict[str, str]], **kwargs) -> Any:
+        """Async version of _rate_limit()."""
+        params = self._get_rate_limit_params(messages, **kwargs)
+        if params is None:
+            return nullcontext(Reservation(self.provider, 0, 0))
+        return get_rate_limiter().alimit(**params)
+
     def create_completion(
-        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+        self,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        use_cache: bool = True,
+        **kwargs,
     ) -> Tuple[BaseModel, Any]:
         """
         Create a completion using the configured LLM provider.
@@ -155,16 +469,229 @@ class LLMFactory:
         Args:
             response_model: Pydantic model class defining the expected response structure
             messages: List of message dictionaries containing the conversation
+            use_cache: Whether a deterministic completion may be served from
+                and stored in the completion cache
             **kwargs: Additional arguments to pass to the provider
 
         Returns:
-            Tuple containing the parsed response model and raw completion
+            Tuple containing the parsed response model and raw completion. The
+            raw completion is a CachedCompletion when the result came from the cache.
 
         Raises:
             TypeError: If response_model is not a Pydantic BaseModel
             ValueError: If the provider is not supported
+            RateLimitTimeout: If the provider's quota did not free up in time
         """
         if not issubclass(response_model, BaseModel):
             raise TypeError("response_model must be a subclass of pydantic.BaseModel")
 
-        return self.llm_provider.create_completion(response_model, messages, **kwargs)
+        cache_key = self._get_cache_key(response_model, messages, use_cache, **kwargs)
+        cached = self._get_cached_completion(response_model, cache_key)
+        if cached is not None:
+            return cached
+
+        with self._rate_limit(messages, **kwargs) as reservation:
+            response, completion = self.llm_provider.create_completion(
+                response_model, messages, **kwargs
+            )
+            reservation.record_usage(getattr(completion, "usage", None))
+        if cache_key is not None:
+            self.completion_cache.set(cache_key, dump_completion(response, completion))
+        return response, completion
+
+    async def acreate_completion(
+        self,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        use_cache: bool = True,
+        **kwargs,
+    ) -> Tuple[BaseModel, Any]:
+        """
+        Create a completion using the configured LLM provider's async client.
+
+        Cache lookups and writes run in the default thread pool, since the
+        SQLite and Redis backends block.
+
+        Args:
+            response_model: Pydantic model class defining the expected response structure
+            messages: List of message dictionaries containing the conversation
+            use_cache: Whether a deterministic completion may be served from
+                and stored in the completion cache
+            **kwargs: Additional arguments to pass to the provider
+
+        Returns:
+            Tuple containing the parsed response model and raw completion. The
+            raw completion is a CachedCompletion when the result came from the cache.
+
+        Raises:
+            TypeError: If response_model is not a Pydantic BaseModel
+            ValueError: If the provider is not supported
+            RateLimitTimeout: If the provider's quota did not free up in time
+        """
+        if not issubclass(response_model, BaseModel):
+            raise TypeError("response_model must be a subclass of pydantic.BaseModel")
+
+        cache_key = self._get_cache_key(response_model, messages, use_cache, **kwargs)
+        if cache_key is not None:
+            cached = await asyncio.to_thread(
+                self._get_cached_completion, response_model, cache_key
+            )
+            if cached is not None:
+                return cached
+
+        async with self._arate_limit(messages, **kwargs) as reservation:
+            response, completion = await self.llm_provider.acreate_completion(
+                response_model, messages, **kwargs
+            )
+            reservation.record_usage(getattr(completion, "usage", None))
+        if cache_key is not None:
+            await asyncio.to_thread(
+                self.completion_cache.set,
+                cache_key,
+                dump_completion(response, completion),
+            )
+        return response, completion
+
+    def _get_streamed_value(
+        self, response_model: Type[BaseModel], partial: Optional[BaseModel]
+    ) -> Optional[str]:
+        if partial is None:
+            return None
+        try:
+            response = response_model.model_validate(partial.model_dump())
+        except ValidationError as e:
+            logging.warning(f"Not caching incomplete streamed response: {str(e)}")
+            return None
+        return dump_completion(response, None)
+
+    def stream_completion(
+        self,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        use_cache: bool = True,
+        **kwargs,
+    ) -> Iterator[BaseModel]:
+        """
+        Stream partial responses using the configured LLM provider.
+
+        Fields are generated in the order the response model declares them.
+        Each partial response has the fields generated so far and None for
+        the rest; the last one has every field. A cached response is yielded
+        once, complete. The rate limit quota is reconciled with the usage of
+        the stream's final completion; it stays at the estimate if the provider
+        does not report usage on the stream.
+
+        Args:
+            response_model: Pydantic model class defining the expected response structure
+            messages: List of message dictionaries containing the conversation
+            use_cache: Whether a deterministic completion may be served from
+                and stored in the completion cache
+            **kwargs: Additional arguments to pass to the provider
+
+        Yields:
+            Partial instances of the response model
+
+        Raises:
+            TypeError: If response_model is not a Pydantic BaseModel
+        """
+        if not issubclass(response_model, BaseModel):
+            raise TypeError("response_model must be a subclass of pydantic.BaseModel")
+
+        cache_key = self._get_cache_key(response_model, messages, use_cache, **kwargs)
+        cached = self._get_cached_completion(response_model, cache_key)
+        if cached is not None:
+            yield cached[0]
+            return
+
+        partial = None
+        with self._rate_limit(messages, **kwargs) as reservation:
+            for partial in self.llm_provider.stream_completion(
+                response_model, messages, **kwargs
+            ):
+                yield partial
+            reservation.record_usage(get_stream_usage(partial))
+        if cache_key is not None:
+            value = self._get_streamed_value(response_model, partial)
+            if value is not None:
+                self.completion_cache.set(cache_key, value)
+
+    async def astream_completion(
+        self,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        use_cache: bool = True,
+        **kwargs,
+    ) -> AsyncIterator[BaseModel]:
+        """
+        Stream partial responses using the configured LLM provider's async client.
+
+        See stream_completion() for how partial responses are yielded.
+
+        Args:
+            response_model: Pydantic model class defining the expected response structure
+            messages: List of message dictionaries containing the conversation
+            use_cache: Whether a deterministic completion may be served from
+                and stored in the completion cache
+            **kwargs: Additional arguments to pass to the provider
+
+        Yields:
+            Partial instances of the response model
+
+        Raises:
+            TypeError: If response_model is not a Pydantic BaseModel
+        """
+        if not issubclass(response_model, BaseModel):
+            raise TypeError("response_model must be a subclass of pydantic.BaseModel")
+
+        cache_key = self._get_cache_key(response_model, messages, use_cache, **kwargs)
+        if cache_key is not None:
+            cached = await asyncio.to_thread(
+                self._get_cached_completion, response_model, cache_key
+            )
+            if cached is not None:
+                yield cached[0]
+                return
+
+        partial = None
+        async with self._arate_limit(messages, **kwargs) as reservation:
+            async for partial in self.llm_provider.astream_completion(
+                response_model, messages, **kwargs
+            ):
+                yield partial
+            reservation.record_usage(get_stream_usage(partial))
+        if cache_key is not None:
+            value = self._get_streamed_value(response_model, partial)
+            if value is not None:
+                await asyncio.to_thread(self.completion_cache.set, cache_key, value)
+
+    @staticmethod
+    def warm_up(providers: Iterable[str] = ("openai",)) -> None:
+        """Creates the pooled clients for the given providers.
+
+        Args:
+            providers: Names of the providers to create clients for
+        """
+        for provider in providers:
+            LLMFactory(provider)
+
+    @staticmethod
+    async def aclose_async_clients() -> None:
+        """Closes the async clients of all pooled providers that are bound to
+        the running event loop.
+
+        Call this before the event loop finishes, e.g. at the end of a
+        coroutine passed to asyncio.run(), to release its connections.
+        """
+        with LLMFactory._lock:
+            providers = list(LLMFactory._providers.values())
+        for llm_provider in providers:
+            await llm_provider.aclose()
+
+    @staticmethod
+    def close_all() -> None:
+        """Closes and removes all pooled providers."""
+        with LLMFactory._lock:
+            providers = list(LLMFactory._providers.values())
+            LLMFactory._providers.clear()
+        for llm_provider in providers:
+            llm_provider.close()
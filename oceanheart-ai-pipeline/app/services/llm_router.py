@@ -0,0 +1,466 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from config.settings import get_settings
+from pydantic import BaseModel
+from services.llm_factory import LLMFactory
+
+"""
+LLM Router Module
+
+This module routes completions over several LLM providers. The router tries the
+configured providers in order and skips providers whose circuit breaker is open,
+so a degraded provider stops stalling the pipeline after a few failures instead
+of on every call.
+
+With hedging enabled, a completion that takes longer than the provider's recent
+p95 latency is raced against the next healthy provider. The first successful
+response wins and the other request is cancelled, which bounds tail latency by
+the fastest healthy provider.
+
+Latency windows and circuit breakers are shared by all routers in a process.
+"""
+
+
+class ProviderUnavailableError(Exception):
+    """Raised when no configured provider can take a completion."""
+
+    pass
+
+
+class LatencyTracker:
+    """Sliding window of recent completion latencies.
+
+    Args:
+        window: Number of recent latencies to keep
+        min_samples: Latencies needed before percentiles are reported
+    """
+
+    def __init__(self, window: int = 100, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Returns the q-th quantile of the window, or None if there are too
+        few samples."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        return latencies[min(int(q * len(latencies)), len(latencies) - 1)]
+
+
+class CircuitBreaker:
+    """Stops calls to a provider after consecutive failures.
+
+    After failure_threshold consecutive failures the circuit opens and the
+    provider is skipped. After reset_timeout seconds the circuit is half-open
+    and a single trial call is let through: success closes the circuit,
+    failure opens it again.
+
+    Args:
+        failure_threshold: Consecutive failures that open the circuit
+        reset_timeout: Seconds before an open circuit lets a trial call through
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def available(self) -> bool:
+        """Whether a call could be made now. Does not reserve the trial call."""
+        with self._lock:
+            state = self.state
+            return state == self.CLOSED or (
+                state == self.HALF_OPEN and not self._trial_running
+            )
+
+    def begin(self) -> bool:
+        """Reserves a call. Returns False if the circuit does not allow one."""
+        with self._lock:
+            state = self.state
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._trial_running or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def record_cancelled(self) -> None:
+        """Releases the trial call of a request that was cancelled."""
+        with self._lock:
+            self._trial_running = False
+
+
+class ProviderHealth:
+    """Latency window and circuit breaker of one provider."""
+
+    def __init__(self, settings):
+        self.latency = LatencyTracker(
+            window=settings.latency_window, min_samples=settings.hedge_min_samples
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.circuit_failure_threshold,
+            reset_timeout=settings.circuit_reset_timeout,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state,
+            "failures": self.breaker.failures,
+            "p50": self.latency.percentile(0.5),
+            "p95": self.latency.percentile(0.95),
+        }
+
+
+class LLMRouter:
+    """
+    Routes completions over several LLM providers with failover and hedging.
+
+    Offers the same create_completion(), acreate_completion(),
+    stream_completion() and astream_completion() methods as LLMFactory, so
+    nodes can use either.
+    Providers are tried in order, skipping providers with an open circuit.
+    Each provider uses its own default model.
+
+    Hedging only applies to acreate_completion(). The blocking path falls
+    back in order, and streams fall back only until the first partial
+    response, since a stream cannot switch providers halfway.
+
+    Args:
+        providers: Provider names in order of preference. Defaults to LLM_PROVIDERS.
+        hedge: Whether to race the next provider after the hedge deadline.
+            Defaults to LLM_HEDGING.
+
+    Attributes:
+        providers: Provider names in order of preference
+        hedge: Whether hedged requests are enabled
+        settings: The LLMConfig
+        _health: Process-wide health of each provider by name
+        _lock: Lock guarding the health registry
+    """
+
+    _health: ClassVar[Dict[str, ProviderHealth]] = {}
+    _lock: ClassVar[threading.Lock] = threading.Lock()
+
+    def __init__(
+        self, providers: Optional[Sequence[str]] = None, hedge: Optional[bool] = None
+    ):
+        self.settings = get_settings().llm
+        self.providers = list(providers or self.settings.provider_order)
+        if not self.providers:
+            raise ValueError("LLMRouter needs at least one provider")
+        self.hedge = self.settings.hedging if hedge is None else hedge
+        self.factories = {provider: LLMFactory(provider) for provider in self.providers}
+
+    def _get_health(self, provider: str) -> ProviderHealth:
+        health = LLMRouter._health.get(provider)
+        if health is None:
+            with LLMRouter._lock:
+                health = LLMRouter._health.get(provider)
+                if health is None:
+                    health = ProviderHealth(self.settings)
+                    LLMRouter._health[provider] = health
+        return health
+
+    def _available_providers(self) -> List[str]:
+        providers = [
+            provider
+            for provider in self.providers
+            if self._get_health(provider).breaker.available()
+        ]
+        if not providers:
+            raise ProviderUnavailableError(
+                f"All LLM providers are unavailable: {', '.join(self.providers)}"
+            )
+        return providers
+
+    def _hedge_delay(self, provider: str) -> float:
+        p95 = self._get_health(provider).latency.percentile(self.settings.hedge_percentile)
+        if p95 is None:
+            return self.settings.hedge_delay
+        return max(p95, self.settings.hedge_min_delay)
+
+    def create_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Tuple[BaseModel, Any]:
+        """
+        Create a completion with the first provider that succeeds.
+
+        Args:
+            response_model: Pydantic model class defining the expected response structure
+            messages: List of message dictionaries containing the conversation
+            **kwargs: Additional arguments to pass to the providers
+
+        Returns:
+            Tuple containing the parsed response model and raw completion
+
+        Raises:
+            ProviderUnavailableError: If every provider's circuit is open
+            Exception: The last provider's error if every provider failed
+        """
+        error: Optional[Exception] = None
+        for provider in self._available_providers():
+            health = self._get_health(provider)
+            if not health.breaker.begin():
+                continue
+            start = time.monotonic()
+            try:
+                result = self.factories[provider].create_completion(
+                    response_model, messages, **kwargs
+                )
+            except Exception as e:
+                health.breaker.record_failure()
+                logging.warning(f"LLM provider {provider} failed: {str(e)}")
+                error = e
+                continue
+            health.latency.record(time.monotonic() - start)
+            health.breaker.record_success()
+            return result
+        raise error or ProviderUnavailableError("No LLM provider accepted the request")
+
+    async def _acall(
+        self,
+        provider: str,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        **kwargs,
+    ) -> Tuple[BaseModel, Any]:
+        health = self._get_health(provider)
+        if not health.breaker.begin():
+            raise ProviderUnavailableError(f"LLM provider {provider} is unavailable")
+        start = time.monotonic()
+        try:
+            result = await self.factories[provider].acreate_completion(
+                response_model, messages, **kwargs
+            )
+        except asyncio.CancelledError:
+            health.breaker.record_cancelled()
+            raise
+        except Exception:
+            health.breaker.record_failure()
+            raise
+        health.latency.record(time.monotonic() - start)
+        health.breaker.record_success()
+        return result
+
+    async def acreate_completion(
+        self, response_model: Type[BaseModel], messages: List[Dict[str, str]], **kwargs
+    ) -> Tuple[BaseModel, Any]:
+        """
+        Create a completion with failover and, if enabled, hedging.
+
+        Providers are tried in order. With hedging, once the running request
+        has taken longer than its provider's p95 latency, the next provider
+        is started as well; the first success wins and the other request is
+        cancelled. At most two requests run at once.
+
+        Args:
+            response_model: Pydantic model class defining the expected response structure
+            messages: List of message dictionaries containing the conversation
+            **kwargs: Additional arguments to pass to the providers
+
+        Returns:
+            Tuple containing the parsed response model and raw completion
+
+        Raises:
+            ProviderUnavailableError: If every provider's circuit is open
+            Exception: The last provider's error if every provider failed
+        """
+        providers = self._available_providers()
+        pending: Dict[asyncio.Task, str] = {}
+        error: Optional[BaseException] = None
+        next_index = 0
+
+        def start_next() -> None:
+            nonlocal next_index
+            provider = providers[next_index]
+            next_index += 1
+            task = asyncio.create_task(
+                self._acall(provider, response_model, messages, **kwargs)
+            )
+            pending[task] = provider
+
+        start_next()
+        try:
+            while pending:
+                timeout = None
+                if self.hedge and len(pending) == 1 and next_index < len(providers):
+                    timeout = self._hedge_delay(next(iter(pending.values())))
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    logging.info(
+                        f"Hedging LLM request with provider {providers[next_index]}"
+                    )
+                    start_next()
+                    continue
+                for task in done:
+                    provider = pending.pop(task)
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+                    logging.warning(f"LLM provider {provider} failed: {str(error)}")
+                if not pending and next_index < len(providers):
+                    start_next()
+        finally:
+            for task in pending:
+                task.cancel()
+        raise error
+
+    def stream_completion(
+        self,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        **kwargs,
+    ) -> Iterator[BaseModel]:
+        """
+        Stream partial responses from the first provider that starts streaming.
+
+        Uses the pooled blocking clients. See astream_completion() for how
+        providers are tried.
+
+        Args:
+            response_model: Pydantic model class defining the expected response structure
+            messages: List of message dictionaries containing the conversation
+            **kwargs: Additional arguments to pass to the providers
+
+        Yields:
+            Partial instances of the response model
+
+        Raises:
+            ProviderUnavailableError: If every provider's circuit is open
+            Exception: The last provider's error if every provider failed
+        """
+        error: Optional[Exception] = None
+        for provider in self._available_providers():
+            health = self._get_health(provider)
+            if not health.breaker.begin():
+                continue
+            started = False
+            try:
+                for partial in self.factories[provider].stream_completion(
+                    response_model, messages, **kwargs
+                ):
+                    started = True
+                    yield partial
+            except GeneratorExit:
+                health.breaker.record_cancelled()
+                raise
+            except Exception as e:
+                health.breaker.record_failure()
+                if started:
+                    raise
+                logging.warning(f"LLM provider {provider} failed: {str(e)}")
+                error = e
+                continue
+            health.breaker.record_success()
+            return
+        raise error or ProviderUnavailableError("No LLM provider accepted the request")
+
+    async def astream_completion(
+        self,
+        response_model: Type[BaseModel],
+        messages: List[Dict[str, str]],
+        **kwargs,
+    ) -> AsyncIterator[BaseModel]:
+        """
+        Stream partial responses from the first provider that starts streaming.
+
+        A provider that fails before its first partial response is skipped.
+        Errors after the first partial response are raised.
+
+        Args:
+            response_model: Pydantic model class defining the expected response structure
+            messages: List of message dictionaries containing the conversation
+            **kwargs: Additional arguments to pass to the providers
+
+        Yields:
+            Partial instances of the response model
+
+        Raises:
+            ProviderUnavailableError: If every provider's circuit is open
+            Exception: The last provider's error if every provider failed
+        """
+        error: Optional[Exception] = None
+        for provider in self._available_providers():
+            health = self._get_health(provider)
+            if not health.breaker.begin():
+                continue
+            started = False
+            try:
+                async for partial in self.factories[provider].astream_completion(
+                    response_model, messages, **kwargs
+                ):
+                    started = True
+                    yield partial
+            except (asyncio.CancelledError, GeneratorExit):
+                health.breaker.record_cancelled()
+                raise
+            except Exception as e:
+                health.breaker.record_failure()
+                if started:
+                    raise
+                logging.warning(f"LLM provider {provider} failed: {str(e)}")
+                error = e
+                continue
+            health.breaker.record_success()
+            return
+        raise error or ProviderUnavailableError("No LLM provider accepted the request")
+
+    @staticmethod
+    def health() -> Dict[str, Dict[str, Any]]:
+        """Returns the circuit state and latency percentiles of each provider."""
+        with LLMRouter._lock:
+            providers = dict(LLMRouter._health)
+        return {provider: health.stats() for provider, health in providers.items()}
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+
+from config.settings import get_settings
+from pydantic import BaseModel
+
+"""
+Partial Results Module
+
+This module carries the partial responses of streaming LLM nodes from the
+workers to API clients. Workers append messages to a Redis stream per ticket,
+and the SSE endpoint reads the stream from the start, so a client that connects
+late still receives every message. Streams expire after the configured TTL.
+
+Each message has an event type ("partial", "final" or "done"), the name of the
+node that produced it and a JSON payload.
+"""
+
+
+def partial_results_key(ticket_id: Any) -> str:
+    """Returns the Redis stream key for a ticket's partial results."""
+    return f"{get_settings().worker.partial_results_key}:{ticket_id}"
+
+
+def publish_message(
+    ticket_id: Any, event: str, node: str, data: Dict[str, Any], redis_client=None
+) -> None:
+    """Appends a message to a ticket's partial results stream.
+
+    Args:
+        ticket_id: The ticket the message belongs to
+        event: The event type: "partial", "final" or "done"
+        node: Name of the node that produced the message
+        data: JSON-serializable payload
+        redis_client: The Redis client to use. Defaults to the broker's client.
+    """
+    if redis_client is None:
+        from config.celery_config import get_redis_client
+
+        redis_client = get_redis_client()
+    worker_settings = get_settings().worker
+    key = partial_results_key(ticket_id)
+    pipe = redis_client.pipeline(transaction=False)
+    pipe.xadd(
+        key,
+        {"event": event, "node": node, "data": json.dumps(data)},
+        maxlen=worker_settings.partial_results_max_length,
+        approximate=True,
+    )
+    pipe.expire(key, worker_settings.partial_results_ttl)
+    pipe.execute()
+
+
+def publish_done(ticket_id: Any, status: str) -> None:
+    """Marks a ticket's partial results stream as finished. Errors are logged.
+
+    Args:
+        ticket_id: The ticket whose pipeline finished
+        status: "completed" or "failed"
+    """
+    if not get_settings().worker.partial_results_enabled:
+        return
+    try:
+        publish_message(ticket_id, "done", "", {"status": status})
+    except Exception as e:
+        logging.warning(f"Error publishing partial results: {str(e)}")
+
+
+class PartialResultPublisher:
+    """Publishes the partial responses of one streaming node run.
+
+    Partial responses are published at most once per interval; final
+    responses are always published. A Redis error is logged once and stops
+    publishing for the rest of the run, so an unavailable Redis never slows
+    down or fails the pipeline.
+
+    Args:
+        ticket_id: The ticket being processed
+        node_name: Name of the streaming node
+    """
+
+    def __init__(self, ticket_id: Any, node_name: str):
+        worker_settings = get_settings().worker
+        self.ticket_id = ticket_id
+        self.node_name = node_name
+        self.enabled = worker_settings.partial_results_enabled
+        self.interval = worker_settings.partial_results_interval
+        self._last_published = 0.0
+
+    def _is_due(self, final: bool) -> bool:
+        if not self.enabled:
+            return False
+        return final or time.monotonic() - self._last_published >= self.interval
+
+    def publish(self, response: BaseModel, final: bool = False) -> None:
+        """Publishes a partial or final response if it is due."""
+        if not self._is_due(final):
+            return
+        self._last_published = time.monotonic()
+        try:
+            publish_message(
+                self.ticket_id,
+                "final" if final else "partial",
+                self.node_name,
+                response.model_dump(mode="json", exclude_none=not final),
+            )
+        except Exception as e:
+            logging.warning(f"Error publishing partial results: {str(e)}")
+            self.enabled = False
+
+    async def apublish(self, response: BaseModel, final: bool = False) -> None:
+        """Publishes a partial or final response from the default thread pool."""
+        if self._is_due(final):
+            await asyncio.to_thread(self.publish, response, final)
+
+
+async def read_partial_results(
+    ticket_id: Any, redis_client, timeout: Optional[float] = None, block: float = 15.0
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """Reads a ticket's partial results stream from the start.
+
+    Yields None whenever no message arrived for block seconds, so callers
+    can send keep-alives. Stops after the "done" message or the timeout.
+
+    Args:
+        ticket_id: The ticket to read the results of
+        redis_client: An asyncio Redis client
+        timeout: Seconds to read for. Defaults to the configured timeout.
+        block: Seconds to wait for new messages before yielding None
+
+    Yields:
+        Messages with "event", "node" and "data" keys, or None
+    """
+    key = partial_results_key(ticket_id)
+    timeout = timeout or get_settings().worker.partial_results_timeout
+    deadline = time.monotonic() + timeout
+    last_id = "0-0"
+    while time.monotonic() < deadline:
+        block_ms = int(min(block, max(deadline - time.monotonic(), 0.001)) * 1000)
+        response = await redis_client.xread({key: last_id}, block=block_ms)
+        if not response:
+            yield None
+            continue
+        for message_id, fields in response[0][1]:
+            last_id = message_id
+            message = {
+                name.decode() if isinstance(name, bytes) else name: (
+                    value.decode() if isinstance(value, bytes) else value
+                )
+                for name, value in fields.items()
+            }
+            message["data"] = json.loads(message["data"])
+            yield message
+            if message["event"] == "done":
+                return
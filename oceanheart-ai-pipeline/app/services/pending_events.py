@@ -0,0 +1,156 @@
+import logging
+import uuid
+from functools import lru_cache
+from typing import List, Tuple
+
+from config.settings import get_settings
+
+"""
+Pending Events Module
+
+This module holds the ids of events that the API queued for batched processing.
+Workers claim a batch by moving its ids from the pending list to a claim list
+in one atomic step, and release the claim once the batch has been committed.
+Ids of a claim that is not released within the claim timeout, because its
+worker crashed, are put back on the pending list by the next claim. Failed
+events are retried up to a maximum number of attempts and then moved to a
+dead-letter list, so no event is silently dropped.
+
+Processing is at least once: an event whose results were committed just before
+its worker crashed is processed again.
+"""
+
+# Releases a claim. Failed ids are put back on the pending list until they
+# reach the maximum attempts, then moved to the dead-letter list. Expects KEYS
+# pending, claims, attempts, dead-letter. Returns the requeued and dead counts.
+RELEASE_FUNCTION = """
+local function release(claim, max_attempts, failed)
+    local requeued, dead = 0, 0
+    for _, id in ipairs(redis.call('LRANGE', claim, 0, -1)) do
+        if failed == nil or failed[id] then
+            if redis.call('HINCRBY', KEYS[3], id, 1) >= max_attempts then
+                redis.call('HDEL', KEYS[3], id)
+                redis.call('RPUSH', KEYS[4], id)
+                dead = dead + 1
+            else
+                redis.call('RPUSH', KEYS[1], id)
+                requeued = requeued + 1
+            end
+        else
+            redis.call('HDEL', KEYS[3], id)
+        end
+    end
+    redis.call('DEL', claim)
+    redis.call('ZREM', KEYS[2], claim)
+    return {requeued, dead}
+end
+"""
+
+# Releases expired claims as failed, then moves up to ARGV[1] ids from the
+# pending list to the claim list KEYS[5]. Returns the claimed ids.
+CLAIM_SCRIPT = (
+    RELEASE_FUNCTION
+    + """
+local now = tonumber(redis.call('TIME')[1])
+local max_attempts = tonumber(ARGV[3])
+for _, claim in ipairs(
+    redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now - tonumber(ARGV[2]))
+) do
+    release(claim, max_attempts, nil)
+end
+local ids = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+if #ids > 0 then
+    redis.call('LTRIM', KEYS[1], #ids, -1)
+    redis.call('RPUSH', KEYS[5], unpack(ids))
+    redis.call('ZADD', KEYS[2], now, KEYS[5])
+end
+return ids
+"""
+)
+
+# Releases the claim KEYS[5]; ARGV[2..] are the ids that failed
+ACK_SCRIPT = (
+    RELEASE_FUNCTION
+    + """
+local failed = {}
+for i = 2, #ARGV do
+    failed[ARGV[i]] = true
+end
+return release(KEYS[5], tonumber(ARGV[1]), failed)
+"""
+)
+
+
+class PendingEventQueue:
+    """Redis list of event ids with claims and retries.
+
+    Args:
+        redis_client: Redis client of the broker's Redis instance
+        key: Key of the pending list the API pushes event ids onto
+        claim_timeout: Seconds after which an unreleased claim is requeued
+        max_attempts: Attempts before an event is moved to the dead-letter list
+    """
+
+    def __init__(
+        self, redis_client, key: str, claim_timeout: int = 600, max_attempts: int = 3
+    ):
+        self.redis_client = redis_client
+        self.key = key
+        self.claim_timeout = claim_timeout
+        self.max_attempts = max_attempts
+        self.keys = [key, f"{key}:claims", f"{key}:attempts", f"{key}:dead"]
+        self._claim = redis_client.register_script(CLAIM_SCRIPT)
+        self._ack = redis_client.register_script(ACK_SCRIPT)
+
+    def claim(self, batch_size: int) -> Tuple[str, List[str]]:
+        """Claims up to batch_size event ids.
+
+        Args:
+            batch_size: Maximum number of ids to claim
+
+        Returns:
+            Tuple of the claim key and the claimed event ids
+        """
+        claim = f"{self.key}:claim:{uuid.uuid4()}"
+        ids = self._claim(
+            keys=[*self.keys, claim],
+            args=[batch_size, self.claim_timeout, self.max_attempts],
+        )
+        return claim, [event_id.decode() for event_id in ids]
+
+    def release(self, claim: str, failed: List[str]) -> None:
+        """Releases a claim once its batch is committed.
+
+        Args:
+            claim: The claim key returned by claim()
+            failed: Ids of the claimed events that failed and should be retried
+        """
+        requeued, dead = self._ack(
+            keys=[*self.keys, claim], args=[self.max_attempts, *failed]
+        )
+        if requeued:
+            logging.warning(f"Requeued {requeued} failed events")
+        if dead:
+            logging.error(
+                f"Moved {dead} events to {self.keys[3]} after "
+                f"{self.max_attempts} failed attempts"
+            )
+
+
+@lru_cache
+def get_pending_event_queue() -> PendingEventQueue:
+    """
+    Get the process-wide PendingEventQueue instance.
+
+    Returns:
+        PendingEventQueue: The queue of event ids for batched processing.
+    """
+    from config.celery_config import get_redis_client
+
+    worker_settings = get_settings().worker
+    return PendingEventQueue(
+        get_redis_client(),
+        worker_settings.pending_events_key,
+        claim_timeout=worker_settings.claim_timeout,
+        max_attempts=worker_settings.max_attempts,
+    )
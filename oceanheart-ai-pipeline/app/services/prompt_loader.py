@@ -1,6 +1,19 @@
+import os
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, Dict, Optional
+
 import frontmatter
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, TemplateError, meta
+from jinja2 import (
+    Environment,
+    FileSystemLoader,
+    Template,
+    StrictUndefined,
+    TemplateError,
+    meta,
+)
 
 """
 Prompt Management Module
@@ -8,9 +21,28 @@ Prompt Management Module
 This module provides functionality for loading and rendering prompt templates with frontmatter.
 It uses Jinja2 for template rendering and python-frontmatter for metadata handling,
 implementing a singleton pattern for template environment management.
+
+Templates are parsed and compiled once and cached until their file changes, and
+rendered prompts are memoized per template and variables, so building a prompt
+for a ticket does not touch the template file again.
 """
 
 
+@dataclass(frozen=True, eq=False)
+class CompiledTemplate:
+    """A parsed and compiled prompt template file.
+
+    Instances hash by identity, so a recompiled template never shares rendered
+    prompts with the version it replaced.
+    """
+
+    path: str
+    mtime: float
+    metadata: Dict[str, Any]
+    content: str
+    template: Template
+
+
 class PromptManager:
     """Manager class for handling prompt templates and their metadata.
 
@@ -19,8 +51,15 @@ class PromptManager:
     It implements a singleton pattern for the Jinja2 environment to ensure
     consistent template loading across the application.
 
+    Compiled templates are cached by name and revalidated against the file's
+    modification time on each use. While a filesystem watcher is running (see
+    watch()), the watcher invalidates changed templates instead and the
+    modification time is not checked.
+
     Attributes:
         _env: Class-level singleton instance of Jinja2 Environment
+        _templates: Compiled templates by template name
+        _observer: Running filesystem watcher, if any
 
     Example:
         # Render a prompt template with variables
@@ -31,6 +70,9 @@ class PromptManager:
     """
 
     _env = None
+    _templates: Dict[str, CompiledTemplate] = {}
+    _observer = None
+    _lock = threading.Lock()
 
     @classmethod
     def _get_env(cls, templates_dir="prompts") -> Environment:
@@ -58,6 +100,9 @@ class PromptManager:
     def get_prompt(template: str, **kwargs) -> str:
         """Loads and renders a prompt template with provided variables.
 
+        Rendered prompts are memoized when all variables are hashable, so
+        repeated calls with the same variables return the cached string.
+
         Args:
             template: Name of the template file (without .j2 extension)
             **kwargs: Variables to use in template rendering
@@ -69,16 +114,13 @@ class PromptManager:
             ValueError: If template rendering fails
             FileNotFoundError: If template file doesn't exist
         """
-        env = PromptManager._get_env()
-        template_path = f"{template}.j2"
-        with open(env.loader.get_source(env, template_path)[1]) as file:
-            post = frontmatter.load(file)
-
-        template = env.from_string(post.content)
+        compiled = PromptManager._load_template(template)
+        variables = tuple(sorted(kwargs.items()))
         try:
-            return template.render(**kwargs)
-        except TemplateError as e:
-            raise ValueError(f"Error rendering template: {str(e)}")
+            hash(variables)
+        except TypeError:
+            return _render(compiled, variables)
+        return _render_cached(compiled, variables)
 
     @staticmethod
     def get_template_info(template: str) -> dict:
@@ -99,17 +141,130 @@ class PromptManager:
             FileNotFoundError: If template file doesn't exist
         """
         env = PromptManager._get_env()
-        template_path = f"{template}.j2"
-        with open(env.loader.get_source(env, template_path)[1]) as file:
-            post = frontmatter.load(file)
+        compiled = PromptManager._load_template(template)
 
-        ast = env.parse(post.content)
+        ast = env.parse(compiled.content)
         variables = meta.find_undeclared_variables(ast)
 
         return {
             "name": template,
-            "description": post.metadata.get("description", "No description provided"),
-            "author": post.metadata.get("author", "Unknown"),
+            "description": compiled.metadata.get(
+                "description", "No description provided"
+            ),
+            "author": compiled.metadata.get("author", "Unknown"),
             "variables": list(variables),
-            "frontmatter": post.metadata,
+            "frontmatter": compiled.metadata,
         }
+
+    @staticmethod
+    def _load_template(template: str) -> CompiledTemplate:
+        """Returns the compiled template, compiling it on first use or when
+        its file has changed.
+
+        Args:
+            template: Name of the template file (without .j2 extension)
+
+        Returns:
+            The cached or freshly compiled template
+
+        Raises:
+            FileNotFoundError: If template file doesn't exist
+        """
+        compiled = PromptManager._templates.get(template)
+        if compiled is not None:
+            if PromptManager._observer is not None:
+                return compiled
+            try:
+                if os.stat(compiled.path).st_mtime == compiled.mtime:
+                    return compiled
+            except FileNotFoundError:
+                PromptManager.invalidate(template)
+
+        env = PromptManager._get_env()
+        path = env.loader.get_source(env, f"{template}.j2")[1]
+        mtime = os.stat(path).st_mtime
+        with open(path) as file:
+            post = frontmatter.load(file)
+
+        compiled = CompiledTemplate(
+            path=path,
+            mtime=mtime,
+            metadata=post.metadata,
+            content=post.content,
+            template=env.from_string(post.content),
+        )
+        PromptManager._templates[template] = compiled
+        return compiled
+
+    @staticmethod
+    def invalidate(template: Optional[str] = None) -> None:
+        """Drops a compiled template from the cache, or all of them.
+
+        Rendered prompts of the old template are no longer returned, because
+        the render cache is keyed by the compiled template.
+
+        Args:
+            template: Name of the template to drop. Drops all templates if None.
+        """
+        if template is None:
+            PromptManager._templates.clear()
+            _render_cached.cache_clear()
+        else:
+            PromptManager._templates.pop(template, None)
+
+    @staticmethod
+    def watch() -> None:
+        """Starts a filesystem watcher that invalidates templates as they change.
+
+        While the watcher runs, cached templates are used without checking
+        their modification time.
+
+        Raises:
+            ImportError: If watchdog is not installed
+        """
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            raise ImportError("Please install watchdog: pip install watchdog")
+
+        class TemplateEventHandler(FileSystemEventHandler):
+            def on_any_event(self, event):
+                PromptManager.invalidate(Path(event.src_path).stem)
+                dest_path = getattr(event, "dest_path", None)
+                if dest_path:
+                    PromptManager.invalidate(Path(dest_path).stem)
+
+        with PromptManager._lock:
+            if PromptManager._observer is not None:
+                return
+            env = PromptManager._get_env()
+            observer = Observer()
+            for search_path in env.loader.searchpath:
+                observer.schedule(TemplateEventHandler(), search_path, recursive=True)
+            observer.daemon = True
+            observer.start()
+            PromptManager.invalidate()
+            PromptManager._observer = observer
+
+    @staticmethod
+    def stop_watching() -> None:
+        """Stops the filesystem watcher and goes back to modification time checks."""
+        with PromptManager._lock:
+            observer = PromptManager._observer
+            PromptManager._observer = None
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def _render(compiled: CompiledTemplate, variables: tuple) -> str:
+    try:
+        return compiled.template.render(**dict(variables))
+    except TemplateError as e:
+        raise ValueError(f"Error rendering template: {str(e)}")
+
+
+@lru_cache(maxsize=256)
+def _render_cached(compiled: CompiledTemplate, variables: tuple) -> str:
+    return _render(compiled, variables)
@@ -0,0 +1,426 @@
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import weakref
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from config.settings import get_settings
+
+"""
+Rate Limiter Module
+
+This module keeps LLM and embedding requests within the providers' requests per
+minute (RPM) and tokens per minute (TPM) quotas. Quotas are token buckets in
+Redis, one per provider, model and quota, so every worker process draws from
+the same buckets. A request waits until both buckets have room instead of being
+sent and rejected with a 429, which instructor would otherwise retry and
+amplify.
+
+Tokens are estimated before a request and reconciled with the usage reported
+by the completion afterwards; streams whose provider does not report usage keep
+the estimate. Requests run in priority lanes: lower lanes leave
+part of each bucket free, so high priority requests, such as those of the
+internal helpdesk pipeline, go first when quota is scarce. A per-process concurrency
+governor additionally caps the requests in flight per provider.
+"""
+
+# Share of each bucket a lane must leave free
+LANE_RESERVES = {"high": 0.0, "normal": 0.1, "low": 0.3}
+
+# Seconds an idle bucket is kept; a full refill takes one minute
+BUCKET_TTL = 120
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar(
+    "llm_priority", default="normal"
+)
+
+# Refills both buckets, then takes the request and its tokens if the lane's
+# reserve stays free. Returns 0, or the milliseconds to wait before retrying.
+ACQUIRE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local reserve = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local levels = {}
+local wait = 0
+for i = 1, 2 do
+    local capacity = tonumber(ARGV[i * 2 + 1])
+    local cost = tonumber(ARGV[i * 2 + 2])
+    if capacity > 0 then
+        local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+        local level = tonumber(state[1]) or capacity
+        local ts = tonumber(state[2]) or now
+        level = math.min(capacity, level + (now - ts) * capacity / 60)
+        cost = math.min(cost, capacity * (1 - reserve))
+        local missing = cost + reserve * capacity - level
+        if missing > 0 then
+            wait = math.max(wait, missing * 60 / capacity)
+        end
+        levels[i] = {level - cost, capacity}
+    end
+end
+if wait > 0 then
+    return math.ceil(wait * 1000)
+end
+for i = 1, 2 do
+    if levels[i] then
+        redis.call('HSET', KEYS[i], 'level', levels[i][1], 'ts', now)
+        redis.call('EXPIRE', KEYS[i], ttl)
+    end
+end
+return 0
+"""
+
+# Refills the bucket and returns (positive) or charges (negative) tokens
+RECONCILE_SCRIPT = """
+local now = redis.call('TIME')
+now = tonumber(now[1]) + tonumber(now[2]) / 1000000
+local capacity = tonumber(ARGV[1])
+local delta = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'level', 'ts')
+local level = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+level = math.min(capacity, level + (now - ts) * capacity / 60 + delta)
+redis.call('HSET', KEYS[1], 'level', level, 'ts', now)
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[3]))
+return 0
+"""
+
+
+class RateLimitTimeout(Exception):
+    """Raised when a request could not get quota within the timeout."""
+
+    pass
+
+
+@contextmanager
+def llm_priority(priority: Optional[str]) -> Iterator[None]:
+    """Runs the block's LLM and embedding requests in a priority lane.
+
+    The lane is kept in a context variable, so it carries over into tasks
+    and threads started with asyncio.to_thread().
+
+    Args:
+        priority: "high", "normal" or "low". Keeps the current lane if None.
+    """
+    if priority is None:
+        yield
+        return
+    if priority not in LANE_RESERVES:
+        raise ValueError(f"Unsupported priority: {priority}")
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> str:
+    """Returns the priority lane of the running context."""
+    return _priority.get()
+
+
+def estimate_tokens(messages: List[Dict[str, Any]], max_output_tokens: int) -> int:
+    """Estimates the tokens of a chat request before it is sent.
+
+    Counts one token per four characters of message content, a few tokens of
+    overhead per message and the maximum number of output tokens.
+
+    Args:
+        messages: The chat messages
+        max_output_tokens: Tokens the completion may generate
+
+    Returns:
+        The estimated number of tokens
+    """
+    prompt_tokens = sum(len(str(m.get("content", ""))) // 4 + 4 for m in messages)
+    return prompt_tokens + max_output_tokens
+
+
+def usage_tokens(usage: Any) -> Optional[int]:
+    """Returns the total tokens of a completion's usage, or None if unknown.
+
+    Understands OpenAI (total_tokens) and Anthropic (input_tokens and
+    output_tokens) usage objects and their dictionary forms.
+    """
+    if usage is None:
+        return None
+    if not isinstance(usage, dict):
+        usage = usage.model_dump() if hasattr(usage, "model_dump") else vars(usage)
+    if usage.get("total_tokens") is not None:
+        return int(usage["total_tokens"])
+    if usage.get("input_tokens") is not None:
+        return int(usage["input_tokens"]) + int(usage.get("output_tokens") or 0)
+    return None
+
+
+class Reservation:
+    """Quota taken for one request.
+
+    Call record_usage() with the completion's usage so the token bucket can
+    be corrected when the request finishes.
+
+    Attributes:
+        key: Bucket key prefix for the provider and model
+        tokens: Estimated tokens taken from the TPM bucket
+        tpm: Capacity of the TPM bucket, or 0 if unlimited
+        actual_tokens: Tokens reported by the completion, if recorded
+    """
+
+    __slots__ = ("key", "tokens", "tpm", "actual_tokens")
+
+    def __init__(self, key: str, tokens: int, tpm: int):
+        self.key = key
+        self.tokens = tokens
+        self.tpm = tpm
+        self.actual_tokens: Optional[int] = None
+
+    def record_usage(self, usage: Any) -> None:
+        self.actual_tokens = usage_tokens(usage)
+
+
+class ConcurrencyGovernor:
+    """Caps the requests in flight in this process.
+
+    Blocking callers share one semaphore. Async callers get one semaphore per
+    event loop, since asyncio primitives cannot cross loops; the cap then
+    applies per loop.
+
+    Args:
+        max_concurrency: Maximum number of requests in flight
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max_concurrency
+        self._semaphore = threading.BoundedSemaphore(max_concurrency)
+        self._async_semaphores = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def hold(self) -> Iterator[None]:
+        with self._semaphore:
+            yield
+
+    @asynccontextmanager
+    async def ahold(self) -> AsyncIterator[None]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphore = self._async_semaphores.get(loop)
+            if semaphore is None:
+                semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._async_semaphores[loop] = semaphore
+        async with semaphore:
+            yield
+
+
+class RateLimiter:
+    """Distributed RPM and TPM token buckets with priority lanes.
+
+    Buckets refill continuously at their per-minute capacity. A request takes
+    one unit from the RPM bucket and its estimated tokens from the TPM bucket,
+    waiting until both have room. Redis errors are logged and let the request
+    through, so an unavailable Redis never stops the pipeline.
+
+    Args:
+        redis_client: The Redis client to use
+        timeout: Seconds a request may wait for quota
+        prefix: Prefix for the Redis keys
+    """
+
+    def __init__(self, redis_client: Any, timeout: float = 60.0, prefix: str = "ratelimit"):
+        self.redis_client = redis_client
+        self.timeout = timeout
+        self.prefix = prefix
+        self._acquire = redis_client.register_script(ACQUIRE_SCRIPT)
+        self._reconcile = redis_client.register_script(RECONCILE_SCRIPT)
+        self._governors: Dict[str, ConcurrencyGovernor] = {}
+        self._lock = threading.Lock()
+
+    def _try_acquire(
+        self, key: str, rpm: int, tpm: int, tokens: int, priority: str
+    ) -> float:
+        """Takes quota if available. Returns 0, or the seconds to wait."""
+        try:
+            wait_ms = self._acquire(
+                keys=[f"{key}:rpm", f"{key}:tpm"],
+                args=[LANE_RESERVES[priority], BUCKET_TTL, rpm, 1, tpm, tokens],
+            )
+        except Exception as e:
+            logging.warning(f"Error reading rate limit, not limiting: {str(e)}")
+            return 0.0
+        return int(wait_ms) / 1000
+
+    def _reserve(self, provider: str, model: str, tpm: int, tokens: int) -> Reservation:
+        return Reservation(f"{self.prefix}:{provider}:{model}", tokens, tpm)
+
+    def acquire(
+        self,
+        provider: str,
+        model: str,
+        rpm: int,
+        tpm: int,
+        tokens: int,
+        priority: Optional[str] = None,
+    ) -> Reservation:
+        """
+        Waits until the request fits in the RPM and TPM buckets and takes it.
+
+        Args:
+            provider: Name of the provider
+            model: Name of the model
+            rpm: Requests per minute quota, or 0 for unlimited
+            tpm: Tokens per minute quota, or 0 for unlimited
+            tokens: Estimated tokens of the request
+            priority: Priority lane. Defaults to the lane of the running context.
+
+        Returns:
+            Reservation to reconcile once the request finished
+
+        Raises:
+            RateLimitTimeout: If the quota did not free up within the timeout
+        """
+        priority = priority or current_priority()
+        reservation = self._reserve(provider, model, tpm, tokens)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            wait = self._try_acquire(reservation.key, rpm, tpm, tokens, priority)
+            if not wait:
+                return reservation
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(
+                    f"No {provider}/{model} quota within {self.timeout} seconds"
+                )
+            time.sleep(wait)
+
+    async def aacquire(
+        self,
+        provider: str,
+        model: str,
+        rpm: int,
+        tpm: int,
+        tokens: int,
+        priority: Optional[str] = None,
+    ) -> Reservation:
+        """Waits for quota without blocking the event loop. See acquire()."""
+        priority = priority or current_priority()
+        reservation = self._reserve(provider, model, tpm, tokens)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            wait = await asyncio.to_thread(
+                self._try_acquire, reservation.key, rpm, tpm, tokens, priority
+            )
+            if not wait:
+                return reservation
+            if time.monotonic() + wait > deadline:
+                raise RateLimitTimeout(
+                    f"No {provider}/{model} quota within {self.timeout} seconds"
+                )
+            await asyncio.sleep(wait)
+
+    def reconcile(self, reservation: Reservation) -> None:
+        """Corrects the TPM bucket with the tokens the request actually used."""
+        if not reservation.tpm or reservation.actual_tokens is None:
+            return
+        delta = reservation.tokens - reservation.actual_tokens
+        if not delta:
+            return
+        try:
+            self._reconcile(
+                keys=[f"{reservation.key}:tpm"],
+                args=[reservation.tpm, delta, BUCKET_TTL],
+            )
+        except Exception as e:
+            logging.warning(f"Error reconciling rate limit: {str(e)}")
+
+    def governor(self, provider: str, max_concurrency: int) -> ConcurrencyGovernor:
+        """Returns the process-wide concurrency governor of a provider."""
+        with self._lock:
+            governor = self._governors.get(provider)
+            if governor is None or governor.max_concurrency != max_concurrency:
+                governor = ConcurrencyGovernor(max_concurrency)
+                self._governors[provider] = governor
+            return governor
+
+    @contextmanager
+    def limit(
+        self,
+        provider: str,
+        model: str,
+        tokens: int,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 0,
+    ) -> Iterator[Reservation]:
+        """
+        Runs a blocking request within the provider's quotas.
+
+        The TPM bucket is reconciled when the block exits, with the usage
+        recorded on the reservation.
+
+        Args:
+            provider: Name of the provider
+            model: Name of the model
+            tokens: Estimated tokens of the request
+            rpm: Requests per minute quota, or 0 for unlimited
+            tpm: Tokens per minute quota, or 0 for unlimited
+            max_concurrency: Requests in flight per process, or 0 for unlimited
+
+        Yields:
+            Reservation to record the completion's usage on
+        """
+        if rpm or tpm:
+            reservation = self.acquire(provider, model, rpm, tpm, tokens)
+        else:
+            reservation = self._reserve(provider, model, tpm, tokens)
+        try:
+            if max_concurrency:
+                with self.governor(provider, max_concurrency).hold():
+                    yield reservation
+            else:
+                yield reservation
+        finally:
+            self.reconcile(reservation)
+
+    @asynccontextmanager
+    async def alimit(
+        self,
+        provider: str,
+        model: str,
+        tokens: int,
+        rpm: int = 0,
+        tpm: int = 0,
+        max_concurrency: int = 0,
+    ) -> AsyncIterator[Reservation]:
+        """Runs an async request within the provider's quotas. See limit()."""
+        if rpm or tpm:
+            reservation = await self.aacquire(provider, model, rpm, tpm, tokens)
+        else:
+            reservation = self._reserve(provider, model, tpm, tokens)
+        try:
+            if max_concurrency:
+                async with self.governor(provider, max_concurrency).ahold():
+                    yield reservation
+            else:
+                yield reservation
+        finally:
+            if reservation.tpm and reservation.actual_tokens is not None:
+                await asyncio.to_thread(self.reconcile, reservation)
+
+
+@lru_cache
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the process-wide RateLimiter, backed by the broker's Redis.
+
+    Returns:
+        RateLimiter: The shared rate limiter.
+    """
+    from config.celery_config import get_redis_client
+
+    return RateLimiter(
+        get_redis_client(), timeout=get_settings().llm.rate_limit_timeout
+    )
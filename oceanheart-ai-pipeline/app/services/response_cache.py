@@ -0,0 +1,251 @@
+import logging
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+from config.settings import get_settings
+from psycopg2 import sql
+from pydantic import BaseModel
+from services.connection_pool import PooledSync
+from services.vector_store import VectorStore, get_vector_store
+from timescale_vector import client
+from utils.timer import timer
+
+"""
+Semantic Response Cache Module
+
+This module caches generated responses by the embedding of the ticket they
+answered. When a new ticket is close enough to a cached one, the cached
+response (or only its retrieved RAG context) is reused instead of running the
+vector search and LLM completion again.
+
+Entries live in their own table next to the knowledge base, so the cache is
+shared by all workers. Each entry belongs to a namespace, such as a pipeline and
+knowledge base category, and is dropped when that part of the knowledge base
+changes through VectorStore.upsert or VectorStore.delete. Expired entries are
+deleted by the purge_response_cache task.
+
+Generated responses are personal, as they address the sender by name. In
+"response" mode entries are therefore only reused for the same sender, while in
+the default "rag_context" mode the impersonal RAG context is shared by all.
+"""
+
+
+class SemanticResponseCache:
+    """Cache of payloads looked up by embedding similarity.
+
+    Args:
+        vector_store: The VectorStore providing embeddings and the connection pool
+        table_name: Table to store the cache entries in
+        threshold: Maximum cosine distance for a cached entry to be a hit
+        ttl: How long an entry stays valid
+        mode: "rag_context" to cache only the RAG context, or "response" to
+            cache the response and its RAG context per sender
+    """
+
+    def __init__(
+        self,
+        vector_store: VectorStore,
+        table_name: str = "response_cache",
+        threshold: float = 0.05,
+        ttl: timedelta = timedelta(days=1),
+        mode: str = "rag_context",
+    ):
+        if mode not in ("response", "rag_context"):
+            raise ValueError(f"Unsupported response cache mode: {mode}")
+        self.vector_store = vector_store
+        self.table_name = table_name
+        self.threshold = threshold
+        self.ttl = ttl
+        self.mode = mode
+        vector_settings = vector_store.vector_settings
+        self.vec_client = PooledSync(
+            vector_store.pool,
+            vector_store.settings.database.service_url,
+            table_name,
+            vector_settings.embedding_dimensions,
+            time_partition_interval=vector_settings.time_partition_interval,
+        )
+        vector_store.add_invalidation_listener(self.invalidate_categories)
+
+    def create_tables(self) -> None:
+        """Create the cache table in the database"""
+        self.vec_client.create_tables()
+
+    def response_namespace(
+        self, namespace: Dict[str, str], sender: str
+    ) -> Dict[str, str]:
+        """
+        Return the namespace of the entries for a ticket.
+
+        Args:
+            namespace: Metadata identifying the namespace, e.g. pipeline and category
+            sender: The sender of the ticket
+
+        Returns:
+            The namespace, limited to the sender in "response" mode
+        """
+        if self.mode == "response":
+            return {**namespace, "sender": sender}
+        return namespace
+
+    def lookup(self, namespace: Dict[str, str], text: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the payload cached for the most similar text in the namespace.
+
+        Errors are logged and treated as a miss, so the cache never fails a
+        pipeline.
+
+        Args:
+            namespace: Metadata identifying the namespace, e.g. pipeline and category
+            text: The text to look up
+
+        Returns:
+            The cached payload, or None if no entry is close enough
+        """
+        try:
+            embedding = self.vector_store.get_embedding(text)
+            with timer("Response cache lookup"):
+                results = self.vec_client.search(
+                    embedding,
+                    limit=1,
+                    filter=namespace,
+                    uuid_time_filter=client.UUIDTimeRange(
+                        start_date=datetime.now() - self.ttl
+                    ),
+                )
+        except Exception as e:
+            logging.warning(f"Error reading response cache: {str(e)}")
+            return None
+
+        if not results or results[0]["distance"] > self.threshold:
+            return None
+        logging.info(f"Response cache hit at distance {results[0]['distance']:.4f}")
+        return results[0]["metadata"]["payload"]
+
+    def store(self, namespace: Dict[str, str], text: str, payload: Dict[str, Any]) -> None:
+        """
+        Cache a payload for the text in the namespace. Errors are logged.
+
+        Args:
+            namespace: Metadata identifying the namespace, e.g. pipeline and category
+            text: The text the payload was generated for
+            payload: JSON-serializable data to cache
+        """
+        try:
+            embedding = self.vector_store.get_embedding(text)
+            self.vec_client.upsert(
+                [
+                    (
+                        client.uuid_from_time(datetime.now()),
+                        {**namespace, "payload": payload},
+                        text,
+                        embedding,
+                    )
+                ]
+            )
+        except Exception as e:
+            logging.warning(f"Error writing response cache: {str(e)}")
+
+    def store_response(
+        self,
+        namespace: Dict[str, str],
+        text: str,
+        response_model: BaseModel,
+        rag_context: List[str],
+    ) -> None:
+        """
+        Cache a generated response and its RAG context, or only the RAG
+        context in "rag_context" mode.
+
+        Args:
+            namespace: Metadata identifying the namespace, e.g. pipeline and category
+            text: The text the response was generated for
+            response_model: The generated response
+            rag_context: The retrieved knowledge base entries
+        """
+        payload = {"rag_context": rag_context}
+        if self.mode == "response":
+            payload["response_model"] = response_model.model_dump(mode="json")
+        self.store(namespace, text, payload)
+
+    def purge_expired(self) -> int:
+        """
+        Delete the entries older than the TTL.
+
+        Lookups already ignore expired entries; this keeps the table from
+        growing without bound.
+
+        Returns:
+            The number of deleted entries
+        """
+        query = sql.SQL("DELETE FROM {} WHERE uuid_timestamp(id) < %s").format(
+            sql.Identifier(self.table_name)
+        )
+        with self.vec_client.connect() as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, (datetime.now().astimezone() - self.ttl,))
+                return cur.rowcount
+
+    def invalidate(self, namespace: Optional[Dict[str, str]] = None) -> None:
+        """
+        Drop the cached entries of a namespace, or all entries.
+
+        Args:
+            namespace: Metadata of the entries to drop. Drops all entries if None.
+        """
+        if namespace:
+            self.vec_client.delete_by_metadata(namespace)
+        else:
+            self.vec_client.delete_all(drop_index=False)
+
+    def invalidate_categories(self, categories: Optional[Set[str]]) -> None:
+        """
+        Drop the entries that depend on changed knowledge base categories.
+
+        Called by the VectorStore after records are upserted or deleted.
+
+        Args:
+            categories: The changed categories, or None if unknown
+        """
+        try:
+            if categories is None:
+                self.invalidate()
+            else:
+                for category in categories:
+                    self.invalidate({"category": category})
+        except Exception as e:
+            logging.warning(f"Error invalidating response cache: {str(e)}")
+
+
+def create_response_cache(vector_store: VectorStore) -> Optional[SemanticResponseCache]:
+    """
+    Create a SemanticResponseCache from the settings, attached to a VectorStore.
+
+    Args:
+        vector_store: The VectorStore whose upserts and deletes invalidate the cache
+
+    Returns:
+        SemanticResponseCache: The cache, or None if the response cache is disabled.
+    """
+    vector_settings = get_settings().database.vector_store
+    if not vector_settings.response_cache_enabled:
+        return None
+    return SemanticResponseCache(
+        vector_store,
+        table_name=vector_settings.response_cache_table,
+        threshold=vector_settings.response_cache_threshold,
+        ttl=timedelta(seconds=vector_settings.response_cache_ttl),
+        mode=vector_settings.response_cache_mode,
+    )
+
+
+@lru_cache
+def get_response_cache() -> Optional[SemanticResponseCache]:
+    """
+    Get the process-wide SemanticResponseCache instance.
+
+    Returns:
+        SemanticResponseCache: The shared cache, or None if the response cache is disabled.
+    """
+    return create_response_cache(get_vector_store())
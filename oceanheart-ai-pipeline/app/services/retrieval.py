@@ -0,0 +1,150 @@
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Hashable, List, Optional, Sequence
+
+"""
+Retrieval Module
+
+This module provides the building blocks for search results and their ranking:
+lightweight search result records, weighted Reciprocal Rank Fusion to merge
+ranked result lists, and rerankers that rescore the fused candidates against
+the query.
+"""
+
+
+class SearchResult:
+    """A single vector search result.
+
+    A plain record with __slots__, which is much cheaper to build than a
+    DataFrame row for the handful of results a RAG lookup returns.
+
+    Attributes:
+        id: The record id
+        metadata: The record metadata
+        contents: The record text
+        distance: Distance between the record and the query embedding
+        embedding: The record embedding, or None if it was not fetched
+    """
+
+    __slots__ = ("id", "metadata", "contents", "distance", "embedding")
+
+    def __init__(
+        self,
+        id: Any,
+        metadata: Dict[str, Any],
+        contents: str,
+        distance: float,
+        embedding: Optional[List[float]] = None,
+    ):
+        self.id = id
+        self.metadata = metadata
+        self.contents = contents
+        self.distance = distance
+        self.embedding = embedding
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns the result as a dictionary, with the metadata expanded."""
+        result = {"id": str(self.id), "contents": self.contents}
+        if self.embedding is not None:
+            result["embedding"] = self.embedding
+        result["distance"] = self.distance
+        result.update(self.metadata or {})
+        return result
+
+    def __repr__(self) -> str:
+        return (
+            f"SearchResult(id={self.id!r}, distance={self.distance!r}, "
+            f"contents={self.contents[:50]!r})"
+        )
+
+
+def reciprocal_rank_fusion(
+    ranked_lists: Sequence[Sequence[Hashable]],
+    weights: Optional[Sequence[float]] = None,
+    k: int = 60,
+) -> Dict[Hashable, float]:
+    """Fuses ranked lists of ids with weighted Reciprocal Rank Fusion.
+
+    Each id scores weight / (k + rank) for every list it appears in, with
+    ranks starting at 1. Ids found by several searches rise to the top, and
+    the scores do not depend on the scale of each search's own scores.
+
+    Args:
+        ranked_lists: Lists of ids, each ordered from best to worst
+        weights: Weight of each list. Defaults to 1.0 for every list.
+        k: Rank offset that dampens the influence of the top ranks
+
+    Returns:
+        Mapping of id to fused score, ordered from best to worst
+    """
+    weights = weights or [1.0] * len(ranked_lists)
+    scores: Dict[Hashable, float] = {}
+    for ranked_ids, weight in zip(ranked_lists, weights):
+        for rank, item_id in enumerate(ranked_ids, start=1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+    return dict(sorted(scores.items(), key=lambda item: item[1], reverse=True))
+
+
+class Reranker(ABC):
+    """Abstract base class for rerankers."""
+
+    @abstractmethod
+    def score(self, query: str, documents: List[str]) -> List[float]:
+        """Scores how relevant each document is to the query.
+
+        Args:
+            query: The search query
+            documents: The candidate documents
+
+        Returns:
+            One score per document, higher is more relevant
+        """
+        pass
+
+
+class CrossEncoderReranker(Reranker):
+    """Reranker that scores query and document pairs with a local cross-encoder.
+
+    The model is loaded on first use. Requires the optional
+    sentence-transformers package.
+
+    Args:
+        model_name: Name or path of the cross-encoder model
+        device: Device to run the model on
+        batch_size: Number of pairs to score at a time
+    """
+
+    def __init__(
+        self,
+        model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+        device: str = "cpu",
+        batch_size: int = 32,
+    ):
+        self.model_name = model_name
+        self.device = device
+        self.batch_size = batch_size
+        self._model: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    try:
+                        from sentence_transformers import CrossEncoder
+                    except ImportError:
+                        raise ImportError(
+                            "Please install sentence-transformers: pip install sentence-transformers"
+                        )
+                    self._model = CrossEncoder(self.model_name, device=self.device)
+        return self._model
+
+    def score(self, query: str, documents: List[str]) -> List[float]:
+        if not documents:
+            return []
+        scores = self.model.predict(
+            [(query, document) for document in documents],
+            batch_size=self.batch_size,
+        )
+        return [float(score) for score in scores]
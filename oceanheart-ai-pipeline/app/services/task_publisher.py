@@ -0,0 +1,104 @@
+import base64
+import json
+import uuid
+from typing import Any, List, Optional, Tuple
+
+from kombu.serialization import dumps
+
+"""
+Task Publisher Module
+
+This module queues Celery tasks from asyncio code. celery_app.send_task() talks
+to the broker with a blocking client, so async endpoints would have to run it in
+a thread. Instead, the task message is built with Celery's own message protocol
+and pushed onto the queue's Redis list with the asyncio Redis client, which is
+what Kombu's Redis transport does for send_task().
+
+Only the Redis broker with the default queue and priority is supported.
+"""
+
+
+def build_task_message(
+    name: str, args: List[Any], task_id: Optional[str] = None
+) -> Tuple[str, str, str]:
+    """Builds the broker message for a task, as send_task() would.
+
+    Args:
+        name: Registered name of the task
+        args: Positional arguments of the task
+        task_id: Task ID to use. Defaults to a new UUID.
+
+    Returns:
+        Tuple of the task ID, the queue name and the serialized message
+    """
+    from config.celery_config import celery_app
+
+    task_id = task_id or str(uuid.uuid4())
+    queue = celery_app.conf.task_default_queue
+    message = celery_app.amqp.as_task_v2(task_id, name, args=args)
+    content_type, content_encoding, body = dumps(
+        message.body, serializer=celery_app.conf.task_serializer
+    )
+    if isinstance(body, str):
+        body = body.encode(content_encoding)
+    envelope = {
+        "body": base64.b64encode(body).decode("ascii"),
+        "content-encoding": content_encoding,
+        "content-type": content_type,
+        "headers": message.headers,
+        "properties": {
+            **message.properties,
+            "delivery_mode": 2,
+            "delivery_info": {"exchange": "", "routing_key": queue},
+            "priority": 0,
+            "body_encoding": "base64",
+            "delivery_tag": str(uuid.uuid4()),
+        },
+    }
+    return task_id, queue, json.dumps(envelope)
+
+
+async def apublish_task(name: str, args: List[Any], redis_client=None) -> str:
+    """Queues a Celery task without blocking the event loop.
+
+    Args:
+        name: Registered name of the task
+        args: Positional arguments of the task
+        redis_client: An asyncio Redis client for the broker. Defaults to
+            the shared asyncio client.
+
+    Returns:
+        The ID of the queued task
+    """
+    if redis_client is None:
+        from config.celery_config import get_async_redis_client
+
+        redis_client = get_async_redis_client()
+    task_id, queue, message = build_task_message(name, args)
+    await redis_client.lpush(queue, message)
+    return task_id
+
+
+async def apublish_tasks(
+    name: str, args_list: List[List[Any]], redis_client=None
+) -> List[str]:
+    """Queues many Celery tasks with a single Redis command.
+
+    Args:
+        name: Registered name of the tasks
+        args_list: Positional arguments of each task
+        redis_client: An asyncio Redis client for the broker. Defaults to
+            the shared asyncio client.
+
+    Returns:
+        The IDs of the queued tasks, in the order of args_list
+    """
+    if not args_list:
+        return []
+    if redis_client is None:
+        from config.celery_config import get_async_redis_client
+
+        redis_client = get_async_redis_client()
+    messages = [build_task_message(name, args) for args in args_list]
+    await redis_client.lpush(messages[0][1], *(message for _, _, message in messages))
+    return [task_id for task_id, _, _ in messages]
@@ -1,12 +1,43 @@
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Any, List, Optional, Tuple, Union
-
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import numpy as np
 import pandas as pd
-import psycopg2
+import psycopg2.errors
 from psycopg2.extras import RealDictCursor
 from config.settings import get_settings
 from openai import OpenAI
+from services.connection_pool import ConnectionPool, PooledSync
+from services.embedding_cache import (
+    EmbeddingCache,
+    create_embedding_cache,
+    embedding_key,
+    normalize_text,
+)
+from services.rate_limiter import get_rate_limiter
+from services.retrieval import (
+    CrossEncoderReranker,
+    Reranker,
+    SearchResult,
+    reciprocal_rank_fusion,
+)
 from timescale_vector import client
 from utils.timer import timer
 
@@ -21,66 +52,339 @@ The implementation uses the timescale-vector client for efficient vector operati
 and supports both exact and approximate nearest neighbor search through StreamingDiskANN.
 """
 
+_search_executor = ThreadPoolExecutor(thread_name_prefix="hybrid_search")
+
+T = TypeVar("T")
+
 
 class VectorStore:
     """A class for managing vector operations and database interactions."""
 
-    def __init__(self, local: bool = False):
+    def __init__(
+        self,
+        local: bool = False,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        reranker: Optional[Reranker] = None,
+    ):
         """
         Initialize the VectorStore with settings, OpenAI client, and Timescale Vector client.
 
         Args:
             local (bool): If True, overrides .env to use localhost DB for running outside Docker.
+            embedding_cache (EmbeddingCache, optional): Cache for query embeddings.
+                Defaults to the cache configured in the vector store settings.
+            reranker (Reranker, optional): Reranker for hybrid search.
+                Defaults to a local cross-encoder, loaded on first use.
         """
+        self._reranker = reranker
+        self._tsvector_column_exists = None
+        self._tsvector_checked_at = 0.0
+        self._invalidation_listeners = []
         self.settings = get_settings()
         self.openai_client = OpenAI(api_key=self.settings.llm.openai.api_key)
         self.embedding_model = self.settings.llm.openai.embedding_model
         self.vector_settings = self.settings.database.vector_store
+        self.embedding_cache = embedding_cache or create_embedding_cache(
+            self.vector_settings
+        )
         self.settings.database.local = local
-        self.vec_client = client.Sync(
+        self.pool = ConnectionPool(
+            self.settings.database.service_url,
+            min_size=self.vector_settings.pool_min_size,
+            max_size=self.vector_settings.pool_max_size,
+            timeout=self.vector_settings.pool_timeout,
+            health_check_interval=self.vector_settings.pool_health_check_interval,
+        )
+        self.vec_client = PooledSync(
+            self.pool,
             self.settings.database.service_url,
             self.vector_settings.table_name,
             self.vector_settings.embedding_dimensions,
             time_partition_interval=self.vector_settings.time_partition_interval,
         )
 
-    def create_keyword_search_index(self):
-        """Create a GIN index for keyword search if it doesn't exist."""
-        index_name = f"idx_{self.vector_settings.table_name}_contents_gin"
-        create_index_sql = f"""
-        CREATE INDEX IF NOT EXISTS {index_name}
-        ON {self.vector_settings.table_name} USING gin(to_tsvector('english', contents));
+    @property
+    def _prepared_statements(self) -> dict:
+        """SQL PREPARE commands for the statements run on pooled connections."""
+        document = self._keyword_document
+        return {
+            self._keyword_search_statement: f"""
+            PREPARE {self._keyword_search_statement} (text, integer) AS
+            SELECT id, contents, ts_rank_cd({document}, query) as rank
+            FROM {self.vector_settings.table_name}, websearch_to_tsquery('english', $1) query
+            WHERE {document} @@ query
+            ORDER BY rank DESC
+            LIMIT $2
+            """,
+        }
+
+    @property
+    def _keyword_search_statement(self) -> str:
+        """Name of the prepared keyword search for the current schema."""
+        if self._has_tsvector_column:
+            return "keyword_search_stored"
+        return "keyword_search"
+
+    @property
+    def _keyword_document(self) -> str:
+        """SQL for the document that keyword searches match against.
+
+        Uses the stored tsvector column once it exists, and falls back to
+        computing the tsvector from contents for tables that were not migrated.
         """
-        try:
-            with psycopg2.connect(self.settings.database.service_url) as conn:
+        if self._has_tsvector_column:
+            return self.vector_settings.tsvector_column
+        return "to_tsvector('english', contents)"
+
+    @property
+    def _has_tsvector_column(self) -> bool:
+        """Whether the table has the stored tsvector column.
+
+        The answer is cached for TSVECTOR_CHECK_INTERVAL seconds, so a column
+        added or dropped by another process is picked up without a restart.
+        """
+        if (
+            self._tsvector_column_exists is None
+            or time.monotonic() - self._tsvector_checked_at
+            > self.vector_settings.tsvector_check_interval
+        ):
+            with self.pool.connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(create_index_sql)
-                    conn.commit()
-                    logging.info(f"GIN index '{index_name}' created or already exists.")
+                    cur.execute(
+                        """
+                        SELECT 1 FROM information_schema.columns
+                        WHERE table_schema = current_schema()
+                        AND table_name = %s AND column_name = %s
+                        """,
+                        (
+                            self.vector_settings.table_name,
+                            self.vector_settings.tsvector_column,
+                        ),
+                    )
+                    self._tsvector_column_exists = cur.fetchone() is not None
+            self._tsvector_checked_at = time.monotonic()
+        return self._tsvector_column_exists
+
+    def _with_tsvector_recheck(self, search: Callable[[], T]) -> T:
+        """Runs a keyword search, retrying once if the tsvector column is gone.
+
+        Args:
+            search: Runs the search with the current _keyword_document
+
+        Returns:
+            The result of the search
+        """
+        try:
+            return search()
+        except psycopg2.errors.UndefinedColumn:
+            logging.warning("Keyword search failed, re-checking the tsvector column")
+            self._tsvector_column_exists = None
+            return search()
+
+    def close(self) -> None:
+        """Close all pooled database connections."""
+        self.pool.closeall()
+
+    def create_keyword_search_index(self, weighted: Optional[bool] = None):
+        """Create the stored tsvector column and its GIN index if they don't exist.
+
+        See migrate_keyword_search_column() for details. Errors are logged.
+        """
+        try:
+            self.migrate_keyword_search_column(weighted)
         except Exception as e:
             logging.error(f"Error while creating GIN index: {str(e)}")
 
+    def migrate_keyword_search_column(self, weighted: Optional[bool] = None) -> None:
+        """
+        Add a generated, stored tsvector column for keyword search and index it.
+
+        Keyword searches then rank the stored tsvector instead of tokenizing
+        contents for every candidate row. The column is recomputed by Postgres
+        whenever contents change.
+
+        With weighting, the question part of "Question: ... Answer: ..." contents
+        gets weight A and the answer part weight B, so ts_rank_cd ranks matches
+        in the question higher. Changing the weighting rebuilds the column.
+
+        The embeddings table is created by the Timescale Vector client rather
+        than Alembic, so this migration is run from the VectorStore. Adding the
+        column rewrites the table and locks it while doing so.
+
+        Args:
+            weighted: Whether to weight question text above answer text.
+                Defaults to the weighted_keyword_search setting.
+        """
+        if weighted is None:
+            weighted = self.vector_settings.weighted_keyword_search
+        table_name = self.vector_settings.table_name
+        column = self.vector_settings.tsvector_column
+        index_name = f"idx_{table_name}_{column}_gin"
+        legacy_index_name = f"idx_{table_name}_contents_gin"
+
+        with self.pool.connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT generation_expression FROM information_schema.columns
+                    WHERE table_schema = current_schema()
+                    AND table_name = %s AND column_name = %s
+                    """,
+                    (table_name, column),
+                )
+                row = cur.fetchone()
+                if row is not None and ("setweight" in (row[0] or "")) != weighted:
+                    logging.info(f"Rebuilding '{column}' with weighted={weighted}")
+                    cur.execute(f"ALTER TABLE {table_name} DROP COLUMN {column}")
+                    row = None
+                if row is None:
+                    cur.execute(
+                        f"""
+                        ALTER TABLE {table_name} ADD COLUMN {column} tsvector
+                        GENERATED ALWAYS AS ({self._tsvector_expression(weighted)}) STORED
+                        """
+                    )
+                cur.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} USING gin({column})"
+                )
+                cur.execute(f"DROP INDEX IF EXISTS {legacy_index_name}")
+        self._tsvector_column_exists = True
+        self._tsvector_checked_at = time.monotonic()
+        logging.info(f"GIN index '{index_name}' on '{column}' created or already exists.")
+
+    @staticmethod
+    def _tsvector_expression(weighted: bool) -> str:
+        """SQL expression for the stored tsvector column."""
+        if not weighted:
+            return "to_tsvector('english', contents)"
+        return (
+            "setweight(to_tsvector('english', coalesce(substring(contents from "
+            "'^Question:(.*?)Answer:'), '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(substring(contents from "
+            "'Answer:(.*)$'), contents)), 'B')"
+        )
+
     def get_embedding(self, text: str) -> List[float]:
         """
         Generate embedding for the given text.
 
+        The text is normalized first, and embeddings are looked up in and
+        stored to the embedding cache, if one is configured.
+
         Args:
             text: The input text to generate an embedding for.
 
         Returns:
             A list of floats representing the embedding.
         """
-        text = text.replace("\n", " ")
+        text = normalize_text(text)
+        if self.embedding_cache is not None:
+            key = embedding_key(self.embedding_model, text)
+            embedding = self.embedding_cache.get(key)
+            if embedding is not None:
+                return embedding
+
         with timer("Embedding generation"):
-            embedding = (
-                self.openai_client.embeddings.create(
-                    input=[text],
-                    model=self.embedding_model,
+            embedding = self._create_embeddings([text])[0]
+        if self.embedding_cache is not None:
+            self.embedding_cache.set(key, embedding)
+        return embedding
+
+    def get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """
+        Generate embeddings for many texts with as few API requests as possible.
+
+        Texts are normalized and looked up in the embedding cache first. The
+        remaining unique texts are split into requests of at most
+        embedding_batch_size texts and roughly embedding_batch_tokens tokens,
+        which are sent concurrently.
+
+        Args:
+            texts: The input texts to generate embeddings for.
+
+        Returns:
+            A list of embeddings, in the same order as the texts.
+        """
+        texts = [normalize_text(text) for text in texts]
+        embeddings: Dict[str, List[float]] = {}
+        missing = []
+        for text in dict.fromkeys(texts):
+            embedding = None
+            if self.embedding_cache is not None:
+                embedding = self.embedding_cache.get(
+                    embedding_key(self.embedding_model, text)
                 )
-                .data[0]
-                .embedding
+            if embedding is None:
+                missing.append(text)
+            else:
+                embeddings[text] = embedding
+
+        if missing:
+            batches = list(self._batch_texts(missing))
+            with timer(f"Embedding generation for {len(missing)} texts"):
+                with ThreadPoolExecutor(
+                    max_workers=self.vector_settings.embedding_concurrency
+                ) as executor:
+                    for batch, batch_embeddings in zip(
+                        batches, executor.map(self._create_embeddings, batches)
+                    ):
+                        for text, embedding in zip(batch, batch_embeddings):
+                            embeddings[text] = embedding
+                            if self.embedding_cache is not None:
+                                self.embedding_cache.set(
+                                    embedding_key(self.embedding_model, text), embedding
+                                )
+
+        return [embeddings[text] for text in texts]
+
+    def _batch_texts(self, texts: List[str]) -> Iterator[List[str]]:
+        """
+        Split texts into batches that respect the request size and token limits.
+
+        Tokens are estimated as one per four characters, which is close enough
+        for English text to stay well below the API's per-request limit.
+        """
+        batch = []
+        batch_tokens = 0
+        for text in texts:
+            tokens = len(text) // 4 + 1
+            if batch and (
+                len(batch) >= self.vector_settings.embedding_batch_size
+                or batch_tokens + tokens > self.vector_settings.embedding_batch_tokens
+            ):
+                yield batch
+                batch = []
+                batch_tokens = 0
+            batch.append(text)
+            batch_tokens += tokens
+        if batch:
+            yield batch
+
+    def _create_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Request embeddings for one batch of texts, within the embedding
+        model's rate limits if any are configured."""
+        openai_settings = self.settings.llm.openai
+        rpm = openai_settings.embedding_rpm_limit
+        tpm = openai_settings.embedding_tpm_limit
+        if not (rpm or tpm):
+            response = self.openai_client.embeddings.create(
+                input=texts,
+                model=self.embedding_model,
             )
-        return embedding
+        else:
+            with get_rate_limiter().limit(
+                "openai",
+                self.embedding_model,
+                sum(len(text) // 4 + 1 for text in texts),
+                rpm=rpm,
+                tpm=tpm,
+            ) as reservation:
+                response = self.openai_client.embeddings.create(
+                    input=texts,
+                    model=self.embedding_model,
+                )
+                reservation.record_usage(response.usage)
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
 
     def create_tables(self) -> None:
         """Create the necessary tablesin the database"""
@@ -102,12 +406,44 @@ class VectorStore:
             df: A pandas DataFrame containing the data to insert or update.
                 Expected columns: id, metadata, contents, embedding
         """
-        records = df.to_records(index=False)
-        self.vec_client.upsert(list(records))
+        self.upsert_records(list(df.to_records(index=False)))
+
+    def upsert_records(self, records: Iterable[Tuple[Any, ...]]) -> None:
+        """
+        Insert or update records in the database.
+
+        Args:
+            records: Tuples of (id, metadata, contents, embedding).
+        """
+        records = list(records)
+        self.vec_client.upsert(records)
         logging.info(
-            f"Inserted {len(df)} records into {self.vector_settings.table_name}"
+            f"Inserted {len(records)} records into {self.vector_settings.table_name}"
+        )
+        self._notify_invalidation_listeners(
+            {record[1].get("category") for record in records}
         )
 
+    def add_invalidation_listener(
+        self, listener: Callable[[Optional[Set[str]]], None]
+    ) -> None:
+        """
+        Register a function to call when records are upserted or deleted.
+
+        Caches derived from the knowledge base use this to drop stale entries.
+
+        Args:
+            listener: Called with the set of changed metadata categories,
+                or None if the changed categories are unknown.
+        """
+        self._invalidation_listeners.append(listener)
+
+    def _notify_invalidation_listeners(self, categories: Optional[Set[str]]) -> None:
+        if categories is not None and None in categories:
+            categories = None
+        for listener in self._invalidation_listeners:
+            listener(categories)
+
     def semantic_search(
         self,
         query: str,
@@ -115,8 +451,9 @@ class VectorStore:
         metadata_filter: Union[dict, List[dict]] = None,
         predicates: Optional[client.Predicates] = None,
         time_range: Optional[Tuple[datetime, datetime]] = None,
-        return_dataframe: bool = True,
-    ) -> Union[List[Tuple[Any, ...]], pd.DataFrame]:
+        return_dataframe: bool = False,
+        include_embedding: bool = False,
+    ) -> Union[List[SearchResult], pd.DataFrame]:
         """
         Query the vector database for similar embeddings based on input text.
 
@@ -133,10 +470,11 @@ class VectorStore:
                 - & is used to combine multiple predicates with AND operator.
                 - | is used to combine multiple predicates with OR operator.
             time_range: A tuple of (start_date, end_date) to filter results by time.
-            return_dataframe: Whether to return results as a DataFrame (default: True).
+            return_dataframe: Whether to return results as a DataFrame (default: False).
+            include_embedding: Whether to fetch the embedding of each result (default: False).
 
         Returns:
-            Either a list of tuples or a pandas DataFrame containing the search results.
+            Either a list of SearchResult records or a pandas DataFrame containing the search results.
 
         Basic Examples:
             Basic search:
@@ -158,22 +496,32 @@ class VectorStore:
         """
         query_embedding = self.get_embedding(query)
 
-        search_args = {
-            "limit": limit,
-        }
-
-        if metadata_filter:
-            search_args["filter"] = metadata_filter
-
-        if predicates:
-            search_args["predicates"] = predicates
-
-        if time_range:
-            start_date, end_date = time_range
-            search_args["uuid_time_filter"] = client.UUIDTimeRange(start_date, end_date)
+        params = [np.array(query_embedding), limit]
+        where, params = self._where_clause(params, metadata_filter, predicates, time_range)
+        embedding_column = "embedding" if include_embedding else "NULL"
+        search_sql = f"""
+        SELECT id, metadata, contents, {embedding_column},
+            embedding {self.vec_client.builder.distance_type} $1 AS distance
+        FROM {self.vec_client.builder._quoted_table_name()}
+        WHERE {where}
+        ORDER BY distance
+        LIMIT $2
+        """
 
         with timer("Vector search"):
-            results = self.vec_client.search(query_embedding, **search_args)
+            with self.vec_client.connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(*self._to_pyformat(search_sql, params))
+                    results = [
+                        SearchResult(
+                            id=row[0],
+                            metadata=row[1],
+                            contents=row[2],
+                            distance=row[4],
+                            embedding=row[3],
+                        )
+                        for row in cur.fetchall()
+                    ]
 
         if return_dataframe:
             return self._create_dataframe_from_results(results)
@@ -182,31 +530,56 @@ class VectorStore:
 
     def _create_dataframe_from_results(
         self,
-        results: List[Tuple[Any, ...]],
+        results: List[SearchResult],
     ) -> pd.DataFrame:
         """
         Create a pandas DataFrame from the search results.
 
         Args:
-            results: A list of tuples containing the search results.
+            results: A list of SearchResult records.
 
         Returns:
-            A pandas DataFrame containing the formatted search results.
+            A pandas DataFrame containing the formatted search results,
+            with one column per metadata key.
         """
-        # Convert results to DataFrame
-        df = pd.DataFrame(
-            results, columns=["id", "metadata", "contents", "embedding", "distance"]
-        )
+        if not results:
+            return pd.DataFrame(columns=["id", "contents", "distance"])
+        return pd.DataFrame([result.to_dict() for result in results])
 
-        # Expand metadata column
-        df = pd.concat(
-            [df.drop(["metadata"], axis=1), df["metadata"].apply(pd.Series)], axis=1
-        )
+    def _where_clause(
+        self,
+        params: List[Any],
+        metadata_filter: Union[dict, List[dict]] = None,
+        predicates: Optional[client.Predicates] = None,
+        time_range: Optional[Tuple[datetime, datetime]] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Build a WHERE clause with $n placeholders numbered after params."""
+        where_clauses = []
+        if metadata_filter:
+            where_filter, params = self.vec_client.builder._where_clause_for_filter(
+                params, metadata_filter
+            )
+            where_clauses.append(where_filter)
+        if predicates:
+            where_predicates, params = predicates.build_query(params)
+            where_clauses.append(where_predicates)
+        if time_range:
+            start_date, end_date = time_range
+            where_time, params = client.UUIDTimeRange(start_date, end_date).build_query(
+                params
+            )
+            where_clauses.append(where_time)
+        return " AND ".join(where_clauses) or "TRUE", params
 
-        # Convert id to string for better readability
-        df["id"] = df["id"].astype(str)
+    @staticmethod
+    def _to_pyformat(sql: str, params: List[Any]) -> Tuple[str, Dict[str, Any]]:
+        """Translate $n placeholders for psycopg2.
 
-        return df
+        The Timescale Vector client's own translation breaks on $10 and above,
+        which filters easily reach.
+        """
+        sql = re.sub(r"\$(\d+)", r"%(\1)s", sql)
+        return sql, {str(index): param for index, param in enumerate(params, start=1)}
 
     def delete(
         self,
@@ -253,6 +626,11 @@ class VectorStore:
                 f"Deleted records matching metadata filter from {self.vector_settings.table_name}"
             )
 
+        if isinstance(metadata_filter, dict) and "category" in metadata_filter:
+            self._notify_invalidation_listeners({metadata_filter["category"]})
+        else:
+            self._notify_invalidation_listeners(None)
+
     def keyword_search(
         self, query: str, limit: int = 5, return_dataframe: bool = True
     ) -> Union[List[Tuple[str, str, float]], pd.DataFrame]:
@@ -271,20 +649,17 @@ class VectorStore:
         Example:
             results = vector_store.keyword_search("shipping options")
         """
-        search_sql = f"""
-        SELECT id, contents, ts_rank_cd(to_tsvector('english', contents), query) as rank
-        FROM {self.vector_settings.table_name}, websearch_to_tsquery('english', %s) query
-        WHERE to_tsvector('english', contents) @@ query
-        ORDER BY rank DESC
-        LIMIT %s
-        """
 
-        with timer("Keyword search"):
-            # Create a new connection using psycopg2
-            with psycopg2.connect(self.settings.database.service_url) as conn:
+        def search() -> List[dict]:
+            with self.pool.connection() as conn:
+                statement = self._keyword_search_statement
+                ConnectionPool.prepare(conn, self._prepared_statements, statement)
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute(search_sql, (query, limit))
-                    results = cur.fetchall()
+                    cur.execute(f"EXECUTE {statement} (%s, %s)", (query, limit))
+                    return cur.fetchall()
+
+        with timer("Keyword search"):
+            results = self._with_tsvector_recheck(search)
 
         if return_dataframe:
             if not results:
@@ -302,49 +677,258 @@ class VectorStore:
         semantic_k: int = 5,
         rerank: bool = False,
         top_n: int = 5,
+        keyword_weight: float = 1.0,
+        semantic_weight: float = 1.0,
+        rrf_k: int = 60,
+        candidate_budget: int = 20,
+        reranker: Optional[Reranker] = None,
     ) -> pd.DataFrame:
         """
         Perform a hybrid search combining keyword and semantic search results,
-        with optional reranking using Cohere.
+        with optional reranking.
+
+        Both searches run concurrently and their results are fused with weighted
+        Reciprocal Rank Fusion. With rerank=True, the best candidate_budget fused
+        results are rescored by the reranker and the top_n are returned.
 
         Args:
             query: The search query string.
             keyword_k: The number of results to return from keyword search. Defaults to 5.
             semantic_k: The number of results to return from semantic search. Defaults to 5.
-            rerank: Whether to apply Cohere reranking. Defaults to True.
+            rerank: Whether to apply reranking. Defaults to False.
             top_n: The number of top results to return after reranking. Defaults to 5.
+            keyword_weight: Weight of the keyword ranking in the fusion. Defaults to 1.0.
+            semantic_weight: Weight of the semantic ranking in the fusion. Defaults to 1.0.
+            rrf_k: Rank offset of Reciprocal Rank Fusion. Defaults to 60.
+            candidate_budget: The maximum number of fused results to rerank. Defaults to 20.
+            reranker: The reranker to use. Defaults to the VectorStore's reranker.
 
         Returns:
-            A pandas DataFrame containing the combined search results with a 'search_type' column.
+            A pandas DataFrame containing the fused search results, best first, with
+            'search_type' and 'rrf_score' columns, and a 'rerank_score' column if reranked.
 
         Example:
             results = vector_store.hybrid_search("shipping options", keyword_k=3, semantic_k=3, rerank=True, top_n=5)
         """
-        # Perform keyword search
-        keyword_results = self.keyword_search(
-            query, limit=keyword_k, return_dataframe=True
+        # Run the keyword search in the background while the semantic search runs here
+        keyword_future = _search_executor.submit(
+            self.keyword_search, query, limit=keyword_k, return_dataframe=False
         )
-        keyword_results["search_type"] = "keyword"
-        keyword_results = keyword_results[["id", "contents", "search_type"]]
-
-        # Perform semantic search
         semantic_results = self.semantic_search(
-            query, limit=semantic_k, return_dataframe=True
+            query, limit=semantic_k, return_dataframe=False
         )
-        semantic_results["search_type"] = "semantic"
-        semantic_results = semantic_results[["id", "contents", "search_type"]]
-
-        # Combine results
-        combined_results = pd.concat(
-            [keyword_results, semantic_results], ignore_index=True
+        keyword_results = keyword_future.result()
+
+        keyword_ids = [str(result[0]) for result in keyword_results]
+        semantic_ids = [str(result.id) for result in semantic_results]
+        contents = {}
+        search_types = {}
+        for doc_id, result in zip(keyword_ids, keyword_results):
+            contents[doc_id] = result[1]
+            search_types[doc_id] = "keyword"
+        for doc_id, result in zip(semantic_ids, semantic_results):
+            contents.setdefault(doc_id, result.contents)
+            search_types[doc_id] = "both" if doc_id in search_types else "semantic"
+
+        fused = reciprocal_rank_fusion(
+            [keyword_ids, semantic_ids],
+            weights=[keyword_weight, semantic_weight],
+            k=rrf_k,
         )
 
-        # Remove duplicates, keeping the first occurrence (which maintains the original order)
-        combined_results = combined_results.drop_duplicates(subset=["id"], keep="first")
+        combined_results = pd.DataFrame(
+            {
+                "id": list(fused),
+                "contents": [contents[doc_id] for doc_id in fused],
+                "search_type": [search_types[doc_id] for doc_id in fused],
+                "rrf_score": list(fused.values()),
+            },
+            columns=["id", "contents", "search_type", "rrf_score"],
+        )
 
         if rerank:
-            logging.warning("Reranking is not implemented yet.")
-            if top_n < len(combined_results):
-                return combined_results.head(top_n)
+            reranker = reranker or self.reranker
+            candidates = combined_results.head(candidate_budget).copy()
+            with timer("Reranking"):
+                candidates["rerank_score"] = reranker.score(
+                    query, candidates["contents"].tolist()
+                )
+            return (
+                candidates.sort_values("rerank_score", ascending=False)
+                .head(top_n)
+                .reset_index(drop=True)
+            )
 
         return combined_results
+
+    def hybrid_search_sql(
+        self,
+        query: str,
+        limit: int = 5,
+        keyword_k: int = 20,
+        semantic_k: int = 20,
+        keyword_weight: float = 1.0,
+        semantic_weight: float = 1.0,
+        rrf_k: int = 60,
+        metadata_filter: Union[dict, List[dict]] = None,
+        predicates: Optional[client.Predicates] = None,
+        time_range: Optional[Tuple[datetime, datetime]] = None,
+        return_dataframe: bool = False,
+    ) -> Union[List[Tuple[Any, ...]], pd.DataFrame]:
+        """
+        Perform a hybrid search in a single SQL statement.
+
+        The keyword ranking (ts_rank_cd), the vector ranking (distance operator)
+        and their weighted Reciprocal Rank Fusion are all computed by Postgres in
+        one query, so the GIN and DiskANN indexes are used in one plan and only
+        the fused top results are returned. Filters are applied to both rankings.
+
+        Args:
+            query: The search query string.
+            limit: The number of fused results to return. Defaults to 5.
+            keyword_k: The number of keyword matches to fuse. Defaults to 20.
+            semantic_k: The number of nearest neighbors to fuse. Defaults to 20.
+            keyword_weight: Weight of the keyword ranking. Defaults to 1.0.
+            semantic_weight: Weight of the semantic ranking. Defaults to 1.0.
+            rrf_k: Rank offset of Reciprocal Rank Fusion. Defaults to 60.
+            metadata_filter: A dictionary or list of dictionaries for equality-based metadata filtering.
+            predicates: A Predicates object for complex metadata filtering.
+            time_range: A tuple of (start_date, end_date) to filter results by time.
+            return_dataframe: Whether to return results as a DataFrame (default: False).
+
+        Returns:
+            Either a list of tuples (id, metadata, contents, search_type, rrf_score)
+            or a pandas DataFrame containing the fused search results, best first.
+
+        Example:
+            results = vector_store.hybrid_search_sql("shipping options", metadata_filter={"category": "customer"})
+        """
+        query_embedding = self.get_embedding(query)
+
+        def search() -> List[Tuple[Any, ...]]:
+            search_sql, params = self._hybrid_search_query(
+                query,
+                query_embedding,
+                limit=limit,
+                keyword_k=keyword_k,
+                semantic_k=semantic_k,
+                keyword_weight=keyword_weight,
+                semantic_weight=semantic_weight,
+                rrf_k=rrf_k,
+                metadata_filter=metadata_filter,
+                predicates=predicates,
+                time_range=time_range,
+            )
+            with self.vec_client.connect() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(*self._to_pyformat(search_sql, params))
+                    return [tuple(row) for row in cur.fetchall()]
+
+        with timer("Hybrid SQL search"):
+            results = self._with_tsvector_recheck(search)
+
+        if return_dataframe:
+            df = pd.DataFrame(
+                results,
+                columns=["id", "metadata", "contents", "search_type", "rrf_score"],
+            )
+            df["id"] = df["id"].astype(str)
+            return df
+        return results
+
+    def _hybrid_search_query(
+        self,
+        query: str,
+        query_embedding: List[float],
+        limit: int,
+        keyword_k: int,
+        semantic_k: int,
+        keyword_weight: float,
+        semantic_weight: float,
+        rrf_k: int,
+        metadata_filter: Union[dict, List[dict]] = None,
+        predicates: Optional[client.Predicates] = None,
+        time_range: Optional[Tuple[datetime, datetime]] = None,
+    ) -> Tuple[str, List[Any]]:
+        """Build the hybrid search SQL with $n placeholders and its parameters."""
+        builder = self.vec_client.builder
+        params = [
+            query,
+            keyword_k,
+            np.array(query_embedding),
+            semantic_k,
+            keyword_weight,
+            semantic_weight,
+            rrf_k,
+            limit,
+        ]
+        where, params = self._where_clause(params, metadata_filter, predicates, time_range)
+        table_name = builder._quoted_table_name()
+        document = self._keyword_document
+
+        search_sql = f"""
+        WITH keyword AS (
+            SELECT id, row_number() OVER (ORDER BY score DESC) AS rank
+            FROM (
+                SELECT id, ts_rank_cd({document}, query) AS score
+                FROM {table_name}, websearch_to_tsquery('english', $1) query
+                WHERE {document} @@ query AND {where}
+                ORDER BY score DESC
+                LIMIT $2
+            ) keyword_matches
+        ),
+        semantic AS (
+            SELECT id, row_number() OVER (ORDER BY distance) AS rank
+            FROM (
+                SELECT id, embedding {builder.distance_type} $3 AS distance
+                FROM {table_name}
+                WHERE {where}
+                ORDER BY distance
+                LIMIT $4
+            ) semantic_matches
+        ),
+        fused AS (
+            SELECT
+                COALESCE(keyword.id, semantic.id) AS id,
+                CASE
+                    WHEN keyword.id IS NOT NULL AND semantic.id IS NOT NULL THEN 'both'
+                    WHEN keyword.id IS NOT NULL THEN 'keyword'
+                    ELSE 'semantic'
+                END AS search_type,
+                COALESCE($5::float8 / ($7 + keyword.rank), 0)
+                    + COALESCE($6::float8 / ($7 + semantic.rank), 0) AS rrf_score
+            FROM keyword FULL OUTER JOIN semantic ON keyword.id = semantic.id
+        )
+        SELECT t.id, t.metadata, t.contents, fused.search_type, fused.rrf_score
+        FROM fused JOIN {table_name} t ON t.id = fused.id
+        ORDER BY fused.rrf_score DESC
+        LIMIT $8
+        """
+        return search_sql, params
+
+    @property
+    def reranker(self) -> Reranker:
+        """The default reranker, created on first use."""
+        if self._reranker is None:
+            self._reranker = CrossEncoderReranker(
+                model_name=self.vector_settings.reranker_model,
+                device=self.vector_settings.reranker_device,
+            )
+        return self._reranker
+
+
+@lru_cache
+def get_vector_store(local: bool = False) -> VectorStore:
+    """
+    Get the process-wide VectorStore instance.
+
+    Nodes share this instance so the OpenAI and Timescale Vector clients are
+    created once per process instead of once per node.
+
+    Args:
+        local (bool): If True, overrides .env to use localhost DB for running outside Docker.
+
+    Returns:
+        VectorStore: The shared VectorStore instance.
+    """
+    return VectorStore(local=local)
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+)
+
+"""
+Write-Behind Buffer Module
+
+This module groups concurrent writes into batches. Callers submit items and
+wait; the buffer collects items for a short delay, or until it holds a full
+batch, and writes them all with one call to its flush function. With one
+commit per batch instead of one per item, write throughput scales with the
+batch size rather than with the database's commit latency.
+
+Callers only get their result once the flush that wrote their item succeeded,
+so a result still means the item is written. If a flush fails, every caller of
+that batch gets the error.
+"""
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class WriteBehindBuffer(Generic[T, R]):
+    """Collects submitted items and flushes them in batches.
+
+    A batch is flushed max_delay seconds after its first item was submitted,
+    or as soon as it holds max_size items. Flushes run concurrently with the
+    collection of the next batch. Use one buffer per event loop.
+
+    Args:
+        flush: Coroutine function that writes a batch of items and returns
+            one result per item, in order
+        max_size: Maximum number of items per batch
+        max_delay: Seconds to wait for more items before flushing
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[List[T]], Awaitable[List[R]]],
+        max_size: int = 100,
+        max_delay: float = 0.005,
+    ):
+        self.flush = flush
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.flushes = 0
+        self.flushed_items = 0
+        self._items: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    async def submit(self, item: T) -> R:
+        """Adds an item to the current batch and waits until it is flushed.
+
+        Cancelling the caller does not remove the item from its batch.
+
+        Args:
+            item: The item to write
+
+        Returns:
+            The flush function's result for the item
+
+        Raises:
+            Exception: The error of the flush that wrote the batch
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append((item, future))
+        if len(self._items) >= self.max_size:
+            self._start_flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_delay, self._start_flush)
+        return await asyncio.shield(future)
+
+    def _start_flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, self._items = self._items, []
+        if not items:
+            return
+        task = asyncio.create_task(self._flush(items))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _flush(self, items: List[Tuple[T, asyncio.Future]]) -> None:
+        try:
+            results = await self.flush([item for item, _ in items])
+        except Exception as e:
+            logging.error(f"Error flushing {len(items)} buffered items: {str(e)}")
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.flushes += 1
+        self.flushed_items += len(items)
+        for (_, future), result in zip(items, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def close(self) -> None:
+        """Flushes the current batch and waits for all running flushes."""
+        self._start_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Returns the number of flushes and the average batch size."""
+        return {
+            "flushes": self.flushes,
+            "flushed_items": self.flushed_items,
+            "average_batch_size": (
+                self.flushed_items / self.flushes if self.flushes else 0.0
+            ),
+            "pending": len(self._items),
+        }
@@ -1,21 +1,67 @@
+import asyncio
+import logging
+from collections import defaultdict
 from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import UUID
 
+from celery.signals import worker_process_init, worker_process_shutdown
 from api.dependencies import db_session
 from api.event_schema import EventSchema
 from config.celery_config import celery_app
-from database.event import Event
-from database.repository import GenericRepository
+from config.settings import get_settings
+from database.event_partitioning import enforce_retention
+from database.event_repository import EventRepository
+from database.session import engine
 from pipelines.registry import PipelineRegistry
+from services.llm_factory import LLMFactory
+from services.partial_results import publish_done
+from services.pending_events import get_pending_event_queue
+from services.response_cache import get_response_cache
 
 """
 Pipeline Task Processing Module
 
 This module handles asynchronous processing of pipeline events using Celery.
 It manages the lifecycle of event processing from database retrieval through
-pipeline execution and result storage.
+pipeline execution and result storage, either one event per task or in batches
+that share a single database fetch and update.
 """
 
 
+@worker_process_init.connect
+def warm_up_pipelines(**kwargs):
+    """Builds and caches all registered pipelines when a worker process starts.
+
+    Failures are logged rather than raised so the worker still starts; the
+    pipeline is then built lazily on the first event that needs it.
+    """
+    try:
+        PipelineRegistry.warm_up()
+    except Exception as e:
+        logging.error(f"Error while warming up pipelines: {str(e)}")
+
+
+@worker_process_init.connect
+def warm_up_llm_clients(**kwargs):
+    """Creates the pooled LLM provider clients when a worker process starts.
+
+    Failures are logged rather than raised so the worker still starts; the
+    clients are then created on the first completion that needs them.
+    """
+    try:
+        LLMFactory.warm_up(get_settings().llm.provider_order)
+    except Exception as e:
+        logging.error(f"Error while creating LLM clients: {str(e)}")
+
+
+@worker_process_shutdown.connect
+def close_llm_clients(**kwargs):
+    """Closes the pooled LLM provider clients when a worker process exits."""
+    LLMFactory.close_all()
+
+
 @celery_app.task(name="process_incoming_event")
 def process_incoming_event(event_id: str):
     """Processes an incoming event through its designated pipeline.
@@ -31,7 +77,7 @@ def process_incoming_event(event_id: str):
     """
     with contextmanager(db_session)() as session:
         # Initialize repository for database operations
-        repository = GenericRepository(session=session, model=Event)
+        repository = EventRepository(session=session)
 
         # Retrieve event from database
         db_event = repository.get(id=event_id)
@@ -43,8 +89,192 @@ def process_incoming_event(event_id: str):
         pipeline = PipelineRegistry.get_pipeline(event)
 
         # Execute pipeline and store results
-        task_context = pipeline.run(event).model_dump(mode="json")
+        try:
+            task_context = pipeline.run(event).model_dump(mode="json")
+        except Exception:
+            publish_done(event.ticket_id, "failed")
+            raise
+        publish_done(event.ticket_id, "completed")
         db_event.task_context = task_context
 
         # Update event with processing results
         repository.update(obj=db_event)
+
+
+@celery_app.task(name="process_incoming_events")
+def process_incoming_events(event_ids: List[str]) -> Dict[str, List[str]]:
+    """Processes a batch of events through their designated pipelines.
+
+    This Celery task handles many events at once by:
+    1. Retrieving all events from the database in one query
+    2. Grouping the events by pipeline type
+    3. Executing all pipelines concurrently on one event loop
+    4. Storing all results in one bulk update
+
+    A failing event does not fail the batch. It is logged, left without a
+    task_context, and reported in the returned "failed" list.
+
+    Args:
+        event_ids: Unique identifiers of the events to process
+
+    Returns:
+        Dictionary with the ids of the "processed" and "failed" events
+    """
+    with contextmanager(db_session)() as session:
+        repository = EventRepository(session=session)
+
+        # Retrieve all events in a single query
+        db_events = repository.get_many(ids=[UUID(event_id) for event_id in event_ids])
+        found_ids = {str(db_event.id) for db_event in db_events}
+        for missing_id in set(event_ids) - found_ids:
+            logging.error(f"Event with id {missing_id} not found")
+
+        # Convert to schemas and group them by pipeline type
+        batches = defaultdict(list)
+        for db_event in db_events:
+            event = EventSchema(**db_event.data)
+            pipeline_type = PipelineRegistry.get_pipeline_type(event)
+            batches[pipeline_type].append((str(db_event.id), event))
+
+        # Execute all pipelines concurrently
+        results = asyncio.run(_run_batches(batches))
+
+        # Store all results in one bulk update. created_at is part of the
+        # primary key and lets Postgres skip the other chunks of the table.
+        now = datetime.now()
+        created_at = {str(db_event.id): db_event.created_at for db_event in db_events}
+        repository.bulk_update(
+            mappings=[
+                {
+                    "id": UUID(event_id),
+                    "created_at": created_at[event_id],
+                    "task_context": task_context,
+                    "updated_at": now,
+                }
+                for event_id, task_context in results.items()
+                if task_context is not None
+            ]
+        )
+
+    failed = [event_id for event_id, result in results.items() if result is None]
+    failed.extend(set(event_ids) - found_ids)
+    return {
+        "processed": [
+            event_id for event_id, result in results.items() if result is not None
+        ],
+        "failed": failed,
+    }
+
+
+@celery_app.task(name="drain_pending_events")
+def drain_pending_events(batch_size: Optional[int] = None) -> Dict[str, List[str]]:
+    """Takes up to batch_size queued event ids and processes them as a batch.
+
+    Event ids are queued on a Redis list by the API when event batching is
+    enabled. This task is scheduled by Celery beat. The ids stay claimed until
+    the batch is committed; failed events are requeued for another attempt.
+
+    Args:
+        batch_size: Maximum number of events to take. Defaults to the
+            configured worker batch size.
+
+    Returns:
+        Dictionary with the ids of the "processed" and "failed" events
+    """
+    worker_settings = get_settings().worker
+    batch_size = batch_size or worker_settings.batch_size
+    pending_events = get_pending_event_queue()
+    claim, event_ids = pending_events.claim(batch_size)
+    if not event_ids:
+        return {"processed": [], "failed": []}
+    try:
+        result = process_incoming_events(event_ids)
+    except Exception:
+        pending_events.release(claim, failed=event_ids)
+        raise
+    pending_events.release(claim, failed=result["failed"])
+    return result
+
+
+@celery_app.task(name="enforce_event_retention")
+def enforce_event_retention() -> List[str]:
+    """Archives and drops the event chunks older than the retention period.
+
+    This task is scheduled by Celery beat when EVENTS_RETENTION_DAYS is set.
+
+    Returns:
+        Names of the dropped chunks
+    """
+    return enforce_retention(engine)
+
+
+@celery_app.task(name="purge_response_cache")
+def purge_response_cache() -> int:
+    """Deletes the expired entries of the semantic response cache.
+
+    This task is scheduled by Celery beat when the response cache is enabled.
+
+    Returns:
+        The number of deleted entries
+    """
+    response_cache = get_response_cache()
+    if response_cache is None:
+        return 0
+    return response_cache.purge_expired()
+
+
+async def _run_batches(batches: Dict[str, list]) -> Dict[str, Optional[dict]]:
+    """Runs every event of every pipeline batch concurrently.
+
+    Args:
+        batches: Mapping of pipeline type to (event id, event) pairs
+
+    Returns:
+        Mapping of event id to the serialized task context, or None if the
+        pipeline failed for that event
+    """
+    event_ids = []
+    runs = []
+    results = {}
+    for pipeline_type, events in batches.items():
+        try:
+            pipeline = PipelineRegistry.get_pipeline_by_type(pipeline_type)
+        except ValueError as e:
+            logging.error(f"Skipping {len(events)} events: {str(e)}")
+            results.update({event_id: None for event_id, _ in events})
+            continue
+        logging.info(f"Processing {len(events)} events with {pipeline_type}")
+        for event_id, event in events:
+            event_ids.append(event_id)
+            runs.append(_arun_pipeline(pipeline, event))
+
+    try:
+        outcomes = await asyncio.gather(*runs, return_exceptions=True)
+    finally:
+        await LLMFactory.aclose_async_clients()
+    for event_id, outcome in zip(event_ids, outcomes):
+        if isinstance(outcome, Exception):
+            logging.error(f"Error processing event {event_id}: {str(outcome)}")
+            results[event_id] = None
+        else:
+            results[event_id] = outcome.model_dump(mode="json")
+    return results
+
+
+async def _arun_pipeline(pipeline, event: EventSchema):
+    """Runs a pipeline on the event loop and marks its partial results as done.
+
+    Args:
+        pipeline: The pipeline to run
+        event: The event to process
+
+    Returns:
+        TaskContext containing the results of pipeline execution
+    """
+    try:
+        task_context = await pipeline.arun(event)
+    except Exception:
+        await asyncio.to_thread(publish_done, event.ticket_id, "failed")
+        raise
+    await asyncio.to_thread(publish_done, event.ticket_id, "completed")
+    return task_context
@@ -0,0 +1,12 @@
+import os
+
+"""
+Test Configuration
+
+The settings modules read the environment when they are imported, so the
+variables that have no defaults are set before any test imports them.
+"""
+
+os.environ.setdefault("DATABASE_PASSWORD", "test")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+os.environ.setdefault("ANTHROPIC_API_KEY", "test")
@@ -0,0 +1,78 @@
+import time
+
+from pydantic import BaseModel
+from services.completion_cache import (
+    MemoryCompletionCache,
+    completion_key,
+    dump_completion,
+    load_completion,
+)
+
+
+class Answer(BaseModel):
+    text: str
+
+
+def test_evicts_least_recently_used():
+    cache = MemoryCompletionCache(max_size=2)
+    cache.set("a", "first")
+    cache.set("b", "second")
+    cache.get("a")
+    cache.set("c", "third")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "first"
+    assert cache.get("c") == "third"
+    assert cache.stats()["size"] == 2
+
+
+def test_counts_hits_and_misses():
+    cache = MemoryCompletionCache(max_size=1)
+    cache.set("a", "first")
+    cache.get("a")
+    cache.get("b")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_expires_entries():
+    cache = MemoryCompletionCache(max_size=2, ttl=0.01)
+    cache.set("a", "first")
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+
+
+def test_key_ignores_retries_but_not_messages():
+    params = {
+        "model": "gpt-4o",
+        "response_model": Answer,
+        "messages": [{"role": "user", "content": "Hi"}],
+        "temperature": 0,
+    }
+
+    assert completion_key("openai", params) == completion_key(
+        "openai", {**params, "max_retries": 3}
+    )
+    assert completion_key("openai", params) != completion_key(
+        "openai", {**params, "messages": [{"role": "user", "content": "Hello"}]}
+    )
+    assert completion_key("openai", params) != completion_key("anthropic", params)
+
+
+def test_round_trips_response_and_usage():
+    class Completion:
+        model = "gpt-4o"
+        usage = {"total_tokens": 12}
+
+    response, completion = load_completion(
+        Answer, dump_completion(Answer(text="Hi"), Completion())
+    )
+
+    assert response == Answer(text="Hi")
+    assert (completion.model, completion.usage, completion.cached) == (
+        "gpt-4o",
+        {"total_tokens": 12},
+        True,
+    )
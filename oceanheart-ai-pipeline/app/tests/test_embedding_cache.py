@@ -0,0 +1,44 @@
+import time
+
+from services.embedding_cache import MemoryEmbeddingCache, embedding_key, normalize_text
+
+
+def test_evicts_least_recently_used():
+    cache = MemoryEmbeddingCache(max_size=2)
+    cache.set("a", [0.5, 0.25])
+    cache.set("b", [1.0, 2.0])
+    cache.get("a")
+    cache.set("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [0.5, 0.25]
+    assert cache.get("c") == [3.0]
+    assert cache.stats()["memory"]["size"] == 2
+
+
+def test_expires_entries():
+    cache = MemoryEmbeddingCache(max_size=2, ttl=0.01)
+    cache.set("a", [1.0])
+    time.sleep(0.02)
+
+    assert cache.get("a") is None
+    assert cache.stats()["memory"]["size"] == 0
+
+
+def test_returns_lists_of_float32_values():
+    cache = MemoryEmbeddingCache(max_size=1)
+    cache.set("a", [0.1, 0.2])
+
+    embedding = cache.get("a")
+    assert isinstance(embedding, list)
+    assert embedding == [float(value) for value in embedding]
+    assert abs(embedding[0] - 0.1) < 1e-7
+
+
+def test_near_duplicate_texts_share_a_key():
+    first = normalize_text("  Where is\n my   order? ")
+    second = normalize_text("Where is my order?")
+
+    assert first == "Where is my order?"
+    assert embedding_key("model", first) == embedding_key("model", second)
+    assert embedding_key("model", first) != embedding_key("other", first)
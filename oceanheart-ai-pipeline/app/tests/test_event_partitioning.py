@@ -0,0 +1,103 @@
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from database.event_partitioning import (
+    COPY_CHANGED_ROWS,
+    FILL_CREATED_AT,
+    STAGING_TABLE,
+    TABLE,
+    _backfill,
+)
+
+"""
+Event Partitioning Tests
+
+The copy statements run against the Postgres database in TEST_DATABASE_URL,
+in a schema of their own that is dropped afterwards. TimescaleDB is not
+needed: the staging table only needs the hypertable's primary key.
+"""
+
+SCHEMA = "test_event_partitioning"
+
+
+@pytest.fixture
+def engine():
+    url = os.getenv("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    engine = create_engine(url, connect_args={"options": f"-csearch_path={SCHEMA}"})
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        conn.exec_driver_sql(
+            f"CREATE TABLE {TABLE} (id uuid PRIMARY KEY, data json, "
+            "task_context json, created_at timestamp, updated_at timestamp)"
+        )
+        conn.exec_driver_sql(
+            f"CREATE TABLE {STAGING_TABLE} (id uuid, data jsonb, task_context jsonb, "
+            "created_at timestamp, updated_at timestamp, PRIMARY KEY (id, created_at))"
+        )
+    yield engine
+    with engine.begin() as conn:
+        conn.exec_driver_sql(f"DROP SCHEMA {SCHEMA} CASCADE")
+    engine.dispose()
+
+
+def insert_event(conn, created_at, updated_at) -> uuid.UUID:
+    event_id = uuid.uuid1()
+    conn.execute(
+        text(
+            f"INSERT INTO {TABLE} VALUES (:id, '{{}}', NULL, :created_at, :updated_at)"
+        ),
+        {"id": event_id, "created_at": created_at, "updated_at": updated_at},
+    )
+    return event_id
+
+
+@pytest.mark.parametrize("fill_created_at", [True, False])
+def test_repeated_copies_keep_one_row_per_event(engine, fill_created_at):
+    started = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        legacy_id = insert_event(conn, None, started)
+        insert_event(conn, started, started)
+        if fill_created_at:
+            conn.execute(text(FILL_CREATED_AT))
+
+    _backfill(engine, batch_size=1)
+    # The legacy event is processed between the backfill and each catch-up copy
+    for minutes in (1, 2):
+        with engine.begin() as conn:
+            conn.execute(
+                text(
+                    f"UPDATE {TABLE} SET task_context = :context, "
+                    "updated_at = :updated_at WHERE id = :id"
+                ),
+                {
+                    "id": legacy_id,
+                    "context": f'{{"run": {minutes}}}',
+                    "updated_at": started + timedelta(minutes=minutes),
+                },
+            )
+            conn.execute(text(COPY_CHANGED_ROWS), {"since": started})
+
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(
+            f"SELECT id, task_context FROM {STAGING_TABLE}"
+        ).all()
+    assert len(rows) == 2
+    assert {row.id: row.task_context for row in rows}[legacy_id] == {"run": 2}
+
+
+def test_fill_created_at_uses_the_last_update(engine):
+    updated_at = datetime(2024, 1, 1, 12)
+    with engine.begin() as conn:
+        event_id = insert_event(conn, None, updated_at)
+        assert conn.execute(text(FILL_CREATED_AT)).rowcount == 1
+        created_at = conn.execute(
+            text(f"SELECT created_at FROM {TABLE} WHERE id = :id"), {"id": event_id}
+        ).scalar()
+    assert created_at == updated_at
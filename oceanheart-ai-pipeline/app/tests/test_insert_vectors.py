@@ -0,0 +1,32 @@
+import io
+import json
+
+import pytest
+from utils.insert_vectors import iter_json_array
+
+RECORDS = [
+    {"question": "Where is my order?", "answer": "It ships today.", "id": 1},
+    {"question": "Can I get a refund?", "answer": "Yes, within [30] days.", "id": 2},
+    {"question": "Nested", "answer": {"steps": ["a", "b"]}, "id": 3},
+]
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_yields_every_record_across_chunk_boundaries(chunk_size):
+    file = io.StringIO(json.dumps(RECORDS, indent=2))
+
+    assert list(iter_json_array(file, chunk_size=chunk_size)) == RECORDS
+
+
+def test_empty_array_yields_nothing():
+    assert list(iter_json_array(io.StringIO(" [ ] "))) == []
+
+
+def test_rejects_a_file_that_is_not_an_array():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO('{"question": "?"}')))
+
+
+def test_rejects_an_unterminated_array():
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO('[{"id": 1}, {"id": 2}'), chunk_size=4))
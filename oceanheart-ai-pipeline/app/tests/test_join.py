@@ -0,0 +1,41 @@
+from api.event_schema import EventSchema
+from core.join import JoinNode
+from core.task import TaskContext
+
+
+def make_context() -> TaskContext:
+    event = EventSchema(
+        from_email="customer@example.com",
+        to_email="support@example.com",
+        sender="Customer",
+        subject="Subject",
+        body="Body",
+    )
+    return TaskContext(event=event, nodes={"Analyze": {"intent": "question"}})
+
+
+def test_merge_adds_the_results_of_every_branch():
+    task_context = JoinNode().merge(
+        make_context(), [{"Left": {"value": 1}}, {"Right": {"value": 2}}]
+    )
+
+    assert task_context.nodes == {
+        "Analyze": {"intent": "question"},
+        "Left": {"value": 1},
+        "Right": {"value": 2},
+    }
+
+
+def test_merge_applies_branches_in_declaration_order():
+    task_context = JoinNode().merge(
+        make_context(),
+        [{"Analyze": {"intent": "left"}}, {"Analyze": {"intent": "right"}}],
+    )
+
+    assert task_context.nodes["Analyze"] == {"intent": "right"}
+
+
+def test_merge_without_branch_results_keeps_the_context():
+    task_context = JoinNode().merge(make_context(), [])
+
+    assert task_context.nodes == {"Analyze": {"intent": "question"}}
@@ -0,0 +1,160 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Optional
+
+import pytest
+from api.event_schema import EventSchema
+from core import llm
+from core.llm import StreamingLLMNode
+from core.task import TaskContext
+from pydantic import BaseModel, Field
+
+
+class Response(BaseModel):
+    intent: str
+    confidence: float = Field(ge=0, le=1)
+    reasoning: str
+
+
+class PartialResponse(Response):
+    intent: Optional[str] = None
+    confidence: Optional[float] = None
+    reasoning: Optional[str] = None
+
+
+class Analyze(StreamingLLMNode):
+    ready_fields = ("intent", "confidence")
+    ResponseModel = Response
+
+    def __init__(self, partials):
+        self.partials = partials
+
+    def get_context(self, task_context: TaskContext) -> StreamingLLMNode.ContextModel:
+        return self.ContextModel()
+
+    def stream_completion(self, context):
+        return iter(self.partials)
+
+    async def astream_completion(self, context):
+        for partial in self.partials:
+            yield partial
+            await asyncio.sleep(0)
+
+
+class Publisher:
+    def __init__(self, ticket_id, node_name):
+        pass
+
+    def publish(self, response, final=False):
+        pass
+
+    async def apublish(self, response, final=False):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def publisher(monkeypatch):
+    monkeypatch.setattr(llm, "PartialResultPublisher", Publisher)
+
+
+def make_context() -> TaskContext:
+    event = EventSchema(
+        from_email="customer@example.com",
+        to_email="support@example.com",
+        sender="Customer",
+        subject="Subject",
+        body="Body",
+    )
+    return TaskContext(event=event, nodes={})
+
+
+def run_aprocess(node: Analyze):
+    """Runs aprocess() and returns the stored result at the time of mark_ready()."""
+
+    async def run():
+        task_context = make_context()
+        ready = task_context.expect_ready(node.node_name)
+
+        async def watch():
+            await ready.wait()
+            return dict(task_context.nodes[node.node_name])
+
+        watcher = asyncio.create_task(watch())
+        await node.aprocess(task_context)
+        return await watcher, task_context
+
+    return asyncio.run(run())
+
+
+def test_fields_are_final_once_a_later_field_has_a_value():
+    node = Analyze([])
+
+    assert not node.has_final_fields(PartialResponse(intent="refund"), ("intent",))
+    assert node.has_final_fields(
+        PartialResponse(intent="refund", confidence=0.9), ("intent",)
+    )
+    assert not node.has_final_fields(
+        PartialResponse(intent="refund", confidence=0.9), ("intent", "confidence")
+    )
+    assert not node.has_final_fields(PartialResponse(), ())
+
+
+def test_valid_fields_are_checked_against_the_response_model():
+    node = Analyze([])
+    fields = ("intent", "confidence")
+
+    assert node.has_valid_fields(
+        PartialResponse(intent="refund", confidence=0.9), fields
+    )
+    assert not node.has_valid_fields(
+        PartialResponse(intent="refund", confidence=1.5), fields
+    )
+    assert not node.has_valid_fields(PartialResponse(confidence=0.9), fields)
+
+
+def test_aprocess_marks_ready_with_the_partial_response():
+    partials = [
+        PartialResponse(intent="refund"),
+        PartialResponse(intent="refund", confidence=0.9),
+        PartialResponse(intent="refund", confidence=0.9, reasoning="Asks"),
+        PartialResponse(intent="refund", confidence=0.9, reasoning="Asks for money"),
+    ]
+
+    at_ready, task_context = run_aprocess(Analyze(partials))
+
+    assert at_ready["complete"] is False
+    assert at_ready["response_model"] is partials[2]
+    result = task_context.nodes["Analyze"]
+    assert result["complete"] is True
+    assert result["response_model"] == Response(
+        intent="refund", confidence=0.9, reasoning="Asks for money"
+    )
+
+
+def test_aprocess_waits_for_the_complete_response_if_ready_fields_are_invalid():
+    partials = [
+        PartialResponse(intent="refund", confidence=1.5),
+        PartialResponse(intent="refund", confidence=1.5, reasoning="Asks"),
+    ]
+
+    async def run():
+        task_context = make_context()
+        ready = task_context.expect_ready("Analyze")
+        with pytest.raises(ValueError):
+            await Analyze(partials).aprocess(task_context)
+        return ready.is_set(), task_context
+
+    is_ready, task_context = asyncio.run(run())
+
+    assert not is_ready
+    assert "Analyze" not in task_context.nodes
+
+
+def test_usage_of_the_final_completion_is_stored():
+    last = PartialResponse(intent="refund", confidence=0.9, reasoning="Asks")
+    usage = {"total_tokens": 42}
+    object.__setattr__(last, "_raw_response", SimpleNamespace(usage=usage))
+
+    task_context = Analyze([last]).process(make_context())
+
+    assert task_context.nodes["Analyze"]["usage"] == usage
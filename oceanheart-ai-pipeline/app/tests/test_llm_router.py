@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+from services import llm_router
+from services.llm_router import CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=0.0)
+    monkeypatch.setattr(
+        llm_router, "time", SimpleNamespace(monotonic=lambda: clock.now)
+    )
+    return clock
+
+
+def test_opens_after_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.available()
+    assert not breaker.begin()
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_a_single_trial_call(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now = 30
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.begin()
+    assert not breaker.available()
+    assert not breaker.begin()
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now = 30
+    breaker.begin()
+    breaker.record_success()
+
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+
+
+def test_failed_trial_opens_the_circuit_again(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30)
+    for _ in range(3):
+        breaker.record_failure()
+    clock.now = 30
+    breaker.begin()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 59
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 60
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_cancelled_trial_releases_the_half_open_slot(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    breaker.record_failure()
+    clock.now = 30
+    breaker.begin()
+    breaker.record_cancelled()
+
+    assert breaker.available()
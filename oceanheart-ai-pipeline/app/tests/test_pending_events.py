@@ -0,0 +1,91 @@
+import fakeredis
+import pytest
+from services.pending_events import PendingEventQueue
+
+KEY = "pending_events"
+
+
+@pytest.fixture
+def redis_client():
+    return fakeredis.FakeRedis()
+
+
+def make_queue(redis_client, **kwargs) -> PendingEventQueue:
+    redis_client.rpush(KEY, *[f"event-{i}" for i in range(5)])
+    return PendingEventQueue(redis_client, KEY, **kwargs)
+
+
+def pending(redis_client):
+    return [event_id.decode() for event_id in redis_client.lrange(KEY, 0, -1)]
+
+
+def test_claim_moves_ids_to_the_claim_list(redis_client):
+    queue = make_queue(redis_client)
+    claim, event_ids = queue.claim(3)
+
+    assert event_ids == ["event-0", "event-1", "event-2"]
+    assert pending(redis_client) == ["event-3", "event-4"]
+    assert redis_client.lrange(claim, 0, -1) == [b"event-0", b"event-1", b"event-2"]
+    assert redis_client.zscore(f"{KEY}:claims", claim) is not None
+
+
+def test_claim_of_an_empty_list_registers_no_claim(redis_client):
+    queue = PendingEventQueue(redis_client, KEY)
+    claim, event_ids = queue.claim(3)
+
+    assert event_ids == []
+    assert not redis_client.exists(claim, f"{KEY}:claims")
+
+
+def test_release_requeues_only_failed_events(redis_client):
+    queue = make_queue(redis_client)
+    claim, _ = queue.claim(3)
+    queue.release(claim, failed=["event-1"])
+
+    assert pending(redis_client) == ["event-3", "event-4", "event-1"]
+    assert not redis_client.exists(claim)
+    assert redis_client.zcard(f"{KEY}:claims") == 0
+    assert redis_client.hgetall(f"{KEY}:attempts") == {b"event-1": b"1"}
+
+
+def test_success_clears_earlier_attempts(redis_client):
+    queue = make_queue(redis_client)
+    claim, _ = queue.claim(1)
+    queue.release(claim, failed=["event-0"])
+    claim, _ = queue.claim(5)
+    queue.release(claim, failed=[])
+
+    assert pending(redis_client) == []
+    assert not redis_client.exists(f"{KEY}:attempts")
+
+
+def test_events_move_to_the_dead_letter_list_after_max_attempts(redis_client):
+    queue = make_queue(redis_client, max_attempts=2)
+    for _ in range(2):
+        claim, _ = queue.claim(5)
+        queue.release(claim, failed=["event-2"])
+
+    assert pending(redis_client) == []
+    assert redis_client.lrange(f"{KEY}:dead", 0, -1) == [b"event-2"]
+    assert not redis_client.exists(f"{KEY}:attempts")
+
+
+def test_expired_claims_are_requeued_by_the_next_claim(redis_client):
+    queue = make_queue(redis_client, claim_timeout=0)
+    crashed_claim, _ = queue.claim(2)
+    claim, event_ids = queue.claim(10)
+
+    assert event_ids == ["event-2", "event-3", "event-4", "event-0", "event-1"]
+    assert not redis_client.exists(crashed_claim)
+    assert redis_client.hgetall(f"{KEY}:attempts") == {
+        b"event-0": b"1",
+        b"event-1": b"1",
+    }
+
+
+def test_claims_within_the_timeout_are_kept(redis_client):
+    queue = make_queue(redis_client, claim_timeout=600)
+    running_claim, _ = queue.claim(2)
+    queue.claim(10)
+
+    assert redis_client.llen(running_claim) == 2
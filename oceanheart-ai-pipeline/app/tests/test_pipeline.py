@@ -0,0 +1,47 @@
+from api.event_schema import EventSchema
+from core.base import Node
+from core.pipeline import Pipeline
+from core.schema import NodeConfig, PipelineSchema
+from core.task import TaskContext
+from services.rate_limiter import current_priority
+
+
+class RecordPriority(Node):
+    def process(self, task_context: TaskContext) -> TaskContext:
+        task_context.nodes[self.node_name] = current_priority()
+        return task_context
+
+
+class NormalPipeline(Pipeline):
+    pipeline_schema = PipelineSchema(
+        start=RecordPriority,
+        nodes=[NodeConfig(node=RecordPriority, connections=[])],
+    )
+
+
+class HighPipeline(NormalPipeline):
+    llm_priority = "high"
+
+
+def make_event(**fields) -> EventSchema:
+    return EventSchema.model_validate(
+        {
+            "from_email": "customer@example.com",
+            "to_email": "support@example.com",
+            "sender": "Customer",
+            "subject": "Subject",
+            "body": "Body",
+            **fields,
+        }
+    )
+
+
+def test_nodes_run_in_the_pipeline_priority_lane():
+    assert HighPipeline().run(make_event()).nodes["RecordPriority"] == "high"
+    assert NormalPipeline().run(make_event()).nodes["RecordPriority"] == "normal"
+
+
+def test_events_cannot_choose_the_priority_lane():
+    event = make_event(priority="high")
+
+    assert NormalPipeline().run(event).nodes["RecordPriority"] == "normal"
@@ -0,0 +1,114 @@
+from core.base import Node
+from core.join import JoinNode
+from core.plan import ExecutionPlan
+from core.schema import NodeConfig, PipelineSchema
+from core.task import TaskContext
+
+
+class Start(Node):
+    def process(self, task_context: TaskContext) -> TaskContext:
+        return task_context
+
+
+class Left(Start):
+    pass
+
+
+class Right(Start):
+    pass
+
+
+class Merge(JoinNode):
+    pass
+
+
+class End(Start):
+    pass
+
+
+def test_compile_builds_adjacency_with_leaf_nodes():
+    plan = ExecutionPlan.compile(
+        PipelineSchema(
+            start=Start,
+            nodes=[
+                NodeConfig(node=Start, connections=[Left], prefetch=True),
+                NodeConfig(node=Left, connections=[End]),
+            ],
+        )
+    )
+
+    assert plan.adjacency == {Start: [Left], Left: [End], End: []}
+    assert plan.configured == {Start, Left}
+    assert plan.prefetch == [Start]
+    assert plan.get_connections(End) == []
+    assert plan.get_reachable_nodes() == {Start, Left, End}
+
+
+def test_compile_keeps_first_config_of_a_node():
+    plan = ExecutionPlan.compile(
+        PipelineSchema(
+            start=Start,
+            nodes=[
+                NodeConfig(node=Start, connections=[Left]),
+                NodeConfig(node=Start, connections=[Right], is_router=True),
+            ],
+        )
+    )
+
+    assert plan.get_connections(Start) == [Left]
+    assert not plan.is_router(Start)
+
+
+def test_topological_order_follows_dependencies():
+    plan = ExecutionPlan.compile(
+        PipelineSchema(
+            start=Start,
+            nodes=[
+                NodeConfig(node=Start, connections=[Left, Right], parallel=True),
+                NodeConfig(node=Left, connections=[Merge]),
+                NodeConfig(node=Right, connections=[Merge]),
+                NodeConfig(node=Merge, connections=[End]),
+            ],
+        )
+    )
+    order = plan.topological_order
+
+    assert not plan.has_cycle
+    assert order[0] is Start
+    assert order[-1] is End
+    assert order.index(Left) < order.index(Merge)
+    assert order.index(Right) < order.index(Merge)
+
+
+def test_parallel_branches_resolve_to_their_join():
+    plan = ExecutionPlan.compile(
+        PipelineSchema(
+            start=Start,
+            nodes=[
+                NodeConfig(node=Start, connections=[Left, Right], parallel=True),
+                NodeConfig(node=Left, connections=[Merge]),
+                NodeConfig(node=Right, connections=[Merge]),
+                NodeConfig(node=Merge, connections=[End]),
+            ],
+        )
+    )
+
+    assert plan.is_parallel(Start)
+    assert plan.branches[Start] == [[Left], [Right]]
+    assert plan.joins[Start] is Merge
+
+
+def test_cycle_is_detected():
+    plan = ExecutionPlan.compile(
+        PipelineSchema(
+            start=Start,
+            nodes=[
+                NodeConfig(node=Start, connections=[Left]),
+                NodeConfig(node=Left, connections=[Right]),
+                NodeConfig(node=Right, connections=[Left]),
+            ],
+        )
+    )
+
+    assert plan.has_cycle
+    assert plan.topological_order == [Start]
@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+
+import fakeredis
+import pytest
+from services.rate_limiter import (
+    RateLimiter,
+    current_priority,
+    estimate_tokens,
+    llm_priority,
+)
+
+KEY = "ratelimit:openai:gpt-4o"
+
+
+@pytest.fixture
+def limiter():
+    return RateLimiter(fakeredis.FakeRedis(), timeout=1)
+
+
+def take(limiter: RateLimiter, priority: str, count: int, rpm=10, tpm=0, tokens=1):
+    """Takes requests until one has to wait. Returns the number taken."""
+    for taken in range(count):
+        if limiter._try_acquire(KEY, rpm, tpm, tokens, priority):
+            return taken
+    return count
+
+
+def test_normal_lane_leaves_its_reserve_free(limiter):
+    assert take(limiter, "normal", 20) == 9
+    assert take(limiter, "high", 20) == 1
+
+
+def test_low_lane_leaves_a_larger_reserve(limiter):
+    assert take(limiter, "low", 20) == 7
+    assert take(limiter, "normal", 20) == 2
+    assert take(limiter, "high", 20) == 1
+
+
+def test_wait_covers_the_missing_quota(limiter):
+    take(limiter, "high", 10)
+
+    wait = limiter._try_acquire(KEY, 10, 0, 1, "high")
+    assert 5.5 < wait <= 6
+
+
+def test_tokens_are_taken_from_the_tpm_bucket(limiter):
+    assert take(limiter, "normal", 5, rpm=0, tpm=1000, tokens=300) == 3
+    assert take(limiter, "high", 5, rpm=0, tpm=1000, tokens=300) == 0
+    assert take(limiter, "high", 5, rpm=0, tpm=1000, tokens=100) == 1
+
+
+def test_oversized_requests_are_capped_at_the_lane_capacity(limiter):
+    assert take(limiter, "normal", 1, rpm=0, tpm=1000, tokens=5000) == 1
+
+
+def test_redis_errors_let_requests_through():
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = MagicMock(side_effect=ConnectionError)
+    limiter = RateLimiter(redis_client)
+
+    assert limiter._try_acquire(KEY, 1, 1, 1, "low") == 0
+
+
+def test_priority_lane_is_scoped_to_the_block():
+    with llm_priority("low"):
+        assert current_priority() == "low"
+        with llm_priority(None):
+            assert current_priority() == "low"
+    assert current_priority() == "normal"
+    with pytest.raises(ValueError):
+        with llm_priority("urgent"):
+            pass
+
+
+def test_estimate_counts_content_overhead_and_output():
+    messages = [{"role": "user", "content": "x" * 40}]
+
+    assert estimate_tokens(messages, max_output_tokens=100) == 10 + 4 + 100
@@ -0,0 +1,28 @@
+import pytest
+from services.retrieval import reciprocal_rank_fusion
+
+
+def test_ids_found_by_both_searches_rank_first():
+    scores = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]], k=60)
+
+    assert list(scores)[0] == "c"
+    assert scores["c"] == pytest.approx(1 / 63 + 1 / 61)
+    assert scores["a"] == pytest.approx(1 / 61)
+    assert scores["d"] == pytest.approx(1 / 62)
+
+
+def test_scores_are_ordered_from_best_to_worst():
+    scores = reciprocal_rank_fusion([["a", "b", "c"], ["b", "a"]])
+
+    assert list(scores.values()) == sorted(scores.values(), reverse=True)
+    assert set(scores) == {"a", "b", "c"}
+
+
+def test_weights_scale_each_list():
+    scores = reciprocal_rank_fusion([["a"], ["b"]], weights=[1.0, 2.0], k=0)
+
+    assert scores == {"b": 2.0, "a": 1.0}
+
+
+def test_empty_lists_give_no_scores():
+    assert reciprocal_rank_fusion([[], []]) == {}
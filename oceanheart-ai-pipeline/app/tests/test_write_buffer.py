@@ -0,0 +1,92 @@
+import asyncio
+from typing import List
+
+import pytest
+from services.write_buffer import WriteBehindBuffer
+
+
+class Recorder:
+    """Flush function that records its batches and doubles every item."""
+
+    def __init__(self, error: Exception = None):
+        self.batches: List[List[int]] = []
+        self.error = error
+
+    async def __call__(self, items: List[int]) -> List[int]:
+        self.batches.append(items)
+        await asyncio.sleep(0)
+        if self.error:
+            raise self.error
+        return [item * 2 for item in items]
+
+
+def test_concurrent_items_are_flushed_in_one_batch():
+    flush = Recorder()
+
+    async def main():
+        buffer = WriteBehindBuffer(flush, max_size=10, max_delay=0.01)
+        return buffer, await asyncio.gather(*(buffer.submit(i) for i in range(5)))
+
+    buffer, results = asyncio.run(main())
+
+    assert results == [0, 2, 4, 6, 8]
+    assert flush.batches == [[0, 1, 2, 3, 4]]
+    assert buffer.stats()["average_batch_size"] == 5
+
+
+def test_full_batches_are_flushed_without_waiting():
+    flush = Recorder()
+
+    async def main():
+        buffer = WriteBehindBuffer(flush, max_size=2, max_delay=60)
+        return await asyncio.wait_for(
+            asyncio.gather(*(buffer.submit(i) for i in range(4))), timeout=1
+        )
+
+    assert asyncio.run(main()) == [0, 2, 4, 6]
+    assert flush.batches == [[0, 1], [2, 3]]
+
+
+def test_flush_errors_reach_every_caller_of_the_batch():
+    flush = Recorder(error=RuntimeError("commit failed"))
+
+    async def main():
+        buffer = WriteBehindBuffer(flush, max_size=10, max_delay=0.01)
+        return await asyncio.gather(
+            *(buffer.submit(i) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+
+    assert [str(result) for result in results] == ["commit failed"] * 3
+
+
+def test_cancelled_callers_keep_their_item_in_the_batch():
+    flush = Recorder()
+
+    async def main():
+        buffer = WriteBehindBuffer(flush, max_size=10, max_delay=0.01)
+        cancelled = asyncio.create_task(buffer.submit(1))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        result = await buffer.submit(2)
+        with pytest.raises(asyncio.CancelledError):
+            await cancelled
+        return result
+
+    assert asyncio.run(main()) == 4
+    assert flush.batches == [[1, 2]]
+
+
+def test_close_flushes_the_current_batch():
+    flush = Recorder()
+
+    async def main():
+        buffer = WriteBehindBuffer(flush, max_size=10, max_delay=60)
+        submitted = asyncio.create_task(buffer.submit(1))
+        await asyncio.sleep(0)
+        await buffer.close()
+        return await submitted
+
+    assert asyncio.run(main()) == 2
+    assert flush.batches == [[1]]
@@ -4,33 +4,103 @@ from pathlib import Path
 app_root = Path(__file__).parent.parent
 sys.path.append(str(app_root))
 
+import argparse  # noqa: E402
 import json  # noqa: E402
 from datetime import datetime  # noqa: E402
+from itertools import islice  # noqa: E402
+from typing import Any, Dict, Iterator, List, Tuple  # noqa: E402
 
-import pandas as pd  # noqa: E402
+from services.response_cache import create_response_cache  # noqa: E402
 from services.vector_store import VectorStore  # noqa: E402
 from timescale_vector.client import uuid_from_time  # noqa: E402
 
-# Initialize VectorStore
-vec = VectorStore(local=True)
+"""
+Vector Ingestion Script
 
+Streams question/answer records from a JSON array or JSONL file into the vector
+store. Records are read incrementally, embedded in batches with
+VectorStore.get_embeddings() and upserted batch by batch, so the dataset never
+has to fit in memory.
 
-def load_data():
-    try:
-        data_file = app_root.parent / "data" / "dataset.json"
-        if not data_file.exists():
-            raise FileNotFoundError(f"Dataset file not found at: {data_file}")
-
-        with open(data_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data
-    except (json.JSONDecodeError, FileNotFoundError) as e:
-        print(f"Error loading dataset: {e}")
-        sys.exit(1)
+Usage:
+    python app/utils/insert_vectors.py [--file data/dataset.jsonl] [--batch-size 500]
+"""
+
+DEFAULT_DATA_FILE = app_root.parent / "data" / "dataset.json"
+
+
+def iter_json_array(file, chunk_size: int = 65536) -> Iterator[Dict[str, Any]]:
+    """Yields the objects of a top-level JSON array without loading the whole file.
+
+    Args:
+        file: Open text file containing a JSON array
+        chunk_size: Number of characters to read at a time
+
+    Raises:
+        json.JSONDecodeError: If the file is not a JSON array of values
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    eof = False
+    while True:
+        # Skip whitespace and separators between values
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if not started and position < len(buffer):
+            if buffer[position] != "[":
+                raise json.JSONDecodeError("Expected a JSON array", buffer, position)
+            started = True
+            position += 1
+            continue
+        if started and position < len(buffer) and buffer[position] == "]":
+            return
+        if position < len(buffer):
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                yield value
+                position = end
+                continue
+        if eof:
+            if not started or position >= len(buffer):
+                raise json.JSONDecodeError("Unterminated JSON array", buffer, position)
+        chunk = file.read(chunk_size)
+        eof = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+
+def iter_records(data_file: Path) -> Iterator[Dict[str, Any]]:
+    """Yields the records of a JSON array (.json) or JSON Lines (.jsonl) file."""
+    with open(data_file, "r", encoding="utf-8") as f:
+        if data_file.suffix == ".jsonl":
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from iter_json_array(f)
+
+
+def iter_batches(
+    records: Iterator[Dict[str, Any]], batch_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Groups records into lists of at most batch_size records."""
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            return
+        yield batch
 
 
 # Prepare data for insertion
-def prepare_record(row):
+def prepare_record(
+    row: Dict[str, Any], content: str, embedding: List[float]
+) -> Tuple[str, Dict[str, Any], str, List[float]]:
     """Prepare a record for insertion into the vector store.
 
     This function creates a record with a UUID version 1 as the ID, which captures
@@ -50,27 +120,76 @@ def prepare_record(row):
 
         This is useful when your content already has an associated datetime.
     """
-    content = f"Question: {row['question']}\nAnswer: {row['answer']}"
-    embedding = vec.get_embedding(content)
-    return pd.Series(
+    return (
+        str(uuid_from_time(datetime.now())),
         {
-            "id": str(uuid_from_time(datetime.now())),
-            "metadata": {
-                "category": row["category"],
-                "created_at": datetime.now().isoformat(),
-            },
-            "contents": content,
-            "embedding": embedding,
-        }
+            "category": row["category"],
+            "created_at": datetime.now().isoformat(),
+        },
+        content,
+        embedding,
+    )
+
+
+def get_content(row: Dict[str, Any]) -> str:
+    return f"Question: {row['question']}\nAnswer: {row['answer']}"
+
+
+def insert_vectors(vec: VectorStore, data_file: Path, batch_size: int) -> int:
+    """Embeds and upserts all records of the data file in batches.
+
+    Returns:
+        The number of records inserted
+    """
+    vec.create_tables()
+    vec.create_keyword_search_index()
+    total = 0
+    for batch in iter_batches(iter_records(data_file), batch_size):
+        contents = [get_content(row) for row in batch]
+        embeddings = vec.get_embeddings(contents)
+        vec.upsert_records(
+            prepare_record(row, content, embedding)
+            for row, content, embedding in zip(batch, contents, embeddings)
+        )
+        total += len(batch)
+        print(f"Inserted {total} records")
+
+    # Build the index once, after loading, instead of updating it on every batch
+    vec.create_index()  # DiskAnnIndex
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Insert vectors into the vector store")
+    parser.add_argument(
+        "--file",
+        type=Path,
+        default=DEFAULT_DATA_FILE,
+        help="JSON array or JSONL file with question, answer and category fields",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="Number of records to embed and upsert at a time",
     )
+    args = parser.parse_args()
 
+    if not args.file.exists():
+        print(f"Error loading dataset: Dataset file not found at: {args.file}")
+        sys.exit(1)
+
+    vec = VectorStore(local=True)
+    # Drops cached responses for the categories this run changes
+    response_cache = create_response_cache(vec)
+    if response_cache is not None:
+        response_cache.create_tables()
+    try:
+        insert_vectors(vec, args.file, args.batch_size)
+    except json.JSONDecodeError as e:
+        print(f"Error loading dataset: {e}")
+        sys.exit(1)
 
-# Load data from JSON file
-data = load_data()
-df = pd.DataFrame(data)
-records_df = df.apply(prepare_record, axis=1)
 
-# Create tables and insert data
-vec.create_tables()
-vec.create_index()  # DiskAnnIndex
-vec.upsert(records_df)
+if __name__ == "__main__":
+    main()
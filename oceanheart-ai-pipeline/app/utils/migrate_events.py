@@ -0,0 +1,115 @@
+import sys
+from pathlib import Path
+
+app_root = Path(__file__).parent.parent
+sys.path.append(str(app_root))
+
+import argparse  # noqa: E402
+from typing import List  # noqa: E402
+
+from database.event import Event  # noqa: E402
+from database.event_partitioning import is_hypertable  # noqa: E402
+from database.session import engine  # noqa: E402
+from sqlalchemy.engine import Connection  # noqa: E402
+from sqlalchemy.schema import CreateIndex  # noqa: E402
+
+"""
+Event Table Migration Script
+
+Brings an existing events table in line with the Event model: converts the
+data and task_context columns from JSON to JSONB and creates the indexes
+declared in Event.__table_args__. Alembic's autogenerate skips expression
+indexes and would convert the columns without a USING clause, so run this
+script instead; autogenerate then finds nothing left to change.
+
+The script is idempotent. Indexes are built with CREATE INDEX CONCURRENTLY, so
+ingestion keeps running while they are built. Hypertables do not support
+CONCURRENTLY; their indexes are built one chunk per transaction instead. The
+column conversion rewrites the table and locks it while doing so; run it in a
+quiet period.
+
+Usage:
+    python app/utils/migrate_events.py [--no-concurrently]
+"""
+
+
+def get_json_columns(conn: Connection) -> List[str]:
+    """Returns the columns of the events table that are still of type json."""
+    rows = conn.exec_driver_sql(
+        """
+        SELECT column_name FROM information_schema.columns
+        WHERE table_name = %s AND data_type = 'json'
+        """,
+        (Event.__tablename__,),
+    )
+    return [row[0] for row in rows]
+
+
+def drop_invalid_indexes(conn: Connection, concurrently: bool = True) -> None:
+    """Drops indexes left invalid by an interrupted concurrent build.
+
+    CREATE INDEX IF NOT EXISTS would otherwise skip them.
+    """
+    names = [index.name for index in Event.__table__.indexes]
+    rows = conn.exec_driver_sql(
+        """
+        SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE NOT i.indisvalid AND c.relname = ANY(%s)
+        """,
+        (names,),
+    )
+    for (name,) in rows.all():
+        print(f"Dropping invalid index {name}")
+        conn.exec_driver_sql(
+            f"DROP INDEX {'CONCURRENTLY ' if concurrently else ''}IF EXISTS {name}"
+        )
+
+
+def migrate_events(concurrently: bool = True) -> None:
+    """Converts the events table to JSONB and creates its indexes."""
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        json_columns = get_json_columns(conn)
+        if json_columns:
+            print(f"Converting {', '.join(json_columns)} to jsonb")
+            conn.exec_driver_sql(
+                f"ALTER TABLE {Event.__tablename__} "
+                + ", ".join(
+                    f"ALTER COLUMN {column} TYPE jsonb USING {column}::jsonb"
+                    for column in json_columns
+                )
+            )
+
+        hypertable = is_hypertable(conn)
+        drop_invalid_indexes(conn, concurrently=concurrently and not hypertable)
+        for index in Event.__table__.indexes:
+            statement = str(
+                CreateIndex(index, if_not_exists=True).compile(dialect=engine.dialect)
+            )
+            if concurrently and hypertable:
+                # Storage parameters precede the predicate of partial indexes
+                head, where, predicate = statement.partition(" WHERE ")
+                statement = (
+                    f"{head} WITH (timescaledb.transaction_per_chunk){where}{predicate}"
+                )
+            elif concurrently:
+                statement = statement.replace(
+                    "CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1
+                )
+            print(f"Creating index {index.name}")
+            conn.exec_driver_sql(statement)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the events table to JSONB")
+    parser.add_argument(
+        "--no-concurrently",
+        action="store_true",
+        help="Build indexes with table locks, which is faster on an idle database",
+    )
+    args = parser.parse_args()
+    migrate_events(concurrently=not args.no_concurrently)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import sys
+from pathlib import Path
+
+app_root = Path(__file__).parent.parent
+sys.path.append(str(app_root))
+
+import argparse  # noqa: E402
+import logging  # noqa: E402
+
+from database.event_partitioning import (  # noqa: E402
+    apply_event_policies,
+    convert_events_to_hypertable,
+    enforce_retention,
+)
+from database.session import engine  # noqa: E402
+
+"""
+Event Partitioning Script
+
+Converts the events table to a TimescaleDB hypertable while the API keeps
+ingesting, and applies the chunk interval and compression policy from the
+EVENTS_* settings. Run it again after changing those settings.
+
+Usage:
+    python app/utils/partition_events.py [--policies-only] [--enforce-retention]
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Convert the events table to a hypertable"
+    )
+    parser.add_argument(
+        "--policies-only",
+        action="store_true",
+        help="Only update the chunk interval and compression policy",
+    )
+    parser.add_argument(
+        "--enforce-retention",
+        action="store_true",
+        help="Archive and drop expired chunks now instead of waiting for Celery beat",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.policies_only:
+        apply_event_policies(engine)
+    else:
+        convert_events_to_hypertable(engine)
+    if args.enforce_retention:
+        dropped = enforce_retention(engine)
+        print(f"Dropped {len(dropped)} expired chunks")
+
+
+if __name__ == "__main__":
+    main()
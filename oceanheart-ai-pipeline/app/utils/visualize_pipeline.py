@@ -1,4 +1,5 @@
 from graphviz import Digraph
+from core.join import JoinNode
 from core.pipeline import Pipeline
 from IPython.display import Image
 
@@ -25,23 +26,30 @@ def visualize_pipeline(pipeline: Pipeline) -> Image:
         dot = Digraph(comment="Pipeline Visualization")
         _apply_graph_styling(dot)
 
+        plan = pipeline.get_execution_plan()
+
         # Add nodes
-        for node_config in pipeline.pipeline_schema.nodes:
-            node_name = node_config.node.__name__
-            if node_config.is_router:
+        for node_class in plan.topological_order:
+            node_name = node_class.__name__
+            if plan.is_router(node_class):
                 # Use diamond shape for router nodes
                 dot.node(node_name, node_name, shape="diamond")
+            elif plan.is_parallel(node_class):
+                # Use trapezium shapes for parallel fan-out and join nodes
+                dot.node(node_name, node_name, shape="trapezium")
+            elif issubclass(node_class, JoinNode):
+                dot.node(node_name, node_name, shape="invtrapezium")
             else:
                 dot.node(node_name, node_name)
 
         # Add edges
-        start_node = pipeline.pipeline_schema.start.__name__
+        start_node = plan.start.__name__
         dot.node("Event", "Event", shape="ellipse", fillcolor="#ececfd")
         dot.edge("Event", start_node, tailport="e", headport="w")
 
-        for node_config in pipeline.pipeline_schema.nodes:
-            node_name = node_config.node.__name__
-            for connection in node_config.connections:
+        for node_class, connections in plan.adjacency.items():
+            node_name = node_class.__name__
+            for connection in connections:
                 dot.edge(node_name, connection.__name__, tailport="e", headport="w")
 
         # Render the graph to PNG and return as Image